@@ -0,0 +1,44 @@
+"""Add llm_usage_records table for LLM token and latency telemetry
+
+Revision ID: 003_add_llm_usage_records
+Revises: 002_add_note_tags_and_favorite
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision = '003_add_llm_usage_records'
+down_revision = '002_add_note_tags_and_favorite'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create llm_usage_records table."""
+    op.create_table(
+        'llm_usage_records',
+        sa.Column('id', pg.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column('user_id', pg.UUID(as_uuid=True), sa.ForeignKey('users.id', ondelete='SET NULL'), nullable=True),
+        sa.Column('feature', sa.String(50), nullable=False),
+        sa.Column('model', sa.String(100), nullable=False),
+        sa.Column('prompt_tokens', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('completion_tokens', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_tokens', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('latency_ms', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('retries', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('success', sa.Boolean(), server_default='true', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    )
+    op.create_index('idx_llm_usage_user_created', 'llm_usage_records', ['user_id', 'created_at'])
+    op.create_index('idx_llm_usage_feature_created', 'llm_usage_records', ['feature', 'created_at'])
+
+
+def downgrade():
+    """Drop llm_usage_records table."""
+    op.drop_index('idx_llm_usage_feature_created', table_name='llm_usage_records')
+    op.drop_index('idx_llm_usage_user_created', table_name='llm_usage_records')
+    op.drop_table('llm_usage_records')
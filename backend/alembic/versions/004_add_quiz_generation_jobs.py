@@ -0,0 +1,52 @@
+"""Add failed quiz status and generation lease for background quiz jobs
+
+Revision ID: 004_add_quiz_generation_jobs
+Revises: 003_add_llm_usage_records
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '004_add_quiz_generation_jobs'
+down_revision = '003_add_llm_usage_records'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add 'failed' to quiz_status and quizzes.generation_claimed_at."""
+    # The quizzes table may have been created by create_all rather than a migration
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'quiz_status') THEN
+                ALTER TYPE quiz_status ADD VALUE IF NOT EXISTS 'failed';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+    inspector = sa.inspect(op.get_bind())
+    if 'quizzes' in inspector.get_table_names():
+        columns = {column['name'] for column in inspector.get_columns('quizzes')}
+        if 'generation_claimed_at' not in columns:
+            op.add_column(
+                'quizzes',
+                sa.Column('generation_claimed_at', sa.DateTime(timezone=True), nullable=True),
+            )
+
+
+def downgrade():
+    """Remove quizzes.generation_claimed_at.
+
+    PostgreSQL cannot drop an enum value; 'failed' stays in quiz_status.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if 'quizzes' in inspector.get_table_names():
+        op.execute("UPDATE quizzes SET status = 'ready' WHERE status = 'failed'")
+        op.drop_column('quizzes', 'generation_claimed_at')
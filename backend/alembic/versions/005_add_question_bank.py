@@ -0,0 +1,50 @@
+"""Add question_bank_items table for reusable per-knowledge-point questions
+
+Revision ID: 005_add_question_bank
+Revises: 004_add_quiz_generation_jobs
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision = '005_add_question_bank'
+down_revision = '004_add_quiz_generation_jobs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create question_bank_items table."""
+    op.create_table(
+        'question_bank_items',
+        sa.Column('id', pg.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column(
+            'knowledge_point_id',
+            pg.UUID(as_uuid=True),
+            sa.ForeignKey('mindmap_knowledge_points.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('question_text', sa.Text(), nullable=False),
+        sa.Column('question_type', sa.String(20), nullable=False),
+        sa.Column('options', sa.JSON(), nullable=True),
+        sa.Column('correct_answer', sa.Text(), nullable=False),
+        sa.Column('explanation', sa.Text(), nullable=True),
+        sa.Column('difficulty', sa.String(10), nullable=False),
+        sa.Column('times_used', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+    )
+    op.create_index(
+        'idx_question_bank_point_type_difficulty',
+        'question_bank_items',
+        ['knowledge_point_id', 'question_type', 'difficulty'],
+    )
+
+
+def downgrade():
+    """Drop question_bank_items table."""
+    op.drop_index('idx_question_bank_point_type_difficulty', table_name='question_bank_items')
+    op.drop_table('question_bank_items')
@@ -0,0 +1,51 @@
+"""Add adaptive quiz flag and indexes for per-user weakness lookups
+
+Revision ID: 006_add_adaptive_quizzes
+Revises: 005_add_question_bank
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006_add_adaptive_quizzes'
+down_revision = '005_add_question_bank'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add quizzes.adaptive and indexes on quizzes and mistakes."""
+    # The tables may have been created by create_all rather than a migration
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'quizzes' in tables:
+        columns = {column['name'] for column in inspector.get_columns('quizzes')}
+        if 'adaptive' not in columns:
+            op.add_column(
+                'quizzes',
+                sa.Column('adaptive', sa.Boolean(), server_default=sa.false(), nullable=False),
+            )
+        indexes = {index['name'] for index in inspector.get_indexes('quizzes')}
+        if 'idx_quizzes_user_mindmap' not in indexes:
+            op.create_index('idx_quizzes_user_mindmap', 'quizzes', ['user_id', 'mindmap_id'])
+
+    if 'mistakes' in tables:
+        indexes = {index['name'] for index in inspector.get_indexes('mistakes')}
+        if 'idx_mistakes_user_question' not in indexes:
+            op.create_index('idx_mistakes_user_question', 'mistakes', ['user_id', 'question_id'])
+
+
+def downgrade():
+    """Remove quizzes.adaptive and the weakness lookup indexes."""
+    inspector = sa.inspect(op.get_bind())
+    tables = inspector.get_table_names()
+
+    if 'mistakes' in tables:
+        op.drop_index('idx_mistakes_user_question', table_name='mistakes')
+    if 'quizzes' in tables:
+        op.drop_index('idx_quizzes_user_mindmap', table_name='quizzes')
+        op.drop_column('quizzes', 'adaptive')
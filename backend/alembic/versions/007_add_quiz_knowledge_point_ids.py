@@ -0,0 +1,33 @@
+"""Store the selected knowledge points of a quiz
+
+Revision ID: 007_add_quiz_knowledge_point_ids
+Revises: 006_add_adaptive_quizzes
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '007_add_quiz_knowledge_point_ids'
+down_revision = '006_add_adaptive_quizzes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add quizzes.knowledge_point_ids."""
+    # The quizzes table may have been created by create_all rather than a migration
+    inspector = sa.inspect(op.get_bind())
+    if 'quizzes' in inspector.get_table_names():
+        columns = {column['name'] for column in inspector.get_columns('quizzes')}
+        if 'knowledge_point_ids' not in columns:
+            op.add_column('quizzes', sa.Column('knowledge_point_ids', sa.JSON(), nullable=True))
+
+
+def downgrade():
+    """Remove quizzes.knowledge_point_ids."""
+    inspector = sa.inspect(op.get_bind())
+    if 'quizzes' in inspector.get_table_names():
+        op.drop_column('quizzes', 'knowledge_point_ids')
@@ -0,0 +1,58 @@
+"""Add grading session status and lease for background short answer grading
+
+Revision ID: 008_add_session_grading
+Revises: 007_add_quiz_knowledge_point_ids
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '008_add_session_grading'
+down_revision = '007_add_quiz_knowledge_point_ids'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add 'grading' to session_status and quiz_sessions.grading_claimed_at."""
+    # The quiz_sessions table may have been created by create_all rather than a migration
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_type WHERE typname = 'session_status') THEN
+                ALTER TYPE session_status ADD VALUE IF NOT EXISTS 'grading';
+            END IF;
+        END
+        $$;
+        """
+    )
+
+    inspector = sa.inspect(op.get_bind())
+    if 'quiz_sessions' in inspector.get_table_names():
+        columns = {column['name'] for column in inspector.get_columns('quiz_sessions')}
+        if 'grading_claimed_at' not in columns:
+            op.add_column(
+                'quiz_sessions',
+                sa.Column('grading_claimed_at', sa.DateTime(timezone=True), nullable=True),
+            )
+
+
+def downgrade():
+    """Remove quiz_sessions.grading_claimed_at.
+
+    PostgreSQL cannot drop an enum value; 'grading' stays in session_status.
+    Sessions still grading are completed with their pending answers wrong.
+    """
+    inspector = sa.inspect(op.get_bind())
+    if 'quiz_sessions' in inspector.get_table_names():
+        op.execute(
+            "UPDATE quiz_answers SET is_correct = 'false' WHERE is_correct = 'pending'"
+        )
+        op.execute(
+            "UPDATE quiz_sessions SET status = 'completed' WHERE status = 'grading'"
+        )
+        op.drop_column('quiz_sessions', 'grading_claimed_at')
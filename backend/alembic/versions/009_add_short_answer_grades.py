@@ -0,0 +1,42 @@
+"""Add short_answer_grades table backing the short answer grading cache
+
+Revision ID: 009_add_short_answer_grades
+Revises: 008_add_session_grading
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlalchemy.dialects.postgresql as pg
+
+
+# revision identifiers, used by Alembic.
+revision = '009_add_short_answer_grades'
+down_revision = '008_add_session_grading'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Create short_answer_grades table."""
+    op.create_table(
+        'short_answer_grades',
+        sa.Column('id', pg.UUID(as_uuid=True), primary_key=True, server_default=sa.text('gen_random_uuid()')),
+        sa.Column(
+            'question_id',
+            pg.UUID(as_uuid=True),
+            sa.ForeignKey('quiz_questions.id', ondelete='CASCADE'),
+            nullable=False,
+        ),
+        sa.Column('answer_hash', sa.String(64), nullable=False),
+        sa.Column('answer_key_hash', sa.String(64), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('feedback', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('NOW()'), nullable=False),
+        sa.UniqueConstraint('question_id', 'answer_hash', name='uq_short_answer_grades_question_answer'),
+    )
+
+
+def downgrade():
+    """Drop short_answer_grades table."""
+    op.drop_table('short_answer_grades')
@@ -0,0 +1,41 @@
+"""Make quiz-captured mistakes unique per user and question
+
+Revision ID: 010_add_quiz_mistake_capture
+Revises: 009_add_short_answer_grades
+Create Date: 2026-10-19
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010_add_quiz_mistake_capture'
+down_revision = '009_add_short_answer_grades'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add the partial unique index that quiz mistake capture upserts on."""
+    # The mistakes table may have been created by create_all rather than a migration
+    inspector = sa.inspect(op.get_bind())
+    if 'mistakes' in inspector.get_table_names():
+        indexes = {index['name'] for index in inspector.get_indexes('mistakes')}
+        if 'uq_mistakes_user_question_quiz_grading' not in indexes:
+            op.create_index(
+                'uq_mistakes_user_question_quiz_grading',
+                'mistakes',
+                ['user_id', 'question_id'],
+                unique=True,
+                postgresql_where=sa.text("source = 'quiz_grading'"),
+            )
+
+
+def downgrade():
+    """Drop the quiz mistake capture index."""
+    inspector = sa.inspect(op.get_bind())
+    if 'mistakes' in inspector.get_table_names():
+        indexes = {index['name'] for index in inspector.get_indexes('mistakes')}
+        if 'uq_mistakes_user_question_quiz_grading' in indexes:
+            op.drop_index('uq_mistakes_user_question_quiz_grading', table_name='mistakes')
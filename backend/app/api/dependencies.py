@@ -1,4 +1,4 @@
-"""Authentication dependencies."""
+"""Authentication and service dependencies."""
 from typing import Optional
 from uuid import UUID
 
@@ -9,6 +9,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.database import get_db
 from app.services.auth_service import AuthService
+from app.services.deepseek_service import get_deepseek_service
+from app.services.quiz_grading_service import QuizGradingService
+from app.services.vector_search_service import get_vector_search_service
 from app.utils.jwt import verify_access_token
 
 security = HTTPBearer(auto_error=False)
@@ -138,3 +141,25 @@ async def require_verified_user(
         )
 
     return user, payload
+
+
+async def get_quiz_grading_service(
+    db: AsyncSession = Depends(get_db),
+) -> QuizGradingService:
+    """Get a grading service for the request.
+
+    The DeepSeek and vector search clients are created once per process
+    and initialized in the application lifespan; only the database session
+    is per request.
+
+    Args:
+        db: Database session
+
+    Returns:
+        QuizGradingService bound to the request's session
+    """
+    return QuizGradingService(
+        db,
+        deepseek=get_deepseek_service(),
+        vector_search=get_vector_search_service(),
+    )
@@ -12,6 +12,7 @@ from app.core.database import get_db
 from app.services.mindmap_service import MindmapService
 from app.services.deepseek_service import DeepSeekService
 from app.services.cache_service import cache_service
+from app.services.quiz_job_runner import get_quiz_job_runner
 
 router = APIRouter(prefix="/api/mindmaps", tags=["Mindmaps"])
 
@@ -149,6 +150,9 @@ async def generate_mindmap(
                 mindmap_structure=mindmap.structure,
             )
 
+        # Pre-generate questions so quizzes on this mindmap are served from the bank
+        get_quiz_job_runner().submit_bank_fill(mindmap.id, user.id)
+
         logger.info(
             "Mindmap generated successfully",
             extra={
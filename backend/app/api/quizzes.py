@@ -1,16 +1,20 @@
 """Quiz management routes - comprehensive API for quiz generation, CRUD, and grading."""
 
+import asyncio
+import json
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, AsyncGenerator, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from loguru import logger
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.api.dependencies import get_current_active_user
-from app.core.database import get_db
+from app.api.dependencies import get_current_active_user, get_quiz_grading_service
+from app.core.config import get_settings
+from app.core.database import AsyncSessionLocal, get_db
 from app.models.quiz import Quiz, QuizQuestion, QuizSession, QuizAnswer
 from app.schemas.quiz import (
     AnswerResultResponse,
@@ -21,14 +25,26 @@ from app.schemas.quiz import (
     QuizGenerateRequest,
     QuizGenerateResponse,
     QuizListResponse,
+    QuizProgressResponse,
     QuizSessionResponse,
     QuizStatsResponse,
     QuizUpdateRequest,
     QuizUpdateResponse,
     SubmitAnswersRequest,
 )
+from app.services.deepseek_service import get_deepseek_service
 from app.services.quiz_generation_service import QuizGenerationService
-from app.services.quiz_grading_service import QuizGradingService
+from app.services.quiz_grading_service import (
+    ANSWERABLE_STATUSES,
+    PENDING,
+    QuizGradingService,
+    QuizNotReadyError,
+    load_session_results,
+)
+from app.services.quiz_job_runner import get_quiz_job_runner
+from app.services.vector_search_service import get_vector_search_service
+
+settings = get_settings()
 
 router = APIRouter(prefix="/api/quizzes", tags=["Quizzes"])
 
@@ -45,7 +61,10 @@ async def generate_quiz(
     current_user: tuple = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ) -> QuizGenerateResponse:
-    """Generate quiz from mindmap using AI.
+    """Start generating a quiz from mindmap using AI.
+
+    Generation runs as a background job; poll the progress endpoint or
+    subscribe to the progress stream until the status leaves "generating".
 
     Args:
         mindmap_id: Mindmap ID to generate quiz from
@@ -54,31 +73,33 @@ async def generate_quiz(
         db: Database session
 
     Returns:
-        Generated quiz information
+        Quiz ID and generating status
 
     Raises:
-        HTTPException: If generation fails
+        HTTPException: If parameters are invalid or the quiz cannot be created
     """
     user, _ = current_user
 
     try:
         service = QuizGenerationService(db)
-        quiz = await service.generate_quiz(
+        quiz = await service.create_quiz(
             mindmap_id=mindmap_id,
             user_id=user.id,
             question_count=request.question_count,
             question_types=request.question_types,
             difficulty=request.difficulty,
+            adaptive=request.adaptive,
         )
         await service.close()
 
-        logger.info(f"Generated quiz {quiz.id} for user {user.id}")
+        get_quiz_job_runner().submit(quiz.id)
+        logger.info(f"Started generating quiz {quiz.id} for user {user.id}")
 
         return QuizGenerateResponse(
             quiz_id=quiz.id,
             status=quiz.status,
             total_questions=quiz.question_count,
-            message="Quiz generated successfully",
+            message="Quiz generation started",
         )
 
     except ValueError as e:
@@ -95,6 +116,113 @@ async def generate_quiz(
         )
 
 
+@router.get("/{quiz_id}/progress", response_model=QuizProgressResponse)
+async def get_quiz_progress(
+    quiz_id: uuid.UUID,
+    current_user: tuple = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> QuizProgressResponse:
+    """Get generation progress of a quiz.
+
+    Args:
+        quiz_id: Quiz ID
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        Generation status and question counts
+
+    Raises:
+        HTTPException: If quiz not found
+    """
+    user, _ = current_user
+
+    progress = await QuizGenerationService(db).get_generation_progress(quiz_id, user.id)
+
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+
+    return QuizProgressResponse(**progress)
+
+
+@router.get("/{quiz_id}/progress/stream")
+async def stream_quiz_progress(
+    quiz_id: uuid.UUID,
+    current_user: tuple = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream generation progress of a quiz as server-sent events.
+
+    A "progress" event is sent whenever the question count or status changes;
+    the stream ends after the status leaves "generating".
+
+    Args:
+        quiz_id: Quiz ID
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If quiz not found
+    """
+    user, _ = current_user
+
+    progress = await QuizGenerationService(db).get_generation_progress(quiz_id, user.id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+
+    return StreamingResponse(
+        _progress_events(quiz_id, user.id, progress),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _progress_event(progress: Dict[str, Any]) -> str:
+    """Format progress as a server-sent event."""
+    data = QuizProgressResponse(**progress).model_dump_json()
+    return f"event: progress\ndata: {data}\n\n"
+
+
+async def _progress_events(
+    quiz_id: uuid.UUID,
+    user_id: uuid.UUID,
+    progress: Dict[str, Any],
+) -> AsyncGenerator[str, None]:
+    """Poll generation progress and yield an event per change.
+
+    Each poll uses a short-lived session so the open stream does not hold a
+    database connection between polls.
+    """
+    yield _progress_event(progress)
+    keepalive_every = max(1, int(15 / settings.QUIZ_PROGRESS_POLL_INTERVAL_SECONDS))
+    unchanged = 0
+
+    while progress["status"] == "generating":
+        await asyncio.sleep(settings.QUIZ_PROGRESS_POLL_INTERVAL_SECONDS)
+        async with AsyncSessionLocal() as session:
+            latest = await QuizGenerationService(session).get_generation_progress(quiz_id, user_id)
+        if latest is None:
+            return
+
+        if latest != progress:
+            progress = latest
+            unchanged = 0
+            yield _progress_event(progress)
+        else:
+            unchanged += 1
+            if unchanged % keepalive_every == 0:
+                yield ": keepalive\n\n"
+
+
 # ============================================================================
 # CRUD Endpoints
 # ============================================================================
@@ -180,7 +308,7 @@ async def get_quiz(
         Quiz details with questions
 
     Raises:
-        HTTPException: If quiz not found or unauthorized
+        HTTPException: If quiz not found or unauthorized, or not ready yet
     """
     user, _ = current_user
 
@@ -198,6 +326,13 @@ async def get_quiz(
             detail="Quiz not found",
         )
 
+    if quiz.status not in ANSWERABLE_STATUSES:
+        # Questions of a generating quiz are partial; clients follow the progress endpoints
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Quiz is {quiz.status}",
+        )
+
     return QuizDetailResponse(
         id=quiz.id,
         mindmap_id=quiz.mindmap_id,
@@ -307,10 +442,20 @@ async def delete_quiz(
             detail="Quiz not found",
         )
 
+    # Stop a generation job still writing questions for it
+    if quiz.status == "generating":
+        await get_quiz_job_runner().cancel(quiz_id)
+
     # Delete quiz (cascade will handle questions, sessions, answers)
     await db.delete(quiz)
     await db.commit()
 
+    if settings.QUIZ_SEMANTIC_DEDUP_ENABLED:
+        try:
+            await get_vector_search_service().delete_quiz_questions(str(quiz_id))
+        except Exception as e:
+            logger.warning(f"Failed to remove questions of quiz {quiz_id} from the index: {e}")
+
     logger.info(f"Deleted quiz {quiz_id} for user {user.id}")
 
     return QuizDeleteResponse(
@@ -330,18 +475,23 @@ async def submit_quiz_answers(
     quiz_id: uuid.UUID,
     request: SubmitAnswersRequest,
     current_user: tuple = Depends(get_current_active_user),
-    db: AsyncSession = Depends(get_db),
+    grading_service: QuizGradingService = Depends(get_quiz_grading_service),
 ) -> QuizSessionResponse:
-    """Submit quiz answers for AI grading.
+    """Submit quiz answers for grading.
+
+    Choice and fill-blank answers come back graded. If there are short
+    answers, the session is returned in "grading" status with those answers
+    pending while they are graded in the background; poll
+    GET /sessions/{session_id} or stream /sessions/{session_id}/stream.
 
     Args:
         quiz_id: Quiz ID
         request: Answers to submit
         current_user: Authenticated user
-        db: Database session
+        grading_service: Grading service with the shared AI clients
 
     Returns:
-        Quiz session with grading results
+        Quiz session with grading results so far
 
     Raises:
         HTTPException: If submission fails
@@ -349,10 +499,6 @@ async def submit_quiz_answers(
     user, _ = current_user
 
     try:
-        # Initialize grading service
-        grading_service = QuizGradingService(db)
-        await grading_service.initialize()
-
         # Convert answers to dict format
         answers_data = [
             {"question_id": ans.question_id, "user_answer": ans.user_answer}
@@ -366,35 +512,22 @@ async def submit_quiz_answers(
             answers=answers_data,
         )
 
-        await grading_service.close()
-
-        # Get answers for response
-        await db.refresh(session, attribute_names=["answers"])
-
-        logger.info(f"Graded quiz {quiz_id} for user {user.id}, score: {session.score:.2f}")
-
-        return QuizSessionResponse(
-            id=session.id,
-            quiz_id=session.quiz_id,
-            status=session.status,
-            total_questions=session.total_questions,
-            correct_count=session.correct_count,
-            score=session.score,
-            started_at=session.started_at.isoformat(),
-            completed_at=session.completed_at.isoformat() if session.completed_at else None,
-            answers=[
-                AnswerResultResponse(
-                    question_id=ans.question_id,
-                    user_answer=ans.user_answer,
-                    is_correct=ans.is_correct == "true" or ans.is_correct is True,
-                    ai_score=ans.ai_score,
-                    ai_feedback=ans.ai_feedback,
-                    note_snippets=ans.note_snippets,
-                )
-                for ans in session.answers
-            ],
+        # Short answers are graded in the background; poll or stream the session
+        if session.status == "grading":
+            get_quiz_job_runner().submit_grading(session.id)
+
+        logger.info(
+            f"Submitted quiz {quiz_id} for user {user.id}, "
+            f"status: {session.status}, score: {session.score:.2f}"
         )
 
+        return _session_response(session)
+
+    except QuizNotReadyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(e),
+        )
     except ValueError as e:
         logger.error(f"Answer submission validation error: {e}")
         raise HTTPException(
@@ -409,6 +542,91 @@ async def submit_quiz_answers(
         )
 
 
+@router.post("/{quiz_id}/submit/stream")
+async def submit_quiz_answers_stream(
+    quiz_id: uuid.UUID,
+    request: SubmitAnswersRequest,
+    current_user: tuple = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Submit quiz answers and stream each grading result as it is ready.
+
+    An "answer" event is sent per answer in the order grading finishes,
+    short answers included, then a "summary" event with the completed
+    session. If grading fails, an "error" event ends the stream and nothing
+    is stored.
+
+    Args:
+        quiz_id: Quiz ID
+        request: Answers to submit
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If quiz not found or not ready to be answered
+    """
+    user, _ = current_user
+
+    result = await db.execute(
+        select(Quiz.status).where(Quiz.id == quiz_id, Quiz.user_id == user.id)
+    )
+    quiz_status = result.scalar_one_or_none()
+    if quiz_status is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Quiz not found",
+        )
+    if quiz_status not in ANSWERABLE_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Quiz is {quiz_status} and cannot be answered",
+        )
+
+    answers_data = [
+        {"question_id": ans.question_id, "user_answer": ans.user_answer}
+        for ans in request.answers
+    ]
+
+    return StreamingResponse(
+        _submission_events(quiz_id, user.id, answers_data),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _submission_events(
+    quiz_id: uuid.UUID,
+    user_id: uuid.UUID,
+    answers: List[Dict[str, Any]],
+) -> AsyncGenerator[str, None]:
+    """Grade a submission and yield an event per graded answer, then a summary.
+
+    The stream outlives the request, so grading uses its own session.
+    """
+    async with AsyncSessionLocal() as db:
+        grading_service = QuizGradingService(
+            db,
+            deepseek=get_deepseek_service(),
+            vector_search=get_vector_search_service(),
+        )
+        try:
+            async for kind, item in grading_service.submit_answers_streaming(quiz_id, user_id, answers):
+                if kind == "answer":
+                    yield f"event: answer\ndata: {_answer_response(item).model_dump_json()}\n\n"
+                else:
+                    yield f"event: summary\ndata: {_session_response(item).model_dump_json()}\n\n"
+        except Exception as e:
+            logger.error(f"Streamed submission of quiz {quiz_id} failed: {e}")
+            detail = str(e) if isinstance(e, (QuizNotReadyError, ValueError)) else "Failed to submit answers"
+            yield f"event: error\ndata: {json.dumps({'detail': detail})}\n\n"
+            return
+
+    logger.info(f"Streamed submission of quiz {quiz_id} for user {user_id}")
+
+
 @router.get("/sessions/{session_id}", response_model=QuizSessionResponse)
 async def get_quiz_session(
     session_id: uuid.UUID,
@@ -417,6 +635,9 @@ async def get_quiz_session(
 ) -> QuizSessionResponse:
     """Get quiz session results.
 
+    A plain read: one query for the session and its answers, without the
+    grading service or its AI clients.
+
     Args:
         session_id: Session ID
         current_user: Authenticated user
@@ -430,21 +651,58 @@ async def get_quiz_session(
     """
     user, _ = current_user
 
-    grading_service = QuizGradingService(db)
-    await grading_service.initialize()
+    session = await load_session_results(db, session_id, user.id)
+
+    if not session:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Session not found",
+        )
 
-    session = await grading_service.get_session_results(session_id, user.id)
+    return _session_response(session)
 
-    await grading_service.close()
 
-    if not session:
+@router.get("/sessions/{session_id}/stream")
+async def stream_quiz_session(
+    session_id: uuid.UUID,
+    current_user: tuple = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+) -> StreamingResponse:
+    """Stream quiz session results as server-sent events.
+
+    A "session" event is sent with the current results and again whenever
+    background grading changes them; the stream ends after the status
+    leaves "grading".
+
+    Args:
+        session_id: Session ID
+        current_user: Authenticated user
+        db: Database session
+
+    Returns:
+        text/event-stream response
+
+    Raises:
+        HTTPException: If session not found or unauthorized
+    """
+    user, _ = current_user
+
+    session = await load_session_results(db, session_id, user.id)
+    if session is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Session not found",
         )
 
-    await db.refresh(session, attribute_names=["answers"])
+    return StreamingResponse(
+        _session_events(session_id, user.id, _session_response(session)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
+
+def _session_response(session: QuizSession) -> QuizSessionResponse:
+    """Build the response for a quiz session with loaded answers."""
     return QuizSessionResponse(
         id=session.id,
         quiz_id=session.quiz_id,
@@ -454,20 +712,60 @@ async def get_quiz_session(
         score=session.score,
         started_at=session.started_at.isoformat(),
         completed_at=session.completed_at.isoformat() if session.completed_at else None,
-        answers=[
-            AnswerResultResponse(
-                question_id=ans.question_id,
-                user_answer=ans.user_answer,
-                is_correct=ans.is_correct == "true" or ans.is_correct is True,
-                ai_score=ans.ai_score,
-                ai_feedback=ans.ai_feedback,
-                note_snippets=ans.note_snippets,
-            )
-            for ans in session.answers
-        ],
+        answers=[_answer_response(ans) for ans in session.answers],
+    )
+
+
+def _answer_response(ans: QuizAnswer) -> AnswerResultResponse:
+    """Build the response for one quiz answer."""
+    return AnswerResultResponse(
+        question_id=ans.question_id,
+        user_answer=ans.user_answer,
+        is_correct=ans.is_correct == "true" or ans.is_correct is True,
+        is_pending=ans.is_correct == PENDING,
+        ai_score=ans.ai_score,
+        ai_feedback=ans.ai_feedback,
+        note_snippets=ans.note_snippets,
     )
 
 
+def _session_event(response: QuizSessionResponse) -> str:
+    """Format session results as a server-sent event."""
+    return f"event: session\ndata: {response.model_dump_json()}\n\n"
+
+
+async def _session_events(
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+    response: QuizSessionResponse,
+) -> AsyncGenerator[str, None]:
+    """Poll a grading session and yield an event per change.
+
+    Each poll uses a short-lived session so the open stream does not hold a
+    database connection between polls.
+    """
+    yield _session_event(response)
+    keepalive_every = max(1, int(15 / settings.QUIZ_PROGRESS_POLL_INTERVAL_SECONDS))
+    unchanged = 0
+
+    while response.status == "grading":
+        await asyncio.sleep(settings.QUIZ_PROGRESS_POLL_INTERVAL_SECONDS)
+        async with AsyncSessionLocal() as db:
+            session = await load_session_results(db, session_id, user_id)
+            latest = _session_response(session) if session is not None else None
+        if latest is None:
+            return
+
+        if latest != response:
+            response = latest
+            unchanged = 0
+            yield _session_event(response)
+        else:
+            unchanged += 1
+            if unchanged % keepalive_every == 0:
+                yield ": keepalive\n\n"
+
+
 @router.get("/{quiz_id}/review", response_model=QuizDetailResponse)
 async def get_quiz_review(
     quiz_id: uuid.UUID,
@@ -19,8 +19,13 @@ from app.schemas.analytics import (
     StudyTimeResponse,
     StudyTimeByCategory,
     DailyStudyPattern,
+    LLMFeatureUsage,
+    LLMUsageResponse,
+    QualityPrescreenStats,
 )
 from app.services.enhanced_analytics_service import AnalyticsService
+from app.services.llm_usage_service import LLMUsageService, get_usage_tracker
+from app.utils.question_prescreen import get_prescreen_stats
 
 router = APIRouter(prefix="/api/stats", tags=["Statistics"])
 
@@ -135,3 +140,31 @@ async def get_learning_timeline(
     timeline_data = await analytics_service.get_learning_timeline(user.id, days=days, group_by=group_by)
 
     return timeline_data
+
+
+@router.get("/llm-usage", response_model=LLMUsageResponse)
+async def get_llm_usage(
+    days: int = Query(7, ge=1, le=90),
+    current_user: tuple = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Get AI token and latency usage per feature.
+
+    Returns token counts, latency and retries of the user's LLM calls
+    grouped by feature (mindmap, question, quality, grading), and the share
+    of quality assessments the local pre-screen settled without the LLM.
+    """
+    user, _ = current_user
+
+    # Make sure recently buffered calls are included
+    await get_usage_tracker().flush()
+
+    usage_service = LLMUsageService(db)
+    by_feature = await usage_service.get_feature_rollup(days=days, user_id=user.id)
+
+    return LLMUsageResponse(
+        days=days,
+        total_tokens=sum(item["total_tokens"] for item in by_feature),
+        by_feature=[LLMFeatureUsage(**item) for item in by_feature],
+        quality_prescreen=QualityPrescreenStats(**get_prescreen_stats().snapshot()),
+    )
@@ -67,6 +67,18 @@ class Settings(BaseSettings):
     MAX_TOKENS_PER_NOTE: int = 8000
     DEEPSEEK_BASE_URL: str = "https://api.deepseek.com/v1"
 
+    # LLM Provider: "deepseek" or "fake" (local deterministic stand-in for load tests)
+    LLM_PROVIDER: str = "deepseek"
+    FAKE_LLM_LATENCY_MS: float = 200.0
+    FAKE_LLM_LATENCY_JITTER_MS: float = 50.0
+    FAKE_LLM_ERROR_RATE: float = 0.0
+    FAKE_LLM_SEED: int = 0
+    FAKE_LLM_RESPONSES_PATH: str = ""
+
+    # LLM Usage Telemetry
+    LLM_USAGE_FLUSH_BATCH_SIZE: int = 50
+    LLM_USAGE_FLUSH_INTERVAL_SECONDS: float = 30.0
+
     # Vector Search
     CHROMA_PERSIST_DIR: str = "./chroma_db"
     VECTOR_SIMILARITY_THRESHOLD: float = 0.7
@@ -79,6 +91,35 @@ class Settings(BaseSettings):
     QUIZ_QUALITY_THRESHOLD: float = 0.7
     QUIZ_MAX_RETRIES: int = 3
     QUIZ_DUPLICATE_THRESHOLD: float = 0.85
+    QUIZ_DEDUP_HISTORY_LIMIT: int = 0  # Recent questions of the user to avoid repeating, 0 disables
+    QUIZ_SEMANTIC_DEDUP_ENABLED: bool = False
+    QUIZ_SEMANTIC_DEDUP_THRESHOLD: float = 0.92
+    QUIZ_ADAPTIVE_WEAKNESS_WEIGHT: float = 4.0  # Extra selection weight of a fully weak knowledge point
+    QUIZ_ADAPTIVE_EASIER_ABOVE: float = 0.6  # Mean weakness above which adaptive quizzes get easier
+    QUIZ_ADAPTIVE_HARDER_BELOW: float = 0.25  # Mean weakness below which adaptive quizzes get harder
+    QUIZ_QUALITY_BATCH_SIZE: int = 20
+    QUIZ_PRESCREEN_ENABLED: bool = True
+    QUIZ_PRESCREEN_REJECT_THRESHOLD: float = 0.3
+    QUIZ_PRESCREEN_ACCEPT_THRESHOLD: float = 0.96
+    QUIZ_GENERATION_CONCURRENCY: int = 8
+    QUIZ_GRADING_CONCURRENCY: int = 5
+    QUIZ_GRADING_BATCH_SIZE: int = 10  # Short answers graded per LLM call
+    QUIZ_GRADING_CACHE_ENABLED: bool = True  # Reuse grades of identical short answers
+    QUIZ_GRADING_CACHE_TTL_SECONDS: int = 2592000  # 30 days in Redis; the database keeps them
+    QUIZ_MISTAKE_CAPTURE_ENABLED: bool = True  # Add wrong quiz answers to the mistake book
+    QUIZ_GENERATION_BATCH_SIZE: int = 5
+    QUIZ_JOB_MAX_CONCURRENT: int = 4
+    QUIZ_GRADING_MAX_CONCURRENT_JOBS: int = 8  # Background short answer grading jobs
+    QUIZ_JOB_LEASE_SECONDS: int = 300
+    QUIZ_JOB_SWEEP_INTERVAL_SECONDS: float = 60.0
+    QUIZ_PROGRESS_POLL_INTERVAL_SECONDS: float = 1.0
+
+    # Question Bank
+    QUESTION_BANK_ENABLED: bool = True
+    QUESTION_BANK_FILL_PER_POINT: int = 2
+    QUESTION_BANK_FILL_MAX_CONCURRENT: int = 1  # Separate from QUIZ_JOB_MAX_CONCURRENT
+    QUESTION_BANK_FILL_TYPES: Union[str, List[str]] = Field(default="choice,fill_blank")
+    QUESTION_BANK_FILL_DIFFICULTIES: Union[str, List[str]] = Field(default="medium")
 
     # File Upload
     MAX_UPLOAD_SIZE: int = 10485760  # 10MB
@@ -110,6 +151,14 @@ class Settings(BaseSettings):
             return [ext.strip() for ext in v.split(",")]
         return v
 
+    @field_validator("QUESTION_BANK_FILL_TYPES", "QUESTION_BANK_FILL_DIFFICULTIES", mode="before")
+    @classmethod
+    def parse_question_bank_fill(cls, v: Union[str, List[str]]) -> List[str]:
+        """Parse question bank fill types and difficulties from string or list"""
+        if isinstance(v, str):
+            return [item.strip() for item in v.split(",") if item.strip()]
+        return v
+
     @field_validator("JWT_SECRET_KEY")
     @classmethod
     def validate_jwt_secret(cls, v: str) -> str:
@@ -19,6 +19,10 @@ from app.api.stats import router as stats_router
 from app.api.health import router as health_router
 from app.core.config import get_settings
 from app.core.database import engine, Base
+from app.services.deepseek_service import close_shared_client, get_deepseek_service
+from app.services.llm_usage_service import get_usage_tracker
+from app.services.quiz_job_runner import get_quiz_job_runner
+from app.services.vector_search_service import close_vector_search_service, get_vector_search_service
 from app.utils.logging import setup_logging
 from app.middleware.csrf import CSRFMiddleware
 
@@ -39,11 +43,30 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     # Create database tables
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+    # Start batched flushing of LLM usage telemetry
+    usage_tracker = get_usage_tracker()
+    usage_tracker.start()
+
+    # Create the AI clients once per process; requests share them
+    get_deepseek_service()
+    try:
+        await get_vector_search_service().initialize()
+    except Exception as e:
+        logger.warning(f"Vector search unavailable at startup: {e}")
+
+    # Run quiz generation jobs, resuming those interrupted by a restart
+    quiz_job_runner = get_quiz_job_runner()
+    quiz_job_runner.start()
     
     yield
     
     # Shutdown
     logger.info("Shutting down StudyNotesManager API")
+    await quiz_job_runner.stop()
+    await usage_tracker.stop()
+    await close_vector_search_service()
+    await close_shared_client()
 
 # Create FastAPI application
 app = FastAPI(
@@ -8,6 +8,9 @@ from app.models.mindmap import Mindmap, KnowledgePoint
 from app.models.quiz import Quiz, QuizQuestion, QuizSession, QuizAnswer
 from app.models.mistake import Mistake, MistakeReview
 from app.models.share import NoteShare, StudySession
+from app.models.llm_usage import LLMUsageRecord
+from app.models.question_bank import QuestionBankItem
+from app.models.grading_cache import ShortAnswerGrade
 
 __all__ = [
     "User",
@@ -24,4 +27,7 @@ __all__ = [
     "MistakeReview",
     "NoteShare",
     "StudySession",
+    "LLMUsageRecord",
+    "QuestionBankItem",
+    "ShortAnswerGrade",
 ]
@@ -0,0 +1,39 @@
+"""Short answer grade cache model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, String, Text, UniqueConstraint
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class ShortAnswerGrade(Base):
+    """LLM grade of a normalized short answer, reused when it is submitted again.
+
+    Backs the Redis grading cache. A grade only applies while the question's
+    correct answer still hashes to answer_key_hash.
+    """
+
+    __tablename__ = "short_answer_grades"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    question_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("quiz_questions.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # SHA-256 of the normalized user answer and of the correct answer
+    answer_hash = Column(String(64), nullable=False)
+    answer_key_hash = Column(String(64), nullable=False)
+
+    score = Column(Float, nullable=False)
+    feedback = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("question_id", "answer_hash", name="uq_short_answer_grades_question_answer"),
+    )
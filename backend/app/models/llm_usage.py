@@ -0,0 +1,39 @@
+"""LLM usage telemetry model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.database import Base
+
+
+class LLMUsageRecord(Base):
+    """Token usage and latency of a single LLM completion call."""
+
+    __tablename__ = "llm_usage_records"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+
+    # Calling feature: mindmap, question, quality, grading, ...
+    feature = Column(String(50), nullable=False)
+    model = Column(String(100), nullable=False)
+
+    # Usage reported by the provider
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+
+    # Call characteristics
+    latency_ms = Column(Integer, nullable=False, default=0)
+    retries = Column(Integer, nullable=False, default=0)
+    success = Column(Boolean, nullable=False, default=True)
+
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        Index("idx_llm_usage_user_created", "user_id", "created_at"),
+        Index("idx_llm_usage_feature_created", "feature", "created_at"),
+    )
@@ -2,7 +2,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, Boolean, JSON
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Text, Boolean, JSON, text
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -59,6 +59,18 @@ class Mistake(Base):
     user = relationship("User")
     reviews = relationship("MistakeReview", back_populates="mistake", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_mistakes_user_question", "user_id", "question_id"),
+        # Mistakes captured from quiz grading are upserted per user and question
+        Index(
+            "uq_mistakes_user_question_quiz_grading",
+            "user_id",
+            "question_id",
+            unique=True,
+            postgresql_where=text("source = 'quiz_grading'"),
+        ),
+    )
+
     def __repr__(self):
         return f"<Mistake {self.id}>"
 
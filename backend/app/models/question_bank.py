@@ -0,0 +1,43 @@
+"""Question bank model."""
+
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, JSON, String, Text
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import relationship
+
+from app.core.database import Base
+
+
+class QuestionBankItem(Base):
+    """Validated question kept for reuse across quizzes of a knowledge point."""
+
+    __tablename__ = "question_bank_items"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    knowledge_point_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("mindmap_knowledge_points.id", ondelete="CASCADE"),
+        nullable=False,
+    )
+
+    # Question content
+    question_text = Column(Text, nullable=False)
+    question_type = Column(String(20), nullable=False)  # choice, fill_blank, short_answer
+    options = Column(JSON, nullable=True)
+    correct_answer = Column(Text, nullable=False)
+    explanation = Column(Text, nullable=True)
+    difficulty = Column(String(10), nullable=False)  # easy, medium, hard
+
+    # Number of quizzes the question was served to; least used is served first
+    times_used = Column(Integer, nullable=False, default=0)
+
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+
+    # Relationships
+    knowledge_point = relationship("KnowledgePoint")
+
+    __table_args__ = (
+        Index("idx_question_bank_point_type_difficulty", "knowledge_point_id", "question_type", "difficulty"),
+    )
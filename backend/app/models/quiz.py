@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Float, Integer, String, Text, JSON
+from sqlalchemy import Boolean, Column, DateTime, Enum, ForeignKey, Float, Index, Integer, String, Text, JSON
 from sqlalchemy.dialects.postgresql import UUID, ARRAY
 from sqlalchemy.orm import relationship
 
@@ -25,9 +25,15 @@ class Quiz(Base):
     difficulty = Column(Enum("easy", "medium", "hard", name="quiz_difficulty"), default="medium")
     # Use JSON instead of ARRAY for SQLite compatibility
     question_types = Column(JSON, nullable=False)  # ["choice", "fill_blank", "short_answer"]
+    # Knowledge points and difficulty chosen from the user's weak areas
+    adaptive = Column(Boolean, default=False, nullable=False)
+    # Selected knowledge point IDs in question order, so resumed jobs fill the same slots
+    knowledge_point_ids = Column(JSON, nullable=True)
 
     # Status
-    status = Column(Enum("generating", "ready", "completed", name="quiz_status"), default="generating")
+    status = Column(Enum("generating", "ready", "completed", "failed", name="quiz_status"), default="generating")
+    # Lease of the background generation job, renewed after every round
+    generation_claimed_at = Column(DateTime(timezone=True), nullable=True)
 
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
@@ -39,6 +45,10 @@ class Quiz(Base):
     questions = relationship("QuizQuestion", back_populates="quiz", cascade="all, delete-orphan")
     sessions = relationship("QuizSession", back_populates="quiz", cascade="all, delete-orphan")
 
+    __table_args__ = (
+        Index("idx_quizzes_user_mindmap", "user_id", "mindmap_id"),
+    )
+
 
 class QuizQuestion(Base):
     """Quiz question model."""
@@ -84,7 +94,7 @@ class QuizSession(Base):
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
 
     # Session status
-    status = Column(Enum("in_progress", "completed", name="session_status"), default="in_progress")
+    status = Column(Enum("in_progress", "grading", "completed", name="session_status"), default="in_progress")
 
     # Results
     total_questions = Column(Integer, nullable=False)
@@ -95,6 +105,9 @@ class QuizSession(Base):
     started_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
     completed_at = Column(DateTime(timezone=True), nullable=True)
 
+    # Lease of the background grading job, renewed after every grading batch
+    grading_claimed_at = Column(DateTime(timezone=True), nullable=True)
+
     # Relationships
     quiz = relationship("Quiz", back_populates="sessions")
     user = relationship("User")
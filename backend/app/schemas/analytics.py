@@ -127,3 +127,36 @@ class StudyTimeResponse(BaseModel):
     avg_session_duration_minutes: float
     by_category: list[StudyTimeByCategory]
     daily_patterns: list[DailyStudyPattern]
+
+
+class LLMFeatureUsage(BaseModel):
+    """LLM usage rollup for a single feature."""
+
+    feature: str
+    calls: int
+    prompt_tokens: int
+    completion_tokens: int
+    total_tokens: int
+    avg_latency_ms: float
+    max_latency_ms: int
+    retries: int
+    failures: int
+
+
+class QualityPrescreenStats(BaseModel):
+    """Local quality pre-screen decisions of this server process."""
+
+    screened: int
+    accepted: int
+    rejected: int
+    sent_to_ai: int
+    ai_calls_avoided_ratio: float
+
+
+class LLMUsageResponse(BaseModel):
+    """LLM usage response schema."""
+
+    days: int
+    total_tokens: int
+    by_feature: list[LLMFeatureUsage]
+    quality_prescreen: Optional[QualityPrescreenStats] = None
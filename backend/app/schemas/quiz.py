@@ -22,6 +22,10 @@ class QuizGenerateRequest(BaseModel):
         pattern="^(easy|medium|hard)$",
         description="Difficulty level: easy, medium, or hard"
     )
+    adaptive: bool = Field(
+        default=False,
+        description="Focus questions and difficulty on the user's weak knowledge points"
+    )
 
     @field_validator("question_types")
     @classmethod
@@ -112,6 +116,7 @@ class AnswerResultResponse(BaseModel):
     question_id: uuid.UUID
     user_answer: str
     is_correct: bool
+    is_pending: bool = False  # Short answer still being graded in the background
     ai_score: Optional[float]
     ai_feedback: Optional[str]
     note_snippets: Optional[List[Dict[str, Any]]]
@@ -140,6 +145,15 @@ class QuizGenerateResponse(BaseModel):
     message: str
 
 
+class QuizProgressResponse(BaseModel):
+    """Progress of a quiz generation job."""
+
+    quiz_id: uuid.UUID
+    status: str
+    completed_questions: int
+    total_questions: int
+
+
 class QuizDetailResponse(BaseModel):
     """Quiz detail response."""
 
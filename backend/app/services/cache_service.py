@@ -1,7 +1,7 @@
-"""Redis caching service for mindmap generation results."""
+"""Redis caching service for mindmap generation and short answer grading results."""
 import hashlib
 import json
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
 from loguru import logger
 from redis.asyncio import Redis
@@ -206,6 +206,69 @@ class CacheService:
             )
             return False
 
+    def grading_cache_key(
+        self,
+        question_id: Any,
+        answer_key_hash: str,
+        answer_hash: str,
+    ) -> str:
+        """Generate the cache key of a short answer grade.
+
+        The key includes the hash of the question's correct answer, so
+        changing the answer key leaves old grades unreachable.
+        """
+        return f"grading:{question_id}:{answer_key_hash[:16]}:{answer_hash[:16]}"
+
+    async def get_cached_grades(self, cache_keys: List[str]) -> List[Optional[dict]]:
+        """Get cached short answer grades, None for each miss."""
+        misses: List[Optional[dict]] = [None] * len(cache_keys)
+        if not cache_keys or not await self.is_enabled():
+            return misses
+
+        try:
+            redis = await self._get_redis()
+            if not redis:
+                return misses
+
+            cached = await redis.mget(cache_keys)
+            logger.debug(
+                f"Grading cache hits: {sum(1 for c in cached if c)}/{len(cache_keys)}",
+                extra={"action": "grading_cache_lookup"}
+            )
+            return [json.loads(c) if c else None for c in cached]
+        except RedisError as e:
+            logger.error(
+                f"Redis error during grade retrieval: {e}",
+                extra={"action": "cache_retrieval_error"}
+            )
+            return misses
+
+    async def cache_grades(
+        self,
+        grades: Dict[str, dict],
+        ttl: int = 2592000  # 30 days default
+    ) -> bool:
+        """Cache short answer grades by cache key."""
+        if not grades or not await self.is_enabled():
+            return False
+
+        try:
+            redis = await self._get_redis()
+            if not redis:
+                return False
+
+            pipeline = redis.pipeline(transaction=False)
+            for cache_key, grade in grades.items():
+                pipeline.setex(cache_key, ttl, json.dumps(grade))
+            await pipeline.execute()
+            return True
+        except RedisError as e:
+            logger.error(
+                f"Redis error during grade storage: {e}",
+                extra={"action": "cache_storage_error"}
+            )
+            return False
+
     async def close(self):
         """Close Redis connection."""
         if self.redis:
@@ -1,56 +1,45 @@
 """DeepSeek API integration service."""
 
+import asyncio
 import json
+import time
+import uuid
 from typing import Any, Dict, List, Optional
 
 import httpx
 from loguru import logger
 
 from app.core.config import get_settings
+from app.services.llm_provider import LLMProvider, close_llm_provider, get_llm_provider
+from app.services.llm_usage_service import get_usage_tracker
+from app.utils.json_extract import extract_json
+from app.utils.prompt_sanitizer import sanitize_for_prompt
+from app.utils.tokenizer import get_token_counter
 
 settings = get_settings()
 
-# Module-level shared HTTP client to prevent resource leaks
-_shared_client: Optional[httpx.AsyncClient] = None
-
-
-def get_shared_client() -> httpx.AsyncClient:
-    """Get or create shared HTTP client for DeepSeek API.
+def get_shared_client() -> LLMProvider:
+    """Get the shared LLM provider used by DeepSeekService.
 
     Returns:
-        Shared AsyncClient instance
+        Shared provider selected by LLM_PROVIDER
     """
-    global _shared_client
-    if _shared_client is None:
-        _shared_client = httpx.AsyncClient(
-            base_url=settings.DEEPSEEK_BASE_URL,
-            headers={
-                "Authorization": f"Bearer {settings.DEEPSEEK_API_KEY}",
-                "Content-Type": "application/json",
-            },
-            timeout=60.0,
-        )
-        logger.info("Created shared DeepSeek HTTP client")
-    return _shared_client
+    return get_llm_provider()
 
 
 async def close_shared_client() -> None:
-    """Close shared HTTP client. Should be called on application shutdown."""
-    global _shared_client
-    if _shared_client is not None:
-        await _shared_client.aclose()
-        _shared_client = None
-        logger.info("Closed shared DeepSeek HTTP client")
+    """Close shared LLM provider. Should be called on application shutdown."""
+    await close_llm_provider()
 
 
 class DeepSeekService:
     """Service for interacting with DeepSeek API."""
 
     def __init__(self) -> None:
-        """Initialize DeepSeek service with shared HTTP client."""
+        """Initialize DeepSeek service with the shared LLM provider."""
         self.api_key = settings.DEEPSEEK_API_KEY
         self.base_url = settings.DEEPSEEK_BASE_URL
-        # Use shared client to prevent resource leaks
+        # Use shared provider to prevent resource leaks
         self.client = get_shared_client()
 
     async def close(self) -> None:
@@ -68,13 +57,20 @@ class DeepSeekService:
         endpoint: str,
         data: Dict[str, Any],
         max_retries: int = 3,
+        feature: str = "general",
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Make API request with retry logic and rate limiting.
 
+        Token usage, latency and retries of every request are recorded
+        with the usage tracker.
+
         Args:
             endpoint: API endpoint
             data: Request payload
             max_retries: Maximum number of retries
+            feature: Calling feature for usage accounting
+            user_id: User the request is made for, if known
 
         Returns:
             API response
@@ -87,23 +83,44 @@ class DeepSeekService:
         rate_limiter = get_deepseek_rate_limiter()
         await rate_limiter.acquire()
 
-        for attempt in range(max_retries):
-            try:
-                response = await self.client.post(endpoint, json=data)
-                response.raise_for_status()
-                return response.json()
+        start = time.perf_counter()
+        attempt = 0
+        usage: Dict[str, Any] = {}
+        success = False
 
-            except httpx.HTTPStatusError as e:
-                logger.warning(f"DeepSeek API request failed (attempt {attempt + 1}): {e}")
-                if attempt == max_retries - 1:
+        try:
+            for attempt in range(max_retries):
+                try:
+                    response = await self.client.post(endpoint, json=data)
+                    response.raise_for_status()
+                    result = response.json()
+                    usage = result.get("usage") or {}
+                    success = True
+                    return result
+
+                except httpx.HTTPStatusError as e:
+                    logger.warning(f"DeepSeek API request failed (attempt {attempt + 1}): {e}")
+                    if attempt == max_retries - 1:
+                        raise
+                    await self._handle_error(e.response.status_code)
+
+                except httpx.RequestError as e:
+                    logger.error(f"DeepSeek API request error: {e}")
                     raise
-                await self._handle_error(e.response.status_code)
-
-            except httpx.RequestError as e:
-                logger.error(f"DeepSeek API request error: {e}")
-                raise
 
-        return {}  # Should never reach here
+            return {}  # Should never reach here
+
+        finally:
+            get_usage_tracker().record(
+                feature=feature,
+                model=data.get("model", "unknown"),
+                prompt_tokens=usage.get("prompt_tokens", 0),
+                completion_tokens=usage.get("completion_tokens", 0),
+                latency_ms=int((time.perf_counter() - start) * 1000),
+                retries=attempt,
+                success=success,
+                user_id=user_id,
+            )
 
     async def _handle_error(self, status_code: int) -> None:
         """Handle API errors with appropriate backoff.
@@ -111,8 +128,6 @@ class DeepSeekService:
         Args:
             status_code: HTTP status code
         """
-        import asyncio
-
         if status_code == 429:  # Rate limit
             wait_time = 2.0
             logger.warning(f"Rate limit hit, waiting {wait_time}s")
@@ -128,6 +143,9 @@ class DeepSeekService:
         max_tokens: int = 2000,
         temperature: float = 0.7,
         model: str = "deepseek-chat",
+        feature: str = "general",
+        user_id: Optional[uuid.UUID] = None,
+        json_mode: bool = False,
     ) -> str:
         """Generate text completion.
 
@@ -136,6 +154,10 @@ class DeepSeekService:
             max_tokens: Maximum tokens to generate
             temperature: Sampling temperature
             model: Model name
+            feature: Calling feature for usage accounting
+            user_id: User the completion is generated for, if known
+            json_mode: Request a single JSON object as output. The prompt
+                must mention JSON for the API to accept it.
 
         Returns:
             Generated text
@@ -146,8 +168,15 @@ class DeepSeekService:
             "max_tokens": max_tokens,
             "temperature": temperature,
         }
-
-        response = await self._make_request("/chat/completions", data)
+        if json_mode:
+            data["response_format"] = {"type": "json_object"}
+
+        response = await self._make_request(
+            "/chat/completions",
+            data,
+            feature=feature,
+            user_id=user_id,
+        )
         return response["choices"][0]["message"]["content"]
 
     async def generate_mindmap(
@@ -155,6 +184,7 @@ class DeepSeekService:
         note_content: str,
         note_title: str,
         max_levels: int = 5,
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Generate mindmap structure from note content.
 
@@ -162,6 +192,7 @@ class DeepSeekService:
             note_content: Note text content
             note_title: Note title
             max_levels: Maximum hierarchy levels
+            user_id: Owner of the note, for usage accounting
 
         Returns:
             Mindmap structure as nested dictionary
@@ -170,20 +201,16 @@ class DeepSeekService:
             ValueError: If note content is too long
             json.JSONDecodeError: If response is not valid JSON
         """
-        # Validate input length
-        import tiktoken
-
-        encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        token_count = len(encoding.encode(note_content))
-
+        # Keep the most recent content within the token budget
+        note_content, token_count = get_token_counter().truncate(
+            note_content,
+            settings.MAX_TOKENS_PER_NOTE,
+            keep="tail",
+        )
         if token_count > settings.MAX_TOKENS_PER_NOTE:
             logger.warning(
                 f"Note content too long ({token_count} tokens), truncating to {settings.MAX_TOKENS_PER_NOTE}"
             )
-            # Truncate from the beginning (keep most recent content)
-            note_content = encoding.decode(
-                encoding.encode(note_content)[-settings.MAX_TOKENS_PER_NOTE :]
-            )
 
         prompt = self._get_mindmap_prompt(note_title, note_content, max_levels)
 
@@ -192,6 +219,9 @@ class DeepSeekService:
                 prompt=prompt,
                 max_tokens=2000,
                 temperature=0.3,  # Lower temperature for more structured output
+                feature="mindmap",
+                user_id=user_id,
+                json_mode=True,
             )
 
             # Extract JSON from response
@@ -220,33 +250,7 @@ class DeepSeekService:
         Returns:
             Sanitized text
         """
-        # Remove potential prompt injection patterns
-        import re
-
-        # Remove common injection patterns
-        injection_patterns = [
-            r"(?i)ignore\s+(all\s+)?(previous|above|the)\s+instructions",
-            r"(?i)disregard\s+(all\s+)?(previous|above|the)\s+instructions",
-            r"(?i)forget\s+(all\s+)?(previous|above|the)\s+instructions",
-            r"(?i)override\s+(all\s+)?(previous|above|the)\s+instructions",
-            r"(?i)system\s*:",
-            r"(?i)assistant\s*:",
-            r"(?i)\[INST\]",
-            r"(?i)\[/INST\]",
-            r"(?i)<<(.*?>>)",
-            r"(?i)###\s*(Instruction|Response|System|Assistant)",
-        ]
-
-        sanitized = text
-        for pattern in injection_patterns:
-            sanitized = re.sub(pattern, "[REDACTED]", sanitized)
-
-        # Limit length to prevent DoS
-        max_length = 10000
-        if len(sanitized) > max_length:
-            sanitized = sanitized[:max_length] + "..."
-
-        return sanitized
+        return sanitize_for_prompt(text)
 
     def _get_mindmap_prompt(
         self,
@@ -315,31 +319,7 @@ Generate the mind map now:"""
         Raises:
             ValueError: If no valid JSON found
         """
-        # Try parsing entire response first
-        try:
-            json.loads(response.strip())
-            return response.strip()
-        except json.JSONDecodeError:
-            pass
-
-        # Try to find JSON within code blocks
-        import re
-
-        # Match ```json...``` or ```...```
-        pattern = r"```(?:json)?\s*(\{.*?\})\s*```"
-        match = re.search(pattern, response, re.DOTALL)
-
-        if match:
-            return match.group(1)
-
-        # Try to find first { ... } block
-        pattern = r"\{[^{}]*(?:\{[^{}]*\}[^{}]*)*\}"
-        match = re.search(pattern, response, re.DOTALL)
-
-        if match:
-            return match.group(0)
-
-        raise ValueError("No valid JSON found in response")
+        return extract_json(response)
 
     def _validate_mindmap_structure(
         self,
@@ -399,3 +379,19 @@ Generate the mind map now:"""
             )
 
         return points
+
+
+# Global DeepSeek service
+_deepseek_service: Optional[DeepSeekService] = None
+
+
+def get_deepseek_service() -> DeepSeekService:
+    """Get or create global DeepSeek service.
+
+    Returns:
+        DeepSeekService instance
+    """
+    global _deepseek_service
+    if _deepseek_service is None:
+        _deepseek_service = DeepSeekService()
+    return _deepseek_service
@@ -0,0 +1,336 @@
+"""LLM provider backends.
+
+DeepSeekService talks to a provider through ``post(endpoint, json=...)`` and
+``aclose()``. ``DeepSeekProvider`` sends requests to the DeepSeek HTTP API;
+``FakeLLMProvider`` answers locally with configurable latency, error rate and
+canned JSON so generation and grading can be load tested without API spend.
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class LLMProvider(ABC):
+    """Interface of an OpenAI-compatible chat completion backend."""
+
+    name: str = "base"
+
+    @abstractmethod
+    async def post(self, endpoint: str, json: Dict[str, Any]) -> httpx.Response:
+        """Send a request to the provider.
+
+        Args:
+            endpoint: API endpoint, e.g. ``/chat/completions``
+            json: Request payload
+
+        Returns:
+            HTTP response
+        """
+
+    @abstractmethod
+    async def aclose(self) -> None:
+        """Release provider resources."""
+
+
+class DeepSeekProvider(LLMProvider):
+    """Provider backed by the DeepSeek HTTP API."""
+
+    name = "deepseek"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str,
+        timeout: float = 60.0,
+    ) -> None:
+        """Initialize DeepSeek provider.
+
+        Args:
+            base_url: API base URL
+            api_key: API key
+            timeout: Request timeout in seconds
+        """
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            headers={
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            },
+            timeout=timeout,
+        )
+
+    async def post(self, endpoint: str, json: Dict[str, Any]) -> httpx.Response:
+        """Send a request to the DeepSeek API."""
+        return await self._client.post(endpoint, json=json)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+
+def _fake_question_batch(prompt: str) -> Dict[str, Any]:
+    """Answer a batch question prompt with one question per numbered item."""
+    positions = re.findall(r"^(\d+)\. \[", prompt, re.MULTILINE)
+    return {
+        "questions": [
+            {
+                "id": int(position),
+                "question_text": f"Which statement about item {position} of {{key}} is correct?",
+                "correct_answer": "A",
+                "options": ["A. Option 1", "B. Option 2", "C. Option 3", "D. Option 4"],
+                "explanation": "Option A is correct.",
+            }
+            for position in positions
+        ]
+    }
+
+
+def _fake_quality_batch(prompt: str) -> Dict[str, Any]:
+    """Answer a batch quality prompt with one score per numbered question."""
+    positions = re.findall(r"^Question (\d+)$", prompt, re.MULTILINE)
+    return {"scores": [{"id": int(position), "quality_score": 0.85} for position in positions]}
+
+
+def _fake_grading_batch(prompt: str) -> Dict[str, Any]:
+    """Answer a batch grading prompt with one grade per answer ID."""
+    question_ids = re.findall(r"^Answer ID: (\S+)$", prompt, re.MULTILINE)
+    return {
+        "grades": [
+            {"question_id": question_id, "score": 0.8, "feedback": "Mostly correct answer."}
+            for question_id in question_ids
+        ]
+    }
+
+
+# Canned completions keyed by a marker found in the prompt, checked in order.
+# Callables receive the prompt and return the completion.
+DEFAULT_FAKE_RESPONSES: Dict[str, Any] = {
+    "Grade each of these": _fake_grading_batch,
+    "Grade the following": {
+        "score": 0.8,
+        "feedback": "Mostly correct answer.",
+    },
+    "Assess the quality of these": _fake_quality_batch,
+    "Assess the quality": {
+        "quality_score": 0.85,
+        "relevance": 0.9,
+        "clarity": 0.8,
+        "difficulty_match": 0.85,
+        "answer_quality": 0.85,
+    },
+    "one for each knowledge point": _fake_question_batch,
+    "mind map": {
+        "id": "root",
+        "text": "Main Topic",
+        "children": [
+            {"id": "node1", "text": "Concept 1", "children": []},
+            {"id": "node2", "text": "Concept 2", "children": []},
+        ],
+    },
+    "question": {
+        "question_text": "Which statement about {key} is correct?",
+        "correct_answer": "A",
+        "options": ["A. Option 1", "B. Option 2", "C. Option 3", "D. Option 4"],
+        "explanation": "Option A is correct.",
+    },
+}
+
+
+class FakeLLMProvider(LLMProvider):
+    """Deterministic local stand-in for load testing.
+
+    Responses go through a real ``httpx.Response`` so retry and error handling
+    behave exactly as with the HTTP provider.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_ms: float = 200.0,
+        latency_jitter_ms: float = 50.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        responses: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Initialize fake provider.
+
+        Args:
+            latency_ms: Mean response latency in milliseconds
+            latency_jitter_ms: Uniform jitter added to the latency
+            error_rate: Fraction of requests answered with HTTP 503
+            seed: Seed for latency and error sampling
+            responses: Canned completions keyed by prompt marker
+        """
+        self.latency_ms = latency_ms
+        self.latency_jitter_ms = latency_jitter_ms
+        self.error_rate = error_rate
+        self.responses = responses if responses is not None else DEFAULT_FAKE_RESPONSES
+        self._random = random.Random(seed)
+        self._client = httpx.AsyncClient(
+            base_url="http://fake-llm",
+            transport=httpx.MockTransport(self._handle),
+        )
+
+    def _sample_latency(self) -> float:
+        """Sample a latency in seconds."""
+        jitter = self._random.uniform(-self.latency_jitter_ms, self.latency_jitter_ms)
+        return max(0.0, self.latency_ms + jitter) / 1000
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        """Answer a request after the configured latency."""
+        latency = self._sample_latency()
+        failed = self._random.random() < self.error_rate
+        await asyncio.sleep(latency)
+
+        if failed:
+            return httpx.Response(503, json={"error": {"message": "fake upstream error"}})
+
+        payload = json.loads(request.content or b"{}")
+        return httpx.Response(200, json=build_fake_completion(payload, self.responses))
+
+    async def post(self, endpoint: str, json: Dict[str, Any]) -> httpx.Response:
+        """Send a request to the fake backend."""
+        return await self._client.post(endpoint, json=json)
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client."""
+        await self._client.aclose()
+
+
+def build_fake_completion(
+    payload: Dict[str, Any],
+    responses: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    """Build a chat completion body for a request payload.
+
+    The canned response is chosen by the first marker contained in the last
+    message. ``{key}`` placeholders are replaced with a short hash of the
+    prompt so distinct prompts get distinct, but reproducible, answers.
+
+    Args:
+        payload: Chat completion request payload
+        responses: Canned completions keyed by prompt marker
+
+    Returns:
+        OpenAI-compatible chat completion response body
+    """
+    responses = responses if responses is not None else DEFAULT_FAKE_RESPONSES
+    messages = payload.get("messages") or [{"content": ""}]
+    prompt = messages[-1].get("content", "")
+    key = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+
+    canned: Any = {}
+    for marker, response in responses.items():
+        if marker.lower() in prompt.lower():
+            canned = response
+            break
+
+    if callable(canned):
+        canned = canned(prompt)
+    content = canned if isinstance(canned, str) else json.dumps(canned)
+    content = content.replace("{key}", key)
+
+    prompt_tokens = max(1, len(prompt) // 4)
+    completion_tokens = max(1, len(content) // 4)
+    return {
+        "id": f"fake-{key}",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": payload.get("model", "fake"),
+        "choices": [
+            {
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }
+        ],
+        "usage": {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        },
+    }
+
+
+def load_fake_responses(path: str) -> Optional[Dict[str, Any]]:
+    """Load canned responses from a JSON file.
+
+    Args:
+        path: Path to a JSON object mapping prompt marker to completion
+
+    Returns:
+        Canned responses, or None to use the defaults
+    """
+    if not path:
+        return None
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def create_llm_provider(name: Optional[str] = None) -> LLMProvider:
+    """Create a provider from settings.
+
+    Args:
+        name: Provider name (``deepseek`` or ``fake``), defaults to LLM_PROVIDER
+
+    Returns:
+        LLMProvider instance
+
+    Raises:
+        ValueError: If the provider name is unknown
+    """
+    name = (name or settings.LLM_PROVIDER).lower()
+    if name == "deepseek":
+        return DeepSeekProvider(
+            base_url=settings.DEEPSEEK_BASE_URL,
+            api_key=settings.DEEPSEEK_API_KEY,
+        )
+    if name == "fake":
+        return FakeLLMProvider(
+            latency_ms=settings.FAKE_LLM_LATENCY_MS,
+            latency_jitter_ms=settings.FAKE_LLM_LATENCY_JITTER_MS,
+            error_rate=settings.FAKE_LLM_ERROR_RATE,
+            seed=settings.FAKE_LLM_SEED,
+            responses=load_fake_responses(settings.FAKE_LLM_RESPONSES_PATH),
+        )
+    raise ValueError(f"Unknown LLM provider: {name}")
+
+
+# Global provider shared by all DeepSeekService instances
+_llm_provider: Optional[LLMProvider] = None
+
+
+def get_llm_provider() -> LLMProvider:
+    """Get or create the global LLM provider.
+
+    Returns:
+        LLMProvider instance
+    """
+    global _llm_provider
+    if _llm_provider is None:
+        _llm_provider = create_llm_provider()
+        logger.info(f"Created LLM provider: {_llm_provider.name}")
+    return _llm_provider
+
+
+async def close_llm_provider() -> None:
+    """Close the global LLM provider. Should be called on application shutdown."""
+    global _llm_provider
+    if _llm_provider is not None:
+        await _llm_provider.aclose()
+        _llm_provider = None
+        logger.info("Closed LLM provider")
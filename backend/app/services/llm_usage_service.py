@@ -0,0 +1,300 @@
+"""LLM token accounting and latency telemetry."""
+
+import asyncio
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+from sqlalchemy import case, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.llm_usage import LLMUsageRecord
+
+settings = get_settings()
+
+
+class LLMUsageTracker:
+    """In-process aggregator that buffers usage records and flushes them in batches."""
+
+    def __init__(
+        self,
+        batch_size: int = 50,
+        flush_interval: float = 30.0,
+        max_buffer_size: int = 5000,
+    ) -> None:
+        """Initialize usage tracker.
+
+        Args:
+            batch_size: Number of buffered records that triggers a flush
+            flush_interval: Seconds between periodic flushes
+            max_buffer_size: Records kept at most when flushing keeps failing
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_buffer_size = max_buffer_size
+        self._buffer: List[Dict[str, Any]] = []
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._periodic_task: Optional[asyncio.Task] = None
+
+    def record(
+        self,
+        feature: str,
+        model: str,
+        prompt_tokens: int,
+        completion_tokens: int,
+        latency_ms: int,
+        retries: int = 0,
+        success: bool = True,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> None:
+        """Record a single LLM call.
+
+        Args:
+            feature: Calling feature (mindmap, question, quality, grading, ...)
+            model: Model name
+            prompt_tokens: Prompt tokens reported by the provider
+            completion_tokens: Completion tokens reported by the provider
+            latency_ms: Wall-clock latency including retries
+            retries: Number of retried attempts
+            success: Whether the call returned a completion
+            user_id: User the call was made for, if known
+        """
+        self._buffer.append(
+            {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "feature": feature,
+                "model": model,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+                "latency_ms": latency_ms,
+                "retries": retries,
+                "success": success,
+                "created_at": datetime.utcnow(),
+            }
+        )
+
+        totals = self._totals.setdefault(
+            feature,
+            {
+                "calls": 0,
+                "failures": 0,
+                "prompt_tokens": 0,
+                "completion_tokens": 0,
+                "latency_ms": 0,
+                "retries": 0,
+            },
+        )
+        totals["calls"] += 1
+        totals["failures"] += 0 if success else 1
+        totals["prompt_tokens"] += prompt_tokens
+        totals["completion_tokens"] += completion_tokens
+        totals["latency_ms"] += latency_ms
+        totals["retries"] += retries
+
+        if len(self._buffer) >= self.batch_size:
+            self._schedule_flush()
+
+    def _schedule_flush(self) -> None:
+        """Start a background flush unless one is already running."""
+        if self._flush_task is not None and not self._flush_task.done():
+            return
+        try:
+            self._flush_task = asyncio.get_running_loop().create_task(self.flush())
+        except RuntimeError:
+            # No running loop (e.g. sync context); the next periodic flush picks it up
+            pass
+
+    async def flush(self) -> int:
+        """Write buffered records to the database in a single batch.
+
+        Returns:
+            Number of records written
+        """
+        async with self._flush_lock:
+            if not self._buffer:
+                return 0
+
+            rows, self._buffer = self._buffer, []
+
+            from app.core.database import AsyncSessionLocal
+
+            try:
+                async with AsyncSessionLocal() as session:
+                    await session.execute(insert(LLMUsageRecord), rows)
+                    await session.commit()
+                logger.debug(f"Flushed {len(rows)} LLM usage records")
+                return len(rows)
+            except Exception as e:
+                logger.warning(f"Failed to flush LLM usage records: {e}")
+                # Keep the newest records for the next attempt, bounded
+                self._buffer = (rows + self._buffer)[-self.max_buffer_size:]
+                return 0
+
+    async def _run_periodic_flush(self) -> None:
+        """Flush buffered records every flush_interval seconds."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    def start(self) -> None:
+        """Start periodic flushing. Should be called on application startup."""
+        if self._periodic_task is None or self._periodic_task.done():
+            self._periodic_task = asyncio.get_running_loop().create_task(
+                self._run_periodic_flush()
+            )
+
+    async def stop(self) -> None:
+        """Stop periodic flushing and flush what is left. Should be called on shutdown."""
+        if self._periodic_task is not None:
+            self._periodic_task.cancel()
+            try:
+                await self._periodic_task
+            except asyncio.CancelledError:
+                pass
+            self._periodic_task = None
+        await self.flush()
+
+    def get_feature_totals(self) -> Dict[str, Dict[str, float]]:
+        """Get in-process totals per feature since startup.
+
+        Returns:
+            Mapping of feature to call, token, latency and retry totals
+        """
+        snapshot = {}
+        for feature, totals in self._totals.items():
+            calls = totals["calls"] or 1
+            snapshot[feature] = {
+                **totals,
+                "avg_latency_ms": totals["latency_ms"] / calls,
+            }
+        return snapshot
+
+    @property
+    def pending(self) -> int:
+        """Number of records waiting to be flushed."""
+        return len(self._buffer)
+
+
+# Global usage tracker
+_usage_tracker: Optional[LLMUsageTracker] = None
+
+
+def get_usage_tracker() -> LLMUsageTracker:
+    """Get or create global LLM usage tracker.
+
+    Returns:
+        LLMUsageTracker instance
+    """
+    global _usage_tracker
+    if _usage_tracker is None:
+        _usage_tracker = LLMUsageTracker(
+            batch_size=settings.LLM_USAGE_FLUSH_BATCH_SIZE,
+            flush_interval=settings.LLM_USAGE_FLUSH_INTERVAL_SECONDS,
+        )
+    return _usage_tracker
+
+
+class LLMUsageService:
+    """Service for querying persisted LLM usage rollups."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize usage service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    def _rollup_columns(self) -> List[Any]:
+        """Aggregate columns shared by all rollups."""
+        return [
+            func.count(LLMUsageRecord.id).label("calls"),
+            func.coalesce(func.sum(LLMUsageRecord.prompt_tokens), 0).label("prompt_tokens"),
+            func.coalesce(func.sum(LLMUsageRecord.completion_tokens), 0).label("completion_tokens"),
+            func.coalesce(func.sum(LLMUsageRecord.total_tokens), 0).label("total_tokens"),
+            func.coalesce(func.avg(LLMUsageRecord.latency_ms), 0).label("avg_latency_ms"),
+            func.coalesce(func.max(LLMUsageRecord.latency_ms), 0).label("max_latency_ms"),
+            func.coalesce(func.sum(LLMUsageRecord.retries), 0).label("retries"),
+            func.coalesce(
+                func.sum(case((LLMUsageRecord.success.is_(False), 1), else_=0)), 0
+            ).label("failures"),
+        ]
+
+    def _format_row(self, row: Any) -> Dict[str, Any]:
+        """Convert an aggregate row to a plain dictionary."""
+        return {
+            "calls": int(row.calls),
+            "prompt_tokens": int(row.prompt_tokens),
+            "completion_tokens": int(row.completion_tokens),
+            "total_tokens": int(row.total_tokens),
+            "avg_latency_ms": round(float(row.avg_latency_ms), 1),
+            "max_latency_ms": int(row.max_latency_ms),
+            "retries": int(row.retries),
+            "failures": int(row.failures),
+        }
+
+    async def get_feature_rollup(
+        self,
+        days: int = 7,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """Get usage aggregated per feature, most expensive first.
+
+        Args:
+            days: Number of days to look back
+            user_id: Restrict to a single user
+
+        Returns:
+            List of per-feature usage totals
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        query = (
+            select(LLMUsageRecord.feature, *self._rollup_columns())
+            .where(LLMUsageRecord.created_at >= since)
+            .group_by(LLMUsageRecord.feature)
+            .order_by(func.sum(LLMUsageRecord.total_tokens).desc())
+        )
+        if user_id is not None:
+            query = query.where(LLMUsageRecord.user_id == user_id)
+
+        result = await self.db.execute(query)
+        return [
+            {"feature": row.feature, **self._format_row(row)}
+            for row in result.all()
+        ]
+
+    async def get_user_rollup(
+        self,
+        days: int = 7,
+        limit: int = 20,
+    ) -> List[Dict[str, Any]]:
+        """Get usage aggregated per user, heaviest users first.
+
+        Args:
+            days: Number of days to look back
+            limit: Maximum number of users to return
+
+        Returns:
+            List of per-user usage totals
+        """
+        since = datetime.utcnow() - timedelta(days=days)
+        result = await self.db.execute(
+            select(LLMUsageRecord.user_id, *self._rollup_columns())
+            .where(LLMUsageRecord.created_at >= since)
+            .group_by(LLMUsageRecord.user_id)
+            .order_by(func.sum(LLMUsageRecord.total_tokens).desc())
+            .limit(limit)
+        )
+        return [
+            {
+                "user_id": str(row.user_id) if row.user_id else None,
+                **self._format_row(row),
+            }
+            for row in result.all()
+        ]
@@ -77,6 +77,7 @@ class MindmapService:
                     note_content=note_content,
                     note_title=note_title,
                     max_levels=settings.MINDMAP_MAX_LEVELS,
+                    user_id=user_id,
                 )
 
                 # Cache the generated structure
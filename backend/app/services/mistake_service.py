@@ -3,16 +3,25 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from sqlalchemy import select, func
+from sqlalchemy import and_, select, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.mindmap import KnowledgePoint, Mindmap
 from app.models.mistake import Mistake
+from app.models.note import Note
+from app.models.quiz import Quiz, QuizQuestion
 from app.schemas.mistake import MistakeCreate, MistakeUpdate, ReviewRecord
 from app.utils.ebbinghaus import (
     calculate_mastery_level,
     calculate_next_review,
 )
 
+# Source of mistakes captured from graded quizzes; unique per user and question
+QUIZ_MISTAKE_SOURCE = "quiz_grading"
+
+_QUESTION_DIFFICULTY = {"easy": 1, "medium": 3, "hard": 5}
+
 
 class MistakeService:
     """Service for mistake management and weak point analysis."""
@@ -49,6 +58,101 @@ class MistakeService:
         await self.db.refresh(new_mistake)
         return new_mistake
 
+    async def capture_quiz_mistakes(
+        self,
+        user_id: uuid.UUID,
+        quiz_id: uuid.UUID,
+        wrong_answers: list[tuple[QuizQuestion, str]],
+    ) -> int:
+        """Record the wrong answers of a graded quiz in the mistake book.
+
+        All answers are upserted with one statement: a question answered
+        wrong for the first time gets a new mistake due for its first
+        Ebbinghaus review; a repeat increments incorrect_count, restarts the
+        review schedule and unarchives the mistake. The write joins the
+        caller's transaction.
+
+        Args:
+            user_id: User ID
+            quiz_id: Quiz ID
+            wrong_answers: (question, user answer) pairs graded wrong
+
+        Returns:
+            Number of mistakes recorded
+        """
+        if not wrong_answers:
+            return 0
+
+        # Subject and knowledge point names, in one query
+        point_ids = {q.knowledge_point_id for q, _ in wrong_answers if q.knowledge_point_id}
+        context = await self.db.execute(
+            select(Note.title, KnowledgePoint.id, KnowledgePoint.text)
+            .select_from(Quiz)
+            .join(Mindmap, Mindmap.id == Quiz.mindmap_id)
+            .join(Note, Note.id == Mindmap.note_id)
+            .outerjoin(
+                KnowledgePoint,
+                and_(KnowledgePoint.mindmap_id == Mindmap.id, KnowledgePoint.id.in_(point_ids)),
+            )
+            .where(Quiz.id == quiz_id)
+        )
+        subject = "Quiz"
+        point_names = {}
+        for title, point_id, text in context.all():
+            subject = (title or subject)[:100]
+            if point_id is not None:
+                point_names[point_id] = text
+
+        now = datetime.utcnow()
+        next_review_at, _ = calculate_next_review(0, False, now)
+        rows = {}
+        for question, user_answer in wrong_answers:
+            name = point_names.get(question.knowledge_point_id)
+            rows[question.id] = {
+                "id": uuid.uuid4(),
+                "user_id": user_id,
+                "question_id": question.id,
+                "quiz_id": quiz_id,
+                "question": question.question_text,
+                "question_type": question.question_type,
+                "options": question.options,
+                "correct_answer": question.correct_answer,
+                "user_answer": user_answer,
+                "explanation": question.explanation,
+                "subject": subject,
+                "knowledge_points": [name] if name else [],
+                "tags": [],
+                "difficulty": _QUESTION_DIFFICULTY.get(question.difficulty, 1),
+                "source": QUIZ_MISTAKE_SOURCE,
+                "mastery_level": 0,
+                "review_count": 0,
+                "correct_count": 0,
+                "incorrect_count": 1,
+                "consecutive_correct": 0,
+                "next_review_at": next_review_at,
+                "is_archived": False,
+                "created_at": now,
+                "updated_at": now,
+            }
+
+        stmt = pg_insert(Mistake).values(list(rows.values()))
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["user_id", "question_id"],
+                index_where=Mistake.source == QUIZ_MISTAKE_SOURCE,
+                set_={
+                    "quiz_id": stmt.excluded.quiz_id,
+                    "user_answer": stmt.excluded.user_answer,
+                    "incorrect_count": Mistake.incorrect_count + 1,
+                    "consecutive_correct": 0,
+                    "next_review_at": stmt.excluded.next_review_at,
+                    "is_archived": False,
+                    "updated_at": stmt.excluded.updated_at,
+                },
+            )
+        )
+        return len(rows)
+
     async def get_mistake(self, mistake_id: uuid.UUID, user_id: uuid.UUID) -> Optional[Mistake]:
         """Get mistake by ID."""
         result = await self.db.execute(
@@ -0,0 +1,169 @@
+"""Per-knowledge-point bank of validated quiz questions."""
+
+import uuid
+from collections import defaultdict
+from typing import Any, Collection, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.question_bank import QuestionBankItem
+
+
+class QuestionBankService:
+    """Store generated questions and serve them to later quizzes.
+
+    Questions enter the bank only after passing quality validation, so a quiz
+    can use them without another LLM call. Within a knowledge point, type and
+    difficulty, the least used question is served first so repeated quizzes
+    on the same mindmap rotate through the bank.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize question bank service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    async def take_questions(
+        self,
+        slots: List[Tuple[int, uuid.UUID, str]],
+        difficulty: str,
+        exclude_texts: Collection[str] = (),
+    ) -> Dict[int, Dict[str, Any]]:
+        """Serve banked questions for quiz slots with a single query.
+
+        Args:
+            slots: (slot index, knowledge point ID, question type) to fill
+            difficulty: Question difficulty
+            exclude_texts: Question texts already in the quiz
+
+        Returns:
+            Question data by slot index, for the slots the bank could fill
+        """
+        if not slots:
+            return {}
+
+        result = await self.db.execute(
+            select(QuestionBankItem)
+            .where(
+                QuestionBankItem.knowledge_point_id.in_({kp_id for _, kp_id, _ in slots}),
+                QuestionBankItem.question_type.in_({question_type for _, _, question_type in slots}),
+                QuestionBankItem.difficulty == difficulty,
+            )
+            .order_by(QuestionBankItem.times_used, QuestionBankItem.created_at)
+        )
+        available: Dict[Tuple[uuid.UUID, str], List[QuestionBankItem]] = defaultdict(list)
+        for item in result.scalars().all():
+            available[(item.knowledge_point_id, item.question_type)].append(item)
+
+        served: Dict[int, Dict[str, Any]] = {}
+        used_texts = set(exclude_texts)
+        used_ids = []
+        for idx, kp_id, question_type in slots:
+            items = available.get((kp_id, question_type), [])
+            while items:
+                item = items.pop(0)
+                if item.question_text in used_texts:
+                    continue
+                served[idx] = {
+                    "question_text": item.question_text,
+                    "options": item.options,
+                    "correct_answer": item.correct_answer,
+                    "explanation": item.explanation,
+                }
+                used_texts.add(item.question_text)
+                used_ids.append(item.id)
+                break
+
+        if used_ids:
+            await self.db.execute(
+                update(QuestionBankItem)
+                .where(QuestionBankItem.id.in_(used_ids))
+                .values(times_used=QuestionBankItem.times_used + 1)
+            )
+            logger.debug(f"Served {len(used_ids)}/{len(slots)} questions from the question bank")
+
+        return served
+
+    async def add_questions(
+        self,
+        entries: List[Tuple[uuid.UUID, str, str, Dict[str, Any]]],
+        times_used: int = 0,
+    ) -> int:
+        """Add validated questions to the bank.
+
+        Args:
+            entries: (knowledge point ID, question type, difficulty, question data)
+            times_used: Initial use count, 1 for questions generated for a quiz
+
+        Returns:
+            Number of questions added
+        """
+        for kp_id, question_type, difficulty, question_data in entries:
+            self.db.add(
+                QuestionBankItem(
+                    id=uuid.uuid4(),
+                    knowledge_point_id=kp_id,
+                    question_text=question_data["question_text"],
+                    question_type=question_type,
+                    options=question_data.get("options"),
+                    correct_answer=question_data["correct_answer"],
+                    explanation=question_data.get("explanation"),
+                    difficulty=difficulty,
+                    times_used=times_used,
+                )
+            )
+        return len(entries)
+
+    async def count_questions(
+        self,
+        knowledge_point_ids: List[uuid.UUID],
+        question_type: str,
+        difficulty: str,
+    ) -> Dict[uuid.UUID, int]:
+        """Count banked questions per knowledge point.
+
+        Args:
+            knowledge_point_ids: Knowledge point IDs
+            question_type: Question type
+            difficulty: Question difficulty
+
+        Returns:
+            Number of banked questions by knowledge point ID
+        """
+        result = await self.db.execute(
+            select(QuestionBankItem.knowledge_point_id, func.count(QuestionBankItem.id))
+            .where(
+                QuestionBankItem.knowledge_point_id.in_(knowledge_point_ids),
+                QuestionBankItem.question_type == question_type,
+                QuestionBankItem.difficulty == difficulty,
+            )
+            .group_by(QuestionBankItem.knowledge_point_id)
+        )
+        return {kp_id: count for kp_id, count in result.all()}
+
+    async def get_question_texts(
+        self,
+        knowledge_point_ids: List[uuid.UUID],
+        question_type: Optional[str] = None,
+    ) -> List[str]:
+        """Get texts of banked questions, for duplicate detection.
+
+        Args:
+            knowledge_point_ids: Knowledge point IDs
+            question_type: Only questions of this type, if given
+
+        Returns:
+            Question texts
+        """
+        query = select(QuestionBankItem.question_text).where(
+            QuestionBankItem.knowledge_point_id.in_(knowledge_point_ids)
+        )
+        if question_type is not None:
+            query = query.where(QuestionBankItem.question_type == question_type)
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
@@ -1,20 +1,34 @@
 """Quiz generation service."""
 
+import asyncio
 import uuid
-from typing import Any, Dict, List
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.quiz import Quiz, QuizQuestion
 from app.models.mindmap import KnowledgePoint
 from app.services.deepseek_service import DeepSeekService
+from app.services.question_bank_service import QuestionBankService
 from app.services.quiz_quality_service import QuizQualityValidator
+from app.services.vector_search_service import get_vector_search_service
+from app.services.weakness_service import WeaknessService, adapt_difficulty, selection_weights
 from app.core.config import get_settings
+from app.utils.json_extract import parse_json_object
+from app.utils.knowledge_point_selector import select_knowledge_points
+from app.utils.minhash import MinHashLSHIndex
 
 settings = get_settings()
 
+QUESTION_TYPE_INSTRUCTIONS = {
+    "choice": "Create a multiple choice question with 4 options (A, B, C, D).",
+    "fill_blank": "Create a fill-in-the-blank question with a clear answer.",
+    "short_answer": "Create a short answer question requiring 2-3 sentences.",
+}
+
 
 class QuizGenerationService:
     """Service for generating quizzes from mindmaps."""
@@ -35,8 +49,63 @@ class QuizGenerationService:
         question_count: int = 10,
         question_types: List[str] = None,
         difficulty: str = "medium",
+        adaptive: bool = False,
+    ) -> Quiz:
+        """Generate quiz from mindmap, waiting for all questions.
+
+        Args:
+            mindmap_id: Mindmap ID
+            user_id: User ID
+            question_count: Number of questions to generate
+            question_types: List of question types ["choice", "fill_blank", "short_answer"]
+            difficulty: Question difficulty (easy, medium, hard)
+            adaptive: Focus knowledge points and difficulty on the user's weak areas
+
+        Returns:
+            Generated quiz (ready, or failed if no question could be generated)
+
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        quiz, selected_points = await self._create_quiz(
+            mindmap_id,
+            user_id,
+            question_count,
+            question_types,
+            difficulty,
+            adaptive,
+        )
+
+        # Generate questions for each knowledge point
+        questions = await self._generate_questions(
+            quiz.id,
+            selected_points,
+            quiz.question_types,
+            quiz.difficulty,
+            user_id=user_id,
+            existing_questions=await self._get_recent_user_questions(user_id, quiz.id),
+            question_bank=self._question_bank(),
+        )
+
+        # Update quiz status
+        quiz.status = "ready" if questions else "failed"
+        await self.db.commit()
+        await self.db.refresh(quiz)
+        await self._index_quiz_questions(quiz.id, user_id)
+
+        logger.info(f"Generated quiz {quiz.id} with {len(questions)} questions")
+        return quiz
+
+    async def create_quiz(
+        self,
+        mindmap_id: uuid.UUID,
+        user_id: uuid.UUID,
+        question_count: int = 10,
+        question_types: List[str] = None,
+        difficulty: str = "medium",
+        adaptive: bool = False,
     ) -> Quiz:
-        """Generate quiz from mindmap.
+        """Create a quiz in generating status for a background generation job.
 
         Args:
             mindmap_id: Mindmap ID
@@ -44,10 +113,50 @@ class QuizGenerationService:
             question_count: Number of questions to generate
             question_types: List of question types ["choice", "fill_blank", "short_answer"]
             difficulty: Question difficulty (easy, medium, hard)
+            adaptive: Focus knowledge points and difficulty on the user's weak areas
 
         Returns:
             Created quiz (in generating status)
 
+        Raises:
+            ValueError: If parameters are invalid
+        """
+        quiz, _ = await self._create_quiz(
+            mindmap_id,
+            user_id,
+            question_count,
+            question_types,
+            difficulty,
+            adaptive,
+        )
+        await self.db.commit()
+        return quiz
+
+    async def _create_quiz(
+        self,
+        mindmap_id: uuid.UUID,
+        user_id: uuid.UUID,
+        question_count: int,
+        question_types: Optional[List[str]],
+        difficulty: str,
+        adaptive: bool = False,
+    ) -> Tuple[Quiz, List[KnowledgePoint]]:
+        """Validate parameters and add a quiz record in generating status.
+
+        Adaptive quizzes sample knowledge points weighted by the user's
+        weakness and shift the difficulty by the weakness on the selection.
+
+        Args:
+            mindmap_id: Mindmap ID
+            user_id: User ID
+            question_count: Number of questions to generate
+            question_types: List of question types
+            difficulty: Question difficulty
+            adaptive: Focus on the user's weak areas
+
+        Returns:
+            Tuple of (quiz, selected knowledge points)
+
         Raises:
             ValueError: If parameters are invalid
         """
@@ -67,42 +176,314 @@ class QuizGenerationService:
         if not knowledge_points:
             raise ValueError("No knowledge points found for mindmap")
 
+        weakness: Dict[uuid.UUID, float] = {}
+        weights = None
+        if adaptive:
+            weakness = await WeaknessService(self.db).get_weakness_vector(user_id, mindmap_id)
+            weights = selection_weights(knowledge_points, weakness)
+
         # Select knowledge points for questions
+        quiz_id = uuid.uuid4()
         selected_points = self._select_knowledge_points(
             knowledge_points,
             question_count,
+            weights=weights,
+            seed=quiz_id.int,
         )
+        if adaptive:
+            difficulty = adapt_difficulty(difficulty, selected_points, weakness)
 
         # Create quiz record
         quiz = Quiz(
-            id=uuid.uuid4(),
+            id=quiz_id,
             mindmap_id=mindmap_id,
             user_id=user_id,
             question_count=question_count,
             difficulty=difficulty,
             question_types=question_types,
+            adaptive=adaptive,
+            knowledge_point_ids=[str(kp.id) for kp in selected_points],
             status="generating",
         )
 
         self.db.add(quiz)
         await self.db.flush()
 
-        # Generate questions for each knowledge point
+        return quiz, selected_points
+
+    async def claim_generation(self, quiz_id: uuid.UUID) -> bool:
+        """Take the generation lease of a quiz.
+
+        A quiz can be claimed while it is generating and nobody holds the
+        lease, or the holder stopped renewing it for QUIZ_JOB_LEASE_SECONDS
+        (e.g. its worker was restarted).
+
+        Args:
+            quiz_id: Quiz ID
+
+        Returns:
+            True if this caller now owns the generation job
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+        result = await self.db.execute(
+            update(Quiz)
+            .where(
+                Quiz.id == quiz_id,
+                Quiz.status == "generating",
+                or_(
+                    Quiz.generation_claimed_at.is_(None),
+                    Quiz.generation_claimed_at < stale_before,
+                ),
+            )
+            .values(generation_claimed_at=now)
+        )
+        await self.db.commit()
+        return result.rowcount == 1
+
+    async def get_resumable_quiz_ids(self) -> List[uuid.UUID]:
+        """Get generating quizzes whose job is not held by a live worker.
+
+        Returns:
+            Quiz IDs, oldest first
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+        result = await self.db.execute(
+            select(Quiz.id)
+            .where(
+                Quiz.status == "generating",
+                or_(
+                    Quiz.generation_claimed_at.is_(None),
+                    Quiz.generation_claimed_at < stale_before,
+                ),
+            )
+            .order_by(Quiz.created_at)
+        )
+        return list(result.scalars().all())
+
+    async def run_generation(self, quiz_id: uuid.UUID) -> Optional[Quiz]:
+        """Generate the missing questions of a claimed quiz.
+
+        Accepted questions are committed after every round, renewing the
+        lease, so an interrupted job resumes with only the knowledge points
+        that have no question yet.
+
+        Args:
+            quiz_id: Quiz ID
+
+        Returns:
+            The quiz, or None if it does not exist
+        """
+        result = await self.db.execute(select(Quiz).where(Quiz.id == quiz_id))
+        quiz = result.scalar_one_or_none()
+        if quiz is None or quiz.status != "generating":
+            return quiz
+
+        # Reuse the selection made at creation; adaptive weights may have changed since
+        knowledge_points = await self._get_knowledge_points(quiz.mindmap_id)
+        if quiz.knowledge_point_ids is not None:
+            points_by_id = {str(kp.id): kp for kp in knowledge_points}
+            selected_points = [
+                points_by_id[kp_id] for kp_id in quiz.knowledge_point_ids if kp_id in points_by_id
+            ]
+        else:
+            # Quizzes created before selections were stored; the seed reproduces them
+            selected_points = self._select_knowledge_points(
+                knowledge_points, quiz.question_count, seed=quiz.id.int
+            )
+
+        result = await self.db.execute(
+            select(QuizQuestion.knowledge_point_id, QuizQuestion.question_text)
+            .where(QuizQuestion.quiz_id == quiz.id)
+        )
+        existing = result.all()
+        done_point_ids = {row.knowledge_point_id for row in existing}
+        completed_indices = {
+            idx for idx, kp in enumerate(selected_points) if kp.id in done_point_ids
+        }
+        if existing:
+            logger.info(f"Resuming quiz {quiz.id} with {len(existing)} questions already generated")
+
+        async def persist_round(new_questions: List[QuizQuestion]) -> None:
+            quiz.generation_claimed_at = datetime.utcnow()
+            await self.db.commit()
+
         questions = await self._generate_questions(
             quiz.id,
             selected_points,
-            question_types,
-            difficulty,
+            quiz.question_types,
+            quiz.difficulty,
+            user_id=quiz.user_id,
+            completed_indices=completed_indices,
+            existing_questions=[row.question_text for row in existing]
+            + await self._get_recent_user_questions(quiz.user_id, quiz.id),
+            on_round=persist_round,
+            question_bank=self._question_bank(),
         )
 
-        # Update quiz status
-        quiz.status = "ready"
+        quiz.status = "ready" if (questions or existing) else "failed"
+        quiz.generation_claimed_at = None
         await self.db.commit()
-        await self.db.refresh(quiz)
+        await self._index_quiz_questions(quiz.id, quiz.user_id)
 
-        logger.info(f"Generated quiz {quiz.id} with {len(questions)} questions")
+        logger.info(f"Generated quiz {quiz.id} with {len(existing) + len(questions)} questions")
         return quiz
 
+    async def mark_generation_failed(self, quiz_id: uuid.UUID) -> None:
+        """Finish a quiz whose generation job crashed.
+
+        Questions committed by earlier rounds are kept: like run_generation,
+        the quiz becomes ready if it has any and failed otherwise.
+
+        Args:
+            quiz_id: Quiz ID
+        """
+        question_count = await self.db.scalar(
+            select(func.count()).select_from(QuizQuestion).where(QuizQuestion.quiz_id == quiz_id)
+        )
+        result = await self.db.execute(
+            update(Quiz)
+            .where(Quiz.id == quiz_id, Quiz.status == "generating")
+            .values(status="ready" if question_count else "failed", generation_claimed_at=None)
+            .returning(Quiz.user_id)
+        )
+        user_id = result.scalar_one_or_none()
+        await self.db.commit()
+
+        if question_count and user_id is not None:
+            await self._index_quiz_questions(quiz_id, user_id)
+
+    async def get_generation_progress(
+        self,
+        quiz_id: uuid.UUID,
+        user_id: uuid.UUID,
+    ) -> Optional[Dict[str, Any]]:
+        """Get generation progress of a quiz.
+
+        Args:
+            quiz_id: Quiz ID
+            user_id: User ID
+
+        Returns:
+            Progress with status and question counts, None if not found
+        """
+        result = await self.db.execute(
+            select(Quiz.status, Quiz.question_count).where(
+                Quiz.id == quiz_id,
+                Quiz.user_id == user_id,
+            )
+        )
+        quiz = result.one_or_none()
+        if quiz is None:
+            return None
+
+        result = await self.db.execute(
+            select(func.count(QuizQuestion.id)).where(QuizQuestion.quiz_id == quiz_id)
+        )
+        return {
+            "quiz_id": quiz_id,
+            "status": quiz.status,
+            "completed_questions": result.scalar() or 0,
+            "total_questions": quiz.question_count,
+        }
+
+    async def fill_question_bank(
+        self,
+        mindmap_id: uuid.UUID,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> int:
+        """Top up the question bank of every knowledge point of a mindmap.
+
+        Each knowledge point gets up to QUESTION_BANK_FILL_PER_POINT questions
+        per type in QUESTION_BANK_FILL_TYPES and difficulty in
+        QUESTION_BANK_FILL_DIFFICULTIES. Questions are committed per round.
+
+        Args:
+            mindmap_id: Mindmap ID
+            user_id: Mindmap owner, for usage accounting
+
+        Returns:
+            Number of questions added to the bank
+        """
+        question_bank = self._question_bank()
+        if question_bank is None:
+            return 0
+
+        knowledge_points = await self._get_knowledge_points(mindmap_id)
+        point_ids = [kp.id for kp in knowledge_points]
+        added = 0
+
+        for question_type in settings.QUESTION_BANK_FILL_TYPES:
+            for difficulty in settings.QUESTION_BANK_FILL_DIFFICULTIES:
+                counts = await question_bank.count_questions(point_ids, question_type, difficulty)
+                slots = [
+                    kp
+                    for kp in knowledge_points
+                    for _ in range(settings.QUESTION_BANK_FILL_PER_POINT - counts.get(kp.id, 0))
+                ]
+                if not slots:
+                    continue
+
+                async def store(
+                    round_accepted: Dict[int, Dict[str, Any]],
+                    slots: List[KnowledgePoint] = slots,
+                    question_type: str = question_type,
+                    difficulty: str = difficulty,
+                ) -> None:
+                    nonlocal added
+                    added += await question_bank.add_questions(
+                        [
+                            (slots[idx].id, question_type, difficulty, round_accepted[idx])
+                            for idx in sorted(round_accepted)
+                        ]
+                    )
+                    await self.db.commit()
+
+                await self._generate_accepted(
+                    slots,
+                    [question_type],
+                    difficulty,
+                    list(range(len(slots))),
+                    await question_bank.get_question_texts(point_ids, question_type),
+                    on_accept=store,
+                    user_id=user_id,
+                )
+
+        logger.info(f"Added {added} questions to the question bank of mindmap {mindmap_id}")
+        return added
+
+    async def _get_recent_user_questions(
+        self,
+        user_id: uuid.UUID,
+        exclude_quiz_id: uuid.UUID,
+    ) -> List[str]:
+        """Get the user's most recent questions for cross-quiz de-duplication.
+
+        Args:
+            user_id: User ID
+            exclude_quiz_id: Quiz being generated
+
+        Returns:
+            Up to QUIZ_DEDUP_HISTORY_LIMIT question texts, none when disabled
+        """
+        if settings.QUIZ_DEDUP_HISTORY_LIMIT <= 0:
+            return []
+
+        result = await self.db.execute(
+            select(QuizQuestion.question_text)
+            .join(Quiz, QuizQuestion.quiz_id == Quiz.id)
+            .where(Quiz.user_id == user_id, Quiz.id != exclude_quiz_id)
+            .order_by(QuizQuestion.created_at.desc())
+            .limit(settings.QUIZ_DEDUP_HISTORY_LIMIT)
+        )
+        return list(result.scalars().all())
+
+    def _question_bank(self) -> Optional[QuestionBankService]:
+        """Get the question bank, or None when it is disabled."""
+        if not settings.QUESTION_BANK_ENABLED:
+            return None
+        return QuestionBankService(self.db)
+
     async def _get_knowledge_points(
         self,
         mindmap_id: uuid.UUID,
@@ -126,57 +507,25 @@ class QuizGenerationService:
         self,
         knowledge_points: List[KnowledgePoint],
         count: int,
+        weights: Optional[Dict[uuid.UUID, float]] = None,
+        seed: Optional[int] = None,
     ) -> List[KnowledgePoint]:
         """Select knowledge points for quiz generation.
 
+        Points are sampled at random within each level, so repeated quizzes
+        on a mindmap vary; a quiz is seeded with its ID so a resumed job
+        selects the same points again.
+
         Args:
             knowledge_points: All available knowledge points
             count: Number to select
+            weights: Sampling weight by knowledge point ID
+            seed: Seed for a reproducible selection
 
         Returns:
-            Selected knowledge points
+            Selected knowledge points, deepest level first
         """
-        # Prioritize deeper levels (more specific concepts)
-        sorted_points = sorted(
-            knowledge_points,
-            key=lambda kp: (kp.level, kp.text),
-            reverse=True,
-        )
-
-        # Select from different levels for variety
-        if len(sorted_points) <= count:
-            return sorted_points
-
-        # Stratified sampling by level with remainder handling
-        selected = []
-        levels = set(kp.level for kp in sorted_points)
-        num_levels = len(levels)
-
-        # Calculate base count per level and remainder
-        base_count = count // num_levels
-        remainder = count % num_levels
-
-        # Select from each level (sorted by level descending)
-        for idx, level in enumerate(sorted(levels, reverse=True)):
-            level_points = [kp for kp in sorted_points if kp.level == level]
-            # First 'remainder' levels get one extra
-            level_count = base_count + (1 if idx < remainder else 0)
-
-            # Don't select more than available at this level
-            level_count = min(level_count, len(level_points))
-            selected.extend(level_points[:level_count])
-
-        # Fallback: if we still don't have enough, add from highest levels
-        if len(selected) < count and len(selected) < len(sorted_points):
-            remaining_needed = count - len(selected)
-            already_selected_ids = set(kp.id for kp in selected)
-            for kp in sorted_points:
-                if len(selected) >= count:
-                    break
-                if kp.id not in already_selected_ids:
-                    selected.append(kp)
-
-        return selected[:count]
+        return select_knowledge_points(knowledge_points, count, weights=weights, seed=seed)
 
     async def _generate_questions(
         self,
@@ -184,104 +533,470 @@ class QuizGenerationService:
         knowledge_points: List[KnowledgePoint],
         question_types: List[str],
         difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
+        completed_indices: Optional[Set[int]] = None,
+        existing_questions: Optional[List[str]] = None,
+        on_round: Optional[Callable[[List[QuizQuestion]], Awaitable[None]]] = None,
+        question_bank: Optional[QuestionBankService] = None,
     ) -> List[QuizQuestion]:
         """Generate questions for knowledge points with quality validation.
 
+        With a question bank, knowledge points are first served from the bank
+        in one query and only the gaps are generated; generated questions are
+        added to the bank for later quizzes.
+
         Args:
             quiz_id: Quiz ID
             knowledge_points: Knowledge points to generate questions for
             question_types: Allowed question types
             difficulty: Question difficulty
+            user_id: Quiz owner, for usage accounting
+            completed_indices: Knowledge points that already have a question
+            existing_questions: Texts of questions already in the quiz
+            on_round: Awaited with the questions added after each round
+            question_bank: Bank to serve questions from and add new ones to
 
         Returns:
-            List of generated questions
+            List of generated questions, in knowledge point order
         """
-        questions = []
-        quality_validator = QuizQualityValidator(self.db)
+        questions: List[QuizQuestion] = []
+        existing_questions = list(existing_questions or [])
+        completed_indices = completed_indices or set()
+        pending = [idx for idx in range(len(knowledge_points)) if idx not in completed_indices]
+
+        def question_type_at(idx: int) -> str:
+            return question_types[idx % len(question_types)]
+
+        async def add_round(round_accepted: Dict[int, Dict[str, Any]]) -> None:
+            round_questions = [
+                self._build_question(
+                    quiz_id,
+                    knowledge_points[idx],
+                    question_type_at(idx),
+                    difficulty,
+                    round_accepted[idx],
+                    order=idx + 1,
+                )
+                for idx in sorted(round_accepted)
+            ]
+            for question in round_questions:
+                self.db.add(question)
+            questions.extend(round_questions)
+            if on_round is not None and round_questions:
+                await on_round(round_questions)
+
+        if question_bank is not None and pending:
+            banked = await question_bank.take_questions(
+                [(idx, knowledge_points[idx].id, question_type_at(idx)) for idx in pending],
+                difficulty,
+                exclude_texts=existing_questions,
+            )
+            if banked:
+                # Banked questions passed validation when they were generated
+                await add_round(banked)
+                pending = [idx for idx in pending if idx not in banked]
+                existing_questions += [banked[idx]["question_text"] for idx in sorted(banked)]
+
+        async def add_generated(round_accepted: Dict[int, Dict[str, Any]]) -> None:
+            if question_bank is not None:
+                await question_bank.add_questions(
+                    [
+                        (knowledge_points[idx].id, question_type_at(idx), difficulty, round_accepted[idx])
+                        for idx in sorted(round_accepted)
+                    ],
+                    times_used=1,
+                )
+            await add_round(round_accepted)
+
+        if pending:
+            await self._generate_accepted(
+                knowledge_points,
+                question_types,
+                difficulty,
+                pending,
+                existing_questions,
+                on_accept=add_generated,
+                user_id=user_id,
+                semantic_user_id=user_id if settings.QUIZ_SEMANTIC_DEDUP_ENABLED else None,
+            )
+
+        questions.sort(key=lambda question: question.order)
+        return questions
+
+    async def _generate_accepted(
+        self,
+        knowledge_points: List[KnowledgePoint],
+        question_types: List[str],
+        difficulty: str,
+        pending: List[int],
+        existing_questions: List[str],
+        on_accept: Callable[[Dict[int, Dict[str, Any]]], Awaitable[None]],
+        user_id: Optional[uuid.UUID] = None,
+        semantic_user_id: Optional[uuid.UUID] = None,
+    ) -> List[int]:
+        """Generate and validate questions for the pending knowledge points.
+
+        Questions are generated in batches of QUIZ_GENERATION_BATCH_SIZE
+        knowledge points per LLM call, concurrently up to
+        QUIZ_GENERATION_CONCURRENCY calls, in up to QUIZ_MAX_RETRIES rounds.
+        Each round's candidates are validated together, so the AI quality
+        check costs one call per QUIZ_QUALITY_BATCH_SIZE borderline questions,
+        and then de-duplicated in knowledge point order, so the outcome does
+        not depend on which call finishes first. Duplicates are found with a
+        character n-gram MinHash/LSH index grown as questions are accepted.
+        Only rejected knowledge points are retried in the next round.
 
-        for idx, kp in enumerate(knowledge_points):
-            # Select question type for this knowledge point
-            q_type = question_types[idx % len(question_types)]
+        Args:
+            knowledge_points: Knowledge points, indexed by slot
+            question_types: Allowed question types, cycled by slot index
+            difficulty: Question difficulty
+            pending: Slot indices to generate questions for
+            existing_questions: Texts that new questions must not duplicate
+            on_accept: Awaited with the question data accepted in each round
+            user_id: Quiz owner, for usage accounting
+            semantic_user_id: User whose earlier quizzes must not be rephrased
 
-            # Retry logic for quality validation
-            max_retries = settings.QUIZ_MAX_RETRIES
-            valid_question = None
+        Returns:
+            Slot indices left without a question
+        """
+        quality_validator = QuizQualityValidator(self.db)
+        semaphore = asyncio.Semaphore(settings.QUIZ_GENERATION_CONCURRENCY)
+        batch_size = max(1, settings.QUIZ_GENERATION_BATCH_SIZE)
+        max_retries = settings.QUIZ_MAX_RETRIES
 
-            for attempt in range(max_retries):
-                try:
-                    # Generate question using DeepSeek
-                    question_data = await self._generate_single_question(
-                        knowledge_point=kp.text,
-                        question_type=q_type,
-                        difficulty=difficulty,
-                    )
+        # Near-duplicate index of the quiz, grown as questions are accepted
+        duplicate_index = MinHashLSHIndex(threshold=settings.QUIZ_DUPLICATE_THRESHOLD)
+        for position, text in enumerate(existing_questions):
+            duplicate_index.add(("existing", position), text)
 
-                    # Check for duplicates with existing questions
-                    existing_questions = [q.question_text for q in questions]
-                    duplicates = await quality_validator.detect_duplicates(
-                        question_data["question_text"],
-                        existing_questions,
-                    )
+        try:
+            for attempt in range(max_retries):
+                if not pending:
+                    break
 
-                    if duplicates:
+                batches = [
+                    pending[start:start + batch_size]
+                    for start in range(0, len(pending), batch_size)
+                ]
+                async with asyncio.TaskGroup() as task_group:
+                    tasks = [
+                        task_group.create_task(
+                            self._generate_candidates(
+                                batch=batch,
+                                knowledge_points=knowledge_points,
+                                question_types=question_types,
+                                difficulty=difficulty,
+                                semaphore=semaphore,
+                                attempt=attempt,
+                                user_id=user_id,
+                            )
+                        )
+                        for batch in batches
+                    ]
+
+                candidates: Dict[int, Dict[str, Any]] = {}
+                for task in tasks:
+                    candidates.update(task.result())
+
+                # Drop repeats of earlier questions before paying for validation
+                fresh: Dict[int, Dict[str, Any]] = {}
+                for idx in pending:
+                    candidate = candidates.get(idx)
+                    if candidate is None:
+                        continue
+                    if duplicate_index.query(candidate["question_text"]):
                         logger.warning(
-                            f"Duplicate detected for knowledge point {kp.id}, retrying... (attempt {attempt + 1}/{max_retries})"
+                            f"Duplicate detected for knowledge point {knowledge_points[idx].id}, retrying... "
+                            f"(attempt {attempt + 1}/{max_retries})"
                         )
                         continue
+                    fresh[idx] = candidate
 
-                    # Validate quality
-                    validation_result = await quality_validator.validate_question(
-                        question_data=question_data,
-                        knowledge_point=kp.text,
-                        expected_difficulty=difficulty,
-                    )
+                if semantic_user_id is not None and fresh:
+                    for idx in await self._find_semantic_duplicates(fresh, semantic_user_id):
+                        logger.warning(
+                            f"Question for knowledge point {knowledge_points[idx].id} rephrases an earlier quiz, "
+                            f"retrying... (attempt {attempt + 1}/{max_retries})"
+                        )
+                        del fresh[idx]
 
-                    if not validation_result["is_valid"]:
+                # Validate the whole round together so borderline questions share AI calls
+                validations = await quality_validator.validate_questions(
+                    [(fresh[idx], knowledge_points[idx].text) for idx in fresh],
+                    difficulty,
+                    user_id=user_id,
+                )
+                valid: Dict[int, Dict[str, Any]] = {}
+                for idx, validation_result in zip(fresh, validations):
+                    if validation_result["is_valid"]:
+                        valid[idx] = fresh[idx]
+                    else:
                         logger.warning(
-                            f"Question validation failed for knowledge point {kp.id}: {validation_result['reason']}. "
-                            f"Retrying... (attempt {attempt + 1}/{max_retries})"
+                            f"Question validation failed for knowledge point {knowledge_points[idx].id}: "
+                            f"{validation_result['reason']}. Retrying... (attempt {attempt + 1}/{max_retries})"
                         )
+
+                # Resolve duplicates among this round's questions in index order
+                round_accepted: Dict[int, Dict[str, Any]] = {}
+                retry = []
+                for idx in pending:
+                    candidate = valid.get(idx)
+                    if candidate is None:
+                        retry.append(idx)
                         continue
 
-                    # Question is valid
-                    valid_question = question_data
-                    break
+                    if duplicate_index.query(candidate["question_text"]):
+                        logger.warning(
+                            f"Duplicate detected for knowledge point {knowledge_points[idx].id}, retrying... "
+                            f"(attempt {attempt + 1}/{max_retries})"
+                        )
+                        retry.append(idx)
+                        continue
+
+                    round_accepted[idx] = candidate
+                    duplicate_index.add(idx, candidate["question_text"])
+
+                if round_accepted:
+                    await on_accept(round_accepted)
+
+                pending = retry
+        finally:
+            # Rounds can raise; the validator's HTTP client must not leak
+            await quality_validator.close()
+
+        for idx in pending:
+            logger.error(
+                f"Failed to generate valid question for knowledge point {knowledge_points[idx].id} "
+                f"after {max_retries} attempts"
+            )
+
+        return pending
+
+    async def _find_semantic_duplicates(
+        self,
+        candidates: Dict[int, Dict[str, Any]],
+        user_id: uuid.UUID,
+    ) -> Set[int]:
+        """Find candidates that rephrase a question from the user's earlier quizzes.
+
+        Args:
+            candidates: Question data by slot index
+            user_id: User ID
+
+        Returns:
+            Slot indices of semantic duplicates; empty if the check fails
+        """
+        try:
+            matches = await get_vector_search_service().find_similar_questions(
+                [candidate["question_text"] for candidate in candidates.values()],
+                str(user_id),
+                settings.QUIZ_SEMANTIC_DEDUP_THRESHOLD,
+            )
+        except Exception as e:
+            logger.warning(f"Semantic duplicate check failed, skipping it: {e}")
+            return set()
+        return {idx for idx, match in zip(candidates, matches) if match is not None}
+
+    async def _index_quiz_questions(self, quiz_id: uuid.UUID, user_id: uuid.UUID) -> None:
+        """Add a generated quiz to the user's semantic question index.
+
+        Args:
+            quiz_id: Quiz ID
+            user_id: Quiz owner
+        """
+        if not settings.QUIZ_SEMANTIC_DEDUP_ENABLED:
+            return
+
+        result = await self.db.execute(
+            select(QuizQuestion.id, QuizQuestion.question_text).where(QuizQuestion.quiz_id == quiz_id)
+        )
+        try:
+            await get_vector_search_service().index_questions(
+                [
+                    {"id": row.id, "text": row.question_text, "user_id": user_id, "quiz_id": quiz_id}
+                    for row in result.all()
+                ]
+            )
+        except Exception as e:
+            logger.warning(f"Failed to index questions of quiz {quiz_id}: {e}")
+
+    def _build_question(
+        self,
+        quiz_id: uuid.UUID,
+        knowledge_point: KnowledgePoint,
+        question_type: str,
+        difficulty: str,
+        question_data: Dict[str, Any],
+        order: int,
+    ) -> QuizQuestion:
+        """Build a question record from generated question data.
 
-                except Exception as e:
-                    logger.error(
-                        f"Error generating question for knowledge point {kp.id} (attempt {attempt + 1}/{max_retries}): {e}"
+        Args:
+            quiz_id: Quiz ID
+            knowledge_point: Knowledge point the question tests
+            question_type: Type of question
+            difficulty: Difficulty level
+            question_data: Generated question data
+            order: Position of the question in the quiz
+
+        Returns:
+            Question record (not yet added to the session)
+        """
+        return QuizQuestion(
+            id=uuid.uuid4(),
+            quiz_id=quiz_id,
+            knowledge_point_id=knowledge_point.id,
+            question_text=question_data["question_text"],
+            question_type=question_type,
+            options=question_data.get("options"),
+            correct_answer=question_data["correct_answer"],
+            explanation=question_data.get("explanation"),
+            difficulty=difficulty,
+            order=order,
+        )
+
+    async def _generate_candidates(
+        self,
+        batch: List[int],
+        knowledge_points: List[KnowledgePoint],
+        question_types: List[str],
+        difficulty: str,
+        semaphore: asyncio.Semaphore,
+        attempt: int,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Generate unvalidated questions for a batch of knowledge points.
+
+        Args:
+            batch: Indices into knowledge_points
+            knowledge_points: All knowledge points of the quiz
+            question_types: Allowed question types
+            difficulty: Difficulty level
+            semaphore: Bounds concurrent LLM calls
+            attempt: Zero-based attempt number, for logging
+            user_id: Quiz owner, for usage accounting
+
+        Returns:
+            Mapping of index to question data, for the items that were generated
+        """
+        max_retries = settings.QUIZ_MAX_RETRIES
+        items = [
+            (idx, knowledge_points[idx].text, question_types[idx % len(question_types)])
+            for idx in batch
+        ]
+
+        async with semaphore:
+            try:
+                if len(items) == 1:
+                    idx, knowledge_point, question_type = items[0]
+                    question_data = await self._generate_single_question(
+                        knowledge_point=knowledge_point,
+                        question_type=question_type,
+                        difficulty=difficulty,
+                        user_id=user_id,
                     )
-                    if attempt == max_retries - 1:
-                        # Last attempt failed, skip this knowledge point
-                        logger.error(f"Failed to generate valid question for knowledge point {kp.id} after {max_retries} attempts")
-                        continue
+                    return {idx: question_data} if question_data else {}
 
-            # Create question record if valid
-            if valid_question:
-                question = QuizQuestion(
-                    id=uuid.uuid4(),
-                    quiz_id=quiz_id,
-                    knowledge_point_id=kp.id,
-                    question_text=valid_question["question_text"],
-                    question_type=q_type,
-                    options=valid_question.get("options"),
-                    correct_answer=valid_question["correct_answer"],
-                    explanation=valid_question.get("explanation"),
-                    difficulty=difficulty,
-                    order=idx + 1,
+                return await self._generate_question_batch(
+                    items,
+                    difficulty,
+                    user_id=user_id,
                 )
+            except Exception as e:
+                logger.error(
+                    f"Error generating questions for {len(items)} knowledge points "
+                    f"(attempt {attempt + 1}/{max_retries}): {e}"
+                )
+                return {}
 
-                self.db.add(question)
-                questions.append(question)
+    async def _generate_question_batch(
+        self,
+        items: List[Tuple[int, str, str]],
+        difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> Dict[int, Dict[str, Any]]:
+        """Generate questions for several knowledge points in one call.
 
-        await quality_validator.close()
-        return questions
+        Malformed or missing items are left out of the result so that only
+        those knowledge points are requested again.
+
+        Args:
+            items: (index, knowledge point text, question type) per question
+            difficulty: Difficulty level
+            user_id: Quiz owner, for usage accounting
+
+        Returns:
+            Mapping of index to question data for well-formed items
+
+        Raises:
+            ValueError: If the response is not a JSON object with a question list
+        """
+        prompt = self._get_batch_question_prompt(
+            [(knowledge_point, question_type) for _, knowledge_point, question_type in items],
+            difficulty,
+        )
+
+        response = await self.deepseek.generate_completion(
+            prompt=prompt,
+            max_tokens=500 * len(items),
+            temperature=0.5,
+            feature="question",
+            user_id=user_id,
+            json_mode=True,
+        )
+
+        batch_data = parse_json_object(response)
+        generated_items = batch_data.get("questions")
+        if not isinstance(generated_items, list):
+            raise ValueError("Batch response has no question list")
+
+        generated: Dict[int, Dict[str, Any]] = {}
+        for item in generated_items:
+            if not isinstance(item, dict):
+                continue
+            try:
+                position = int(item.get("id")) - 1
+            except (TypeError, ValueError):
+                continue
+            if not 0 <= position < len(items):
+                continue
+
+            idx, _, question_type = items[position]
+            try:
+                self._check_question_fields(item, question_type)
+            except ValueError as e:
+                logger.warning(f"Discarding malformed batch item {position + 1}: {e}")
+                continue
+            generated.setdefault(idx, item)
+
+        return generated
+
+    def _check_question_fields(
+        self,
+        question_data: Dict[str, Any],
+        question_type: str,
+    ) -> None:
+        """Check a generated question has the fields its type needs.
+
+        Args:
+            question_data: Question data
+            question_type: Type of question
+
+        Raises:
+            ValueError: If fields are missing
+        """
+        if "question_text" not in question_data or "correct_answer" not in question_data:
+            raise ValueError("Missing required fields in question")
+
+        if question_type == "choice" and "options" not in question_data:
+            raise ValueError("Choice questions must have options")
 
     async def _generate_single_question(
         self,
         knowledge_point: str,
         question_type: str,
         difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Generate a single question.
 
@@ -289,6 +1004,7 @@ class QuizGenerationService:
             knowledge_point: Knowledge point text
             question_type: Type of question
             difficulty: Difficulty level
+            user_id: Quiz owner, for usage accounting
 
         Returns:
             Question data
@@ -303,26 +1019,13 @@ class QuizGenerationService:
                 prompt=prompt,
                 max_tokens=500,
                 temperature=0.5,
+                feature="question",
+                user_id=user_id,
+                json_mode=True,
             )
 
-            # Parse JSON response
-            import json
-            import re
-
-            # Extract JSON from response
-            json_match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-            if json_match:
-                question_data = json.loads(json_match.group(0))
-            else:
-                question_data = json.loads(response)
-
-            # Validate required fields
-            if "question_text" not in question_data or "correct_answer" not in question_data:
-                raise ValueError("Missing required fields in question")
-
-            # Ensure options for choice questions
-            if question_type == "choice" and "options" not in question_data:
-                raise ValueError("Choice questions must have options")
+            question_data = parse_json_object(response)
+            self._check_question_fields(question_data, question_type)
 
             return question_data
 
@@ -346,16 +1049,10 @@ class QuizGenerationService:
         Returns:
             Formatted prompt
         """
-        type_instructions = {
-            "choice": "Create a multiple choice question with 4 options (A, B, C, D).",
-            "fill_blank": "Create a fill-in-the-blank question with a clear answer.",
-            "short_answer": "Create a short answer question requiring 2-3 sentences.",
-        }
-
         return f"""Generate a {difficulty} {question_type} question for this knowledge point: {knowledge_point}
 
 Requirements:
-1. {type_instructions.get(question_type, "")}
+1. {QUESTION_TYPE_INSTRUCTIONS.get(question_type, "")}
 2. Question should test understanding of the concept
 3. Output MUST be valid JSON only
 
@@ -369,6 +1066,59 @@ JSON Format:
 
 Generate the question now:"""
 
+    def _get_batch_question_prompt(
+        self,
+        items: List[Tuple[str, str]],
+        difficulty: str,
+    ) -> str:
+        """Generate prompt for creating several questions at once.
+
+        Args:
+            items: (knowledge point text, question type) per question
+            difficulty: Difficulty level
+
+        Returns:
+            Formatted prompt
+        """
+        point_lines = "\n".join(
+            f"{position}. [{question_type}] {knowledge_point}"
+            for position, (knowledge_point, question_type) in enumerate(items, start=1)
+        )
+        used_types = sorted({question_type for _, question_type in items})
+        type_lines = "\n".join(
+            f"- {question_type}: {QUESTION_TYPE_INSTRUCTIONS.get(question_type, '')}"
+            for question_type in used_types
+        )
+
+        return f"""Generate {len(items)} {difficulty} quiz questions, one for each knowledge point below.
+
+Knowledge points (id. [question type] text):
+{point_lines}
+
+Question types:
+{type_lines}
+
+Requirements:
+1. Exactly one question per knowledge point, with the same id and question type
+2. Each question should test understanding of its concept
+3. Omit "options" for question types other than choice
+4. Output MUST be valid JSON only
+
+JSON Format:
+{{
+  "questions": [
+    {{
+      "id": 1,
+      "question_text": "Your question here",
+      "correct_answer": "The correct answer",
+      "options": ["A. Option 1", "B. Option 2", "C. Option 3", "D. Option 4"],
+      "explanation": "Brief explanation of the answer"
+    }}
+  ]
+}}
+
+Generate the questions now:"""
+
     async def get_quiz_questions(
         self,
         quiz_id: uuid.UUID,
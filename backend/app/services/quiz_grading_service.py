@@ -1,32 +1,121 @@
 """Quiz answer validation and grading service."""
 
+import asyncio
+import hashlib
+import unicodedata
 import uuid
-from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from loguru import logger
-from sqlalchemy import select
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.config import get_settings
+from app.models.grading_cache import ShortAnswerGrade
 from app.models.quiz import Quiz, QuizSession, QuizAnswer, QuizQuestion
-from app.services.deepseek_service import DeepSeekService
-from app.services.vector_search_service import VectorSearchService
+from app.services.cache_service import cache_service
+from app.services.deepseek_service import DeepSeekService, get_deepseek_service
+from app.services.mistake_service import MistakeService
+from app.services.vector_search_service import VectorSearchService, get_vector_search_service
+from app.utils.answer_matcher import match_answer
+from app.utils.json_extract import parse_json_object
+
+settings = get_settings()
+
+# Question types graded by the LLM rather than locally
+LLM_GRADED_TYPES = frozenset({"short_answer"})
+
+# Quiz statuses whose question set is final
+ANSWERABLE_STATUSES = ("ready", "completed")
+
+# QuizAnswer.is_correct of an answer waiting for background grading
+PENDING = "pending"
+
+
+class QuizNotReadyError(ValueError):
+    """Raised when answering a quiz that is still generating or failed."""
+
+
+def _grade_hashes(question: QuizQuestion, user_answer: str) -> Tuple[str, str]:
+    """Hash a question's answer key and a user answer for the grading cache.
+
+    Answers are NFKC-normalized, case-folded and whitespace-collapsed, so
+    trivially different spellings of the same answer share a grade.
+
+    Returns:
+        (answer key hash, normalized answer hash)
+    """
+    normalized = " ".join(unicodedata.normalize("NFKC", user_answer).casefold().split())
+    return (
+        hashlib.sha256(str(question.correct_answer).encode()).hexdigest(),
+        hashlib.sha256(normalized.encode()).hexdigest(),
+    )
+
+
+def _correctness(is_correct: Optional[bool]) -> str:
+    """Stored form of QuizAnswer.is_correct; None marks the answer pending."""
+    if is_correct is None:
+        return PENDING
+    return "true" if is_correct else "false"
+
+
+async def load_session_results(
+    db: AsyncSession,
+    session_id: uuid.UUID,
+    user_id: uuid.UUID,
+) -> Optional[QuizSession]:
+    """Load a user's quiz session with its answers in one query.
+
+    Reading results needs no AI clients, so read-only callers use this
+    instead of constructing a QuizGradingService.
+
+    Args:
+        db: Database session
+        session_id: Session ID
+        user_id: User ID
+
+    Returns:
+        Quiz session with answers loaded, None if not found
+    """
+    result = await db.execute(
+        select(QuizSession)
+        .where(
+            QuizSession.id == session_id,
+            QuizSession.user_id == user_id,
+        )
+        .options(selectinload(QuizSession.answers))
+    )
+    return result.scalar_one_or_none()
 
 
 class QuizGradingService:
     """Service for grading quiz answers."""
 
-    def __init__(self, db: AsyncSession) -> None:
+    def __init__(
+        self,
+        db: AsyncSession,
+        deepseek: Optional[DeepSeekService] = None,
+        vector_search: Optional[VectorSearchService] = None,
+    ) -> None:
         """Initialize grading service.
 
         Args:
             db: Database session
+            deepseek: DeepSeek service, defaults to the process-wide instance
+            vector_search: Vector search service, defaults to the process-wide instance
         """
         self.db = db
-        self.deepseek = DeepSeekService()
-        self.vector_search = VectorSearchService()
+        self.deepseek = deepseek or get_deepseek_service()
+        self.vector_search = vector_search or get_vector_search_service()
+        # Lease this service holds on a grading session, set by claim_grading
+        self._grading_lease: Optional[datetime] = None
 
     async def initialize(self) -> None:
-        """Initialize vector search service."""
+        """Initialize vector search service, if not done at startup."""
         await self.vector_search.initialize()
 
     async def submit_answers(
@@ -35,7 +124,12 @@ class QuizGradingService:
         user_id: uuid.UUID,
         answers: List[Dict[str, Any]],
     ) -> QuizSession:
-        """Submit and grade quiz answers.
+        """Submit quiz answers and grade the objective ones.
+
+        Choice and fill-blank answers are graded before returning. Short
+        answers are stored as pending and the session is left in grading
+        status, to be finished by run_grading in the background; without
+        short answers the session completes at once.
 
         Args:
             quiz_id: Quiz ID
@@ -43,15 +137,131 @@ class QuizGradingService:
             answers: List of {question_id, user_answer}
 
         Returns:
-            Quiz session with results
+            Quiz session with results so far, its answers loaded
 
         Raises:
+            QuizNotReadyError: If the quiz is still generating or failed
             ValueError: If quiz not found or invalid answers
         """
+        session, submitted = await self._start_session(quiz_id, user_id, answers)
+
+        # Grade objective answers now; LLM-graded ones are left to a background job
+        local = [(q, a) for q, a in submitted if q.question_type not in LLM_GRADED_TYPES]
+        local_results = iter(await self._grade_answers(local, quiz_id, user_id=user_id))
+        answer_rows = [
+            self._answer_row(
+                session,
+                question,
+                user_answer,
+                {"is_correct": None} if question.question_type in LLM_GRADED_TYPES else next(local_results),
+            )
+            for question, user_answer in submitted
+        ]
+        await self._store_answers(session, submitted, answer_rows)
+
+        logger.info(
+            f"Submitted quiz session {session.id}: status={session.status}, score={session.score:.2f}"
+        )
+        return session
+
+    async def submit_answers_streaming(
+        self,
+        quiz_id: uuid.UUID,
+        user_id: uuid.UUID,
+        answers: List[Dict[str, Any]],
+    ) -> AsyncIterator[Tuple[str, Any]]:
+        """Submit quiz answers, yielding each result as soon as it is graded.
+
+        Unlike submit_answers, short answers are graded before the session
+        is stored, each with its own LLM call so that no result waits for
+        the slowest answer of a batch; at most QUIZ_GRADING_CONCURRENCY
+        calls run at a time and earlier grades come from the grading cache.
+        The session is stored completed once every answer is graded. If the
+        consumer stops early, the remaining grading is cancelled and nothing
+        is stored.
+
+        Args:
+            quiz_id: Quiz ID
+            user_id: User ID
+            answers: List of {question_id, user_answer}
+
+        Yields:
+            ("answer", QuizAnswer) per answer, in the order grading finishes,
+            then ("session", QuizSession) with all answers loaded
+
+        Raises:
+            QuizNotReadyError: If the quiz is still generating or failed
+            ValueError: If quiz not found or invalid answers
+        """
+        session, submitted = await self._start_session(quiz_id, user_id, answers)
+
+        llm_graded = [
+            idx for idx, (question, _) in enumerate(submitted)
+            if question.question_type in LLM_GRADED_TYPES
+        ]
+        cached = dict(zip(llm_graded, await self._get_cached_grades([submitted[idx] for idx in llm_graded])))
+        semaphore = asyncio.Semaphore(settings.QUIZ_GRADING_CONCURRENCY)
+
+        async def grade(idx: int) -> Tuple[int, Dict[str, Any]]:
+            question, user_answer = submitted[idx]
+            if cached.get(idx) is not None:
+                return idx, await self._short_answer_result(question, user_answer, *cached[idx], quiz_id)
+            if idx in cached:
+                async with semaphore:
+                    return idx, await self._grade_answer(question, user_answer, quiz_id, user_id=user_id)
+            return idx, await self._grade_answer(question, user_answer, quiz_id, user_id=user_id)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(submitted)
+        answer_rows: List[Optional[Dict[str, Any]]] = [None] * len(submitted)
+        tasks = [asyncio.ensure_future(grade(idx)) for idx in range(len(submitted))]
+        try:
+            for next_graded in asyncio.as_completed(tasks):
+                idx, result = await next_graded
+                results[idx] = result
+                answer_rows[idx] = self._answer_row(session, *submitted[idx], result)
+                yield "answer", QuizAnswer(**answer_rows[idx])
+        finally:
+            # Nothing is left running if the client goes away mid-stream
+            for task in tasks:
+                task.cancel()
+
+        await self._cache_grades([
+            (*submitted[idx], results[idx]) for idx, grade in cached.items()
+            if grade is None and results[idx].get("ai_score") is not None
+        ])
+        await self._store_answers(session, submitted, answer_rows)
+
+        logger.info(
+            f"Submitted quiz session {session.id} (streamed): score={session.score:.2f}"
+        )
+        yield "session", session
+
+    async def _start_session(
+        self,
+        quiz_id: uuid.UUID,
+        user_id: uuid.UUID,
+        answers: List[Dict[str, Any]],
+    ) -> Tuple[QuizSession, List[Tuple[QuizQuestion, str]]]:
+        """Create an in-progress session and match answers to their questions.
+
+        Args:
+            quiz_id: Quiz ID
+            user_id: User ID
+            answers: List of {question_id, user_answer}
+
+        Returns:
+            The flushed session and the valid (question, user answer) pairs
+
+        Raises:
+            QuizNotReadyError: If the quiz is still generating or failed
+            ValueError: If quiz not found or unauthorized
+        """
         # Get quiz
         quiz = await self._get_quiz(quiz_id, user_id)
         if not quiz:
             raise ValueError("Quiz not found or unauthorized")
+        if quiz.status not in ANSWERABLE_STATUSES:
+            raise QuizNotReadyError(f"Quiz is {quiz.status} and cannot be answered")
 
         # Get all questions
         questions = await self._get_quiz_questions(quiz_id)
@@ -71,10 +281,8 @@ class QuizGradingService:
         self.db.add(session)
         await self.db.flush()
 
-        # Process each answer
-        correct_count = 0
-        total_score = 0.0
-
+        # Validate answers
+        submitted: List[Tuple[QuizQuestion, str]] = []
         for answer_data in answers:
             question_id = answer_data.get("question_id")
             user_answer = answer_data.get("user_answer")
@@ -88,41 +296,314 @@ class QuizGradingService:
                 logger.warning(f"Question {question_id} not found")
                 continue
 
-            # Grade answer
-            grading_result = await self._grade_answer(question, user_answer, quiz_id)
+            submitted.append((question, user_answer))
 
-            # Create answer record
-            answer = QuizAnswer(
-                id=uuid.uuid4(),
-                session_id=session.id,
-                question_id=question_id,
-                user_answer=user_answer,
-                is_correct=grading_result["is_correct"],
-                ai_score=grading_result.get("ai_score"),
-                ai_feedback=grading_result.get("feedback"),
-                note_snippets=grading_result.get("note_snippets"),
+        return session, submitted
+
+    def _answer_row(
+        self,
+        session: QuizSession,
+        question: QuizQuestion,
+        user_answer: str,
+        grading_result: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Build the quiz_answers row of a graded or pending answer."""
+        return {
+            "id": uuid.uuid4(),
+            "session_id": session.id,
+            "question_id": question.id,
+            "user_answer": user_answer,
+            "is_correct": _correctness(grading_result["is_correct"]),
+            "ai_score": grading_result.get("ai_score"),
+            "ai_feedback": grading_result.get("feedback"),
+            "note_snippets": grading_result.get("note_snippets"),
+        }
+
+    async def _store_answers(
+        self,
+        session: QuizSession,
+        submitted: List[Tuple[QuizQuestion, str]],
+        answer_rows: List[Dict[str, Any]],
+    ) -> None:
+        """Insert a session's answers, score it and commit.
+
+        Args:
+            session: Session being submitted
+            submitted: (question, user answer) pairs
+            answer_rows: quiz_answers rows, in the order of submitted
+        """
+        # One multi-row INSERT rather than an ORM flush of every answer
+        if answer_rows:
+            await self.db.execute(insert(QuizAnswer).values(answer_rows))
+
+        answer_records = [QuizAnswer(**row) for row in answer_rows]
+        self._score_session(session, answer_records)
+        if session.status == "completed":
+            await self._capture_mistakes(
+                session, [(question, answer) for (question, _), answer in zip(submitted, answer_records)]
             )
+        await self.db.commit()
 
-            self.db.add(answer)
+        # Results are returned from memory; the answers are not read back
+        set_committed_value(session, "answers", answer_records)
 
-            # Update statistics
-            if grading_result["is_correct"]:
-                correct_count += 1
-                total_score += 1.0
-            elif grading_result.get("ai_score"):
-                total_score += grading_result["ai_score"]
+    async def claim_grading(self, session_id: uuid.UUID) -> bool:
+        """Take the grading lease of a session.
 
-        # Update session
-        session.correct_count = correct_count
-        session.score = total_score / len(questions) if questions else 0.0
-        session.status = "completed"
+        A session can be claimed while it is grading and nobody holds the
+        lease, or the holder stopped renewing it for QUIZ_JOB_LEASE_SECONDS.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            True if this caller now owns the grading job
+        """
+        now = datetime.utcnow()
+        stale_before = now - timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+        result = await self.db.execute(
+            update(QuizSession)
+            .where(
+                QuizSession.id == session_id,
+                QuizSession.status == "grading",
+                or_(
+                    QuizSession.grading_claimed_at.is_(None),
+                    QuizSession.grading_claimed_at < stale_before,
+                ),
+            )
+            .values(grading_claimed_at=now)
+        )
+        await self.db.commit()
+        if result.rowcount != 1:
+            return False
+        self._grading_lease = now
+        return True
+
+    async def _renew_grading_lease(self, session_id: uuid.UUID) -> bool:
+        """Extend the grading lease this service holds on a session.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        now = datetime.utcnow()
+        result = await self.db.execute(
+            update(QuizSession)
+            .where(
+                QuizSession.id == session_id,
+                QuizSession.status == "grading",
+                QuizSession.grading_claimed_at == self._grading_lease,
+            )
+            .values(grading_claimed_at=now)
+        )
+        await self.db.commit()
+        if result.rowcount != 1:
+            return False
+        self._grading_lease = now
+        return True
+
+    async def _release_grading_lease(self, session_id: uuid.UUID) -> bool:
+        """Release the grading lease this service holds, if it still holds it.
+
+        The released row stays locked until the caller commits, so another
+        worker cannot claim the session while its results are written.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            False if the lease was lost to another worker
+        """
+        result = await self.db.execute(
+            update(QuizSession)
+            .where(
+                QuizSession.id == session_id,
+                QuizSession.status == "grading",
+                QuizSession.grading_claimed_at == self._grading_lease,
+            )
+            .values(grading_claimed_at=None)
+        )
+        self._grading_lease = None
+        return result.rowcount == 1
+
+    async def get_resumable_session_ids(self) -> List[uuid.UUID]:
+        """Get grading sessions whose job is not held by a live worker.
+
+        Returns:
+            Session IDs, oldest first
+        """
+        stale_before = datetime.utcnow() - timedelta(seconds=settings.QUIZ_JOB_LEASE_SECONDS)
+        result = await self.db.execute(
+            select(QuizSession.id)
+            .where(
+                QuizSession.status == "grading",
+                or_(
+                    QuizSession.grading_claimed_at.is_(None),
+                    QuizSession.grading_claimed_at < stale_before,
+                ),
+            )
+            .order_by(QuizSession.started_at)
+        )
+        return list(result.scalars().all())
+
+    async def run_grading(self, session_id: uuid.UUID) -> Optional[QuizSession]:
+        """Grade the pending answers of a claimed session and finalize its score.
+
+        The lease taken by claim_grading is renewed after every grading
+        batch. Results are only stored while this service still holds it;
+        if a sweep handed the session to another worker, they are dropped.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            The session, or None if it does not exist or the lease was lost
+        """
+        session, rows = await self._get_session_answers(session_id)
+        if session is None or session.status != "grading":
+            return session
+
+        renewal = asyncio.Lock()
+
+        async def renew_lease() -> None:
+            async with renewal:
+                if self._grading_lease is not None and not await self._renew_grading_lease(session_id):
+                    logger.warning(f"Lost the grading lease of quiz session {session_id}")
+
+        pending = [(answer, question) for answer, question in rows if answer.is_correct == PENDING]
+        grading_results = await self._grade_answers(
+            [(question, answer.user_answer) for answer, question in pending],
+            session.quiz_id,
+            user_id=session.user_id,
+            on_batch=renew_lease,
+        )
+
+        for (answer, _), grading_result in zip(pending, grading_results):
+            answer.is_correct = _correctness(grading_result["is_correct"])
+            answer.ai_score = grading_result.get("ai_score")
+            answer.ai_feedback = grading_result.get("feedback")
+            answer.note_snippets = grading_result.get("note_snippets")
 
+        if not await self._release_grading_lease(session_id):
+            await self.db.rollback()
+            logger.warning(f"Dropped grading results of quiz session {session_id}: lease lost")
+            return None
+
+        self._score_session(session, [answer for answer, _ in rows])
+        await self._capture_mistakes(session, [(question, answer) for answer, question in rows])
         await self.db.commit()
-        await self.db.refresh(session)
 
         logger.info(f"Graded quiz session {session.id}: score={session.score:.2f}")
         return session
 
+    async def mark_grading_failed(self, session_id: uuid.UUID) -> None:
+        """Count the still pending answers of a session as wrong and complete it.
+
+        Nothing changes if this service no longer holds the session's lease.
+
+        Args:
+            session_id: Session ID
+        """
+        session, rows = await self._get_session_answers(session_id)
+        if session is None or session.status != "grading":
+            return
+
+        if not await self._release_grading_lease(session_id):
+            await self.db.rollback()
+            logger.warning(f"Not failing quiz session {session_id}: lease lost")
+            return
+
+        for answer, _ in rows:
+            if answer.is_correct == PENDING:
+                answer.is_correct = _correctness(False)
+                answer.ai_feedback = "Grading failed"
+
+        self._score_session(session, [answer for answer, _ in rows])
+        await self._capture_mistakes(session, [(question, answer) for answer, question in rows])
+        await self.db.commit()
+
+    async def _get_session_answers(
+        self,
+        session_id: uuid.UUID,
+    ) -> Tuple[Optional[QuizSession], List[Tuple[QuizAnswer, QuizQuestion]]]:
+        """Get a session with its answers and their questions.
+
+        Args:
+            session_id: Session ID
+
+        Returns:
+            The session, or None if not found, and (answer, question) pairs
+        """
+        result = await self.db.execute(select(QuizSession).where(QuizSession.id == session_id))
+        session = result.scalar_one_or_none()
+        if session is None:
+            return None, []
+
+        rows = await self.db.execute(
+            select(QuizAnswer, QuizQuestion)
+            .join(QuizQuestion, QuizQuestion.id == QuizAnswer.question_id)
+            .where(QuizAnswer.session_id == session_id)
+        )
+        return session, [tuple(row) for row in rows.all()]
+
+    async def _capture_mistakes(
+        self,
+        session: QuizSession,
+        answered: List[Tuple[QuizQuestion, QuizAnswer]],
+    ) -> None:
+        """Add the wrong answers of a completed session to the user's mistakes.
+
+        Answers that were only counted wrong because grading failed, i.e.
+        LLM-graded answers without a score, are not mistakes and are left out.
+
+        Args:
+            session: Completed quiz session
+            answered: (question, answer) pairs of the session
+        """
+        if not settings.QUIZ_MISTAKE_CAPTURE_ENABLED:
+            return
+
+        wrong = [
+            (question, answer.user_answer)
+            for question, answer in answered
+            if answer.is_correct == _correctness(False)
+            and not (question.question_type in LLM_GRADED_TYPES and answer.ai_score is None)
+        ]
+        captured = await MistakeService(self.db).capture_quiz_mistakes(
+            session.user_id, session.quiz_id, wrong
+        )
+        if captured:
+            logger.info(f"Captured {captured} mistakes from quiz session {session.id}")
+
+    def _score_session(self, session: QuizSession, answers: List[QuizAnswer]) -> None:
+        """Update a session's statistics from its answers.
+
+        Pending answers count as wrong until graded; the session stays in
+        grading status while any are left.
+
+        Args:
+            session: Quiz session
+            answers: All answers of the session
+        """
+        correct_count = 0
+        total_score = 0.0
+        for answer in answers:
+            if answer.is_correct == _correctness(True):
+                correct_count += 1
+                total_score += 1.0
+            elif answer.ai_score:
+                total_score += answer.ai_score
+
+        session.correct_count = correct_count
+        session.score = total_score / session.total_questions if session.total_questions else 0.0
+        if any(answer.is_correct == PENDING for answer in answers):
+            session.status = "grading"
+        else:
+            session.status = "completed"
+            session.completed_at = datetime.utcnow()
+
     async def _get_quiz(
         self,
         quiz_id: uuid.UUID,
@@ -164,11 +645,174 @@ class QuizGradingService:
         )
         return list(result.scalars().all())
 
+    async def _grade_answers(
+        self,
+        submitted: List[Tuple[QuizQuestion, str]],
+        quiz_id: uuid.UUID,
+        user_id: Optional[uuid.UUID] = None,
+        on_batch: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Grade submitted answers.
+
+        Choice and fill-blank answers are graded locally in one pass. Short
+        answers graded before are taken from the grading cache; the rest are
+        graded by the LLM in batches of QUIZ_GRADING_BATCH_SIZE, at most
+        QUIZ_GRADING_CONCURRENCY calls at a time, and cached.
+
+        Args:
+            submitted: (question, user answer) pairs
+            quiz_id: Quiz ID
+            user_id: Submitting user, for usage accounting
+            on_batch: Awaited after every LLM batch, e.g. to renew a lease
+
+        Returns:
+            Grading results, in submission order
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(submitted)
+        semaphore = asyncio.Semaphore(settings.QUIZ_GRADING_CONCURRENCY)
+
+        async def grade_with_llm(batch: List[int]) -> None:
+            async with semaphore:
+                if len(batch) == 1:
+                    question, user_answer = submitted[batch[0]]
+                    graded = [await self._grade_answer(question, user_answer, quiz_id, user_id=user_id)]
+                else:
+                    graded = await self._grade_short_answers_batch(
+                        [submitted[idx] for idx in batch], quiz_id, user_id=user_id
+                    )
+            for idx, result in zip(batch, graded):
+                results[idx] = result
+            if on_batch is not None:
+                await on_batch()
+
+        llm_graded = []
+        for idx, (question, user_answer) in enumerate(submitted):
+            if question.question_type in LLM_GRADED_TYPES:
+                llm_graded.append(idx)
+            else:
+                results[idx] = await self._grade_answer(question, user_answer, quiz_id, user_id=user_id)
+
+        # Answers graded before are served from the grading cache
+        cached = await self._get_cached_grades([submitted[idx] for idx in llm_graded])
+        hits = [(idx, grade) for idx, grade in zip(llm_graded, cached) if grade is not None]
+        hit_results = await asyncio.gather(*(
+            self._short_answer_result(*submitted[idx], *grade, quiz_id) for idx, grade in hits
+        ))
+        for (idx, _), result in zip(hits, hit_results):
+            results[idx] = result
+        misses = [idx for idx, grade in zip(llm_graded, cached) if grade is None]
+
+        batch_size = max(1, settings.QUIZ_GRADING_BATCH_SIZE)
+        await asyncio.gather(*(
+            grade_with_llm(misses[i:i + batch_size])
+            for i in range(0, len(misses), batch_size)
+        ))
+
+        await self._cache_grades([
+            (*submitted[idx], results[idx]) for idx in misses
+            if results[idx].get("ai_score") is not None
+        ])
+        return results
+
+    async def _get_cached_grades(
+        self,
+        submitted: List[Tuple[QuizQuestion, str]],
+    ) -> List[Optional[Tuple[float, Optional[str]]]]:
+        """Look up earlier grades of short answers.
+
+        Redis is checked first; misses are looked up in short_answer_grades
+        with one query and written back to Redis.
+
+        Args:
+            submitted: (question, user answer) pairs
+
+        Returns:
+            (score, feedback) per answer, None where it was not graded before
+        """
+        grades: List[Optional[Tuple[float, Optional[str]]]] = [None] * len(submitted)
+        if not submitted or not settings.QUIZ_GRADING_CACHE_ENABLED:
+            return grades
+
+        hashes = [_grade_hashes(question, user_answer) for question, user_answer in submitted]
+        cache_keys = [
+            cache_service.grading_cache_key(question.id, *answer_hashes)
+            for (question, _), answer_hashes in zip(submitted, hashes)
+        ]
+        for idx, grade in enumerate(await cache_service.get_cached_grades(cache_keys)):
+            if grade is not None:
+                grades[idx] = (grade["score"], grade.get("feedback"))
+
+        missing = [idx for idx, grade in enumerate(grades) if grade is None]
+        if not missing:
+            return grades
+
+        result = await self.db.execute(
+            select(ShortAnswerGrade).where(
+                ShortAnswerGrade.question_id.in_({submitted[idx][0].id for idx in missing}),
+                ShortAnswerGrade.answer_hash.in_({hashes[idx][1] for idx in missing}),
+            )
+        )
+        stored = {
+            (row.question_id, row.answer_key_hash, row.answer_hash): row
+            for row in result.scalars().all()
+        }
+
+        refill: Dict[str, dict] = {}
+        for idx in missing:
+            row = stored.get((submitted[idx][0].id, *hashes[idx]))
+            if row is not None:
+                grades[idx] = (row.score, row.feedback)
+                refill[cache_keys[idx]] = {"score": row.score, "feedback": row.feedback}
+        await cache_service.cache_grades(refill, ttl=settings.QUIZ_GRADING_CACHE_TTL_SECONDS)
+        return grades
+
+    async def _cache_grades(
+        self,
+        graded: List[Tuple[QuizQuestion, str, Dict[str, Any]]],
+    ) -> None:
+        """Store new short answer grades in Redis and short_answer_grades.
+
+        The database write joins the caller's transaction. A stored grade
+        for an answer whose question has a new answer key is replaced.
+
+        Args:
+            graded: (question, user answer, grading result) triples
+        """
+        if not graded or not settings.QUIZ_GRADING_CACHE_ENABLED:
+            return
+
+        rows: Dict[Tuple[uuid.UUID, str], Dict[str, Any]] = {}
+        redis_grades: Dict[str, dict] = {}
+        for question, user_answer, result in graded:
+            answer_key_hash, answer_hash = _grade_hashes(question, user_answer)
+            grade = {"score": result["ai_score"], "feedback": result.get("feedback")}
+            rows[(question.id, answer_hash)] = {
+                "question_id": question.id,
+                "answer_hash": answer_hash,
+                "answer_key_hash": answer_key_hash,
+                **grade,
+            }
+            redis_grades[cache_service.grading_cache_key(question.id, answer_key_hash, answer_hash)] = grade
+
+        stmt = pg_insert(ShortAnswerGrade).values(list(rows.values()))
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=["question_id", "answer_hash"],
+                set_={
+                    "answer_key_hash": stmt.excluded.answer_key_hash,
+                    "score": stmt.excluded.score,
+                    "feedback": stmt.excluded.feedback,
+                },
+            )
+        )
+        await cache_service.cache_grades(redis_grades, ttl=settings.QUIZ_GRADING_CACHE_TTL_SECONDS)
+
     async def _grade_answer(
         self,
         question: QuizQuestion,
         user_answer: str,
         quiz_id: uuid.UUID,
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Grade a single answer.
 
@@ -176,6 +820,7 @@ class QuizGradingService:
             question: Quiz question
             user_answer: User's answer
             quiz_id: Quiz ID
+            user_id: Submitting user, for usage accounting
 
         Returns:
             Grading result with is_correct, score, feedback, note_snippets
@@ -196,7 +841,7 @@ class QuizGradingService:
 
             elif question_type == "short_answer":
                 return await self._grade_short_answer(
-                    question, user_answer, correct_answer, quiz_id
+                    question, user_answer, correct_answer, quiz_id, user_id=user_id
                 )
 
             else:
@@ -238,6 +883,9 @@ class QuizGradingService:
     ) -> Dict[str, Any]:
         """Grade fill-in-the-blank answer using fuzzy matching.
 
+        See app.utils.answer_matcher; the compiled answer key is cached per
+        distinct correct answer.
+
         Args:
             user_answer: User's answer
             correct_answer: Correct answer
@@ -245,38 +893,8 @@ class QuizGradingService:
         Returns:
             Grading result
         """
-        # Normalize
-        user_normalized = user_answer.strip().lower()
-        correct_normalized = correct_answer.strip().lower()
-
-        # Direct match
-        if user_normalized == correct_normalized:
-            return {"is_correct": True}
-
-        # Tokenize and remove common stopwords for better matching
-        stopwords = {"the", "a", "an", "is", "are", "was", "were", "of", "in", "on", "at", "to"}
-        user_tokens = [w for w in user_normalized.split() if w not in stopwords]
-        correct_tokens = [w for w in correct_normalized.split() if w not in stopwords]
-
-        if not user_tokens or not correct_tokens:
-            # Fallback to simple matching if no tokens after stopwords
-            user_tokens = user_normalized.split()
-            correct_tokens = correct_normalized.split()
-
-        # Bidirectional matching: correct->user AND user->correct
-        correct_in_user = sum(1 for kw in correct_tokens if kw in user_normalized)
-        user_in_correct = sum(1 for kw in user_tokens if kw in correct_normalized)
-
-        # Calculate combined match ratio
-        total_matches = correct_in_user + user_in_correct
-        total_unique = len(correct_tokens) + len(user_tokens)
-        match_ratio = total_matches / total_unique if total_unique > 0 else 0
-
-        # Consider correct if 50%+ keyword match (lenient for fill-in-blank)
-        is_correct = match_ratio >= 0.5
-
         return {
-            "is_correct": is_correct,
+            "is_correct": match_answer(user_answer, correct_answer),
         }
 
     async def _grade_short_answer(
@@ -285,6 +903,7 @@ class QuizGradingService:
         user_answer: str,
         correct_answer: str,
         quiz_id: uuid.UUID,
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Grade short answer using LLM.
 
@@ -293,6 +912,7 @@ class QuizGradingService:
             user_answer: User's answer
             correct_answer: Correct answer
             quiz_id: Quiz ID
+            user_id: Submitting user, for usage accounting
 
         Returns:
             Grading result with score and feedback
@@ -308,42 +928,122 @@ class QuizGradingService:
                 prompt=prompt,
                 max_tokens=300,
                 temperature=0.3,
+                feature="grading",
+                user_id=user_id,
+                json_mode=True,
             )
 
-            # Parse response
-            import json
-            import re
+            grading_data = parse_json_object(response)
 
-            json_match = re.search(r'\{[^{}]*\}', response, re.DOTALL)
-            if json_match:
-                grading_data = json.loads(json_match.group(0))
-            else:
-                grading_data = json.loads(response)
+            return await self._short_answer_result(
+                question,
+                user_answer,
+                grading_data.get("score", 0.0),
+                grading_data.get("feedback"),
+                quiz_id,
+            )
 
-            score = grading_data.get("score", 0.0)
-            is_correct = score >= 0.6  # 60% threshold for correct
+        except Exception as e:
+            logger.error(f"Failed to grade short answer with LLM: {e}")
+            return {"is_correct": False}
 
-            result = {
-                "is_correct": is_correct,
-                "ai_score": score,
-                "feedback": grading_data.get("feedback"),
-            }
+    async def _grade_short_answers_batch(
+        self,
+        submitted: List[Tuple[QuizQuestion, str]],
+        quiz_id: uuid.UUID,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """Grade several short answers in one LLM call.
 
-            # If incorrect, find relevant note snippets
-            if not is_correct:
-                snippets = await self.vector_search.find_relevant_snippets_for_wrong_answer(
-                    question=question.question_text,
-                    user_answer=user_answer,
-                    correct_answer=correct_answer,
-                    note_id=str(quiz_id),  # Assuming note_id is available
-                )
-                result["note_snippets"] = snippets
+        Answers the response leaves out or grades malformed are graded again
+        one at a time.
+
+        Args:
+            submitted: (question, user answer) pairs
+            quiz_id: Quiz ID
+            user_id: Submitting user, for usage accounting
+
+        Returns:
+            Grading results, in input order
+        """
+        grades: Dict[str, Tuple[float, Optional[str]]] = {}
+        prompt = self._get_batch_grading_prompt(
+            [(str(question.id), question.question_text, user_answer, question.correct_answer)
+             for question, user_answer in submitted]
+        )
+
+        try:
+            response = await self.deepseek.generate_completion(
+                prompt=prompt,
+                max_tokens=100 + 150 * len(submitted),
+                temperature=0.3,
+                feature="grading",
+                user_id=user_id,
+                json_mode=True,
+            )
 
-            return result
+            for item in parse_json_object(response).get("grades", []):
+                try:
+                    question_id = str(item["question_id"])
+                    score = float(item["score"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if 0.0 <= score <= 1.0:
+                    feedback = item.get("feedback")
+                    grades[question_id] = (score, feedback if isinstance(feedback, str) else None)
 
         except Exception as e:
-            logger.error(f"Failed to grade short answer with LLM: {e}")
-            return {"is_correct": False}
+            logger.error(f"Failed to grade {len(submitted)} short answers with LLM: {e}")
+
+        fallback = [str(question.id) not in grades for question, _ in submitted]
+        if any(fallback):
+            logger.warning(f"Grading {sum(fallback)} of {len(submitted)} short answers one at a time")
+
+        return list(await asyncio.gather(*(
+            self._grade_answer(question, user_answer, quiz_id, user_id=user_id)
+            if retry
+            else self._short_answer_result(question, user_answer, *grades[str(question.id)], quiz_id)
+            for (question, user_answer), retry in zip(submitted, fallback)
+        )))
+
+    async def _short_answer_result(
+        self,
+        question: QuizQuestion,
+        user_answer: str,
+        score: float,
+        feedback: Optional[str],
+        quiz_id: uuid.UUID,
+    ) -> Dict[str, Any]:
+        """Build the result of an LLM-graded answer.
+
+        Args:
+            question: Quiz question
+            user_answer: User's answer
+            score: Score from 0.0 to 1.0
+            feedback: Grading feedback
+            quiz_id: Quiz ID
+
+        Returns:
+            Grading result with score, feedback and, if wrong, note snippets
+        """
+        is_correct = score >= 0.6  # 60% threshold for correct
+
+        result = {
+            "is_correct": is_correct,
+            "ai_score": score,
+            "feedback": feedback,
+        }
+
+        # If incorrect, find relevant note snippets
+        if not is_correct:
+            result["note_snippets"] = await self.vector_search.find_relevant_snippets_for_wrong_answer(
+                question=question.question_text,
+                user_answer=user_answer,
+                correct_answer=question.correct_answer,
+                note_id=str(quiz_id),  # Assuming note_id is available
+            )
+
+        return result
 
     def _get_grading_prompt(
         self,
@@ -367,7 +1067,7 @@ Question: {question}
 
 User's Answer: {user_answer}
 
-Correct Answer: {question}
+Correct Answer: {correct_answer}
 
 Grading Criteria:
 1. Score from 0.0 to 1.0 based on accuracy and completeness
@@ -382,6 +1082,45 @@ Output MUST be valid JSON only:
 
 Grade the answer now:"""
 
+    def _get_batch_grading_prompt(
+        self,
+        answers: List[Tuple[str, str, str, str]],
+    ) -> str:
+        """Generate prompt for grading several short answers at once.
+
+        Args:
+            answers: (question ID, question text, user answer, correct answer) tuples
+
+        Returns:
+            Formatted prompt
+        """
+        entries = "\n\n".join(
+            f"""Answer ID: {question_id}
+Question: {question}
+User's Answer: {user_answer}
+Correct Answer: {correct_answer}"""
+            for question_id, question, user_answer, correct_answer in answers
+        )
+
+        return f"""Grade each of these {len(answers)} short answers.
+
+{entries}
+
+Grading Criteria:
+1. Score from 0.0 to 1.0 based on accuracy and completeness
+2. Provide brief feedback explaining the score
+3. Be fair and partial credit for partially correct answers
+4. Grade every answer on its own
+
+Output MUST be valid JSON only, with one entry per Answer ID:
+{{
+  "grades": [
+    {{"question_id": "<Answer ID>", "score": 0.8, "feedback": "Brief explanation of the score"}}
+  ]
+}}
+
+Grade the answers now:"""
+
     async def get_session_results(
         self,
         session_id: uuid.UUID,
@@ -396,20 +1135,11 @@ Grade the answer now:"""
         Returns:
             Quiz session with answers, None if not found
         """
-        result = await self.db.execute(
-            select(QuizSession).where(
-                QuizSession.id == session_id,
-                QuizSession.user_id == user_id,
-            )
-        )
-        session = result.scalar_one_or_none()
-
-        if session:
-            await self.db.refresh(session, attribute_names=["answers"])
-
-        return session
+        return await load_session_results(self.db, session_id, user_id)
 
     async def close(self) -> None:
-        """Close service connections."""
-        await self.deepseek.close()
-        await self.vector_search.close()
+        """Release the service.
+
+        The DeepSeek and vector search clients are shared by the process and
+        closed on application shutdown, so nothing is closed here.
+        """
@@ -0,0 +1,272 @@
+"""Background quiz generation jobs.
+
+Generation runs outside the request: the API creates the quiz in generating
+status and submits it here. Each job claims a lease on the quiz row so only
+one worker process generates it, and commits questions round by round. A
+periodic sweep picks up quizzes whose lease expired, e.g. after a restart,
+and resumes them from the questions already stored. The runner also fills
+the question bank of new mindmaps and grades the short answers of submitted
+quiz sessions, leased and resumed the same way.
+"""
+
+import asyncio
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+
+class QuizJobRunner:
+    """Run quiz generation jobs as bounded background tasks."""
+
+    def __init__(
+        self,
+        max_concurrent_jobs: int = 4,
+        sweep_interval: float = 60.0,
+        max_concurrent_bank_fills: int = 1,
+        max_concurrent_gradings: int = 8,
+        session_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        """Initialize job runner.
+
+        Args:
+            max_concurrent_jobs: Jobs generating at the same time in this process
+            sweep_interval: Seconds between sweeps for abandoned jobs
+            max_concurrent_bank_fills: Bank fills running at the same time; they
+                have their own limit so they never hold up interactive quiz jobs
+            max_concurrent_gradings: Session grading jobs running at the same time
+            session_factory: Session factory, defaults to AsyncSessionLocal
+        """
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.sweep_interval = sweep_interval
+        self._session_factory = session_factory
+        self._semaphore = asyncio.Semaphore(max_concurrent_jobs)
+        self._bank_fill_semaphore = asyncio.Semaphore(max_concurrent_bank_fills)
+        self._grading_semaphore = asyncio.Semaphore(max_concurrent_gradings)
+        self._jobs: Dict[uuid.UUID, asyncio.Task] = {}
+        self._bank_fills: Dict[uuid.UUID, asyncio.Task] = {}
+        self._gradings: Dict[uuid.UUID, asyncio.Task] = {}
+        self._sweep_task: Optional[asyncio.Task] = None
+
+    def _new_session(self) -> Any:
+        """Open a session independent of any request."""
+        if self._session_factory is None:
+            from app.core.database import AsyncSessionLocal
+
+            self._session_factory = AsyncSessionLocal
+        return self._session_factory()
+
+    def submit(self, quiz_id: uuid.UUID) -> bool:
+        """Schedule generation of a quiz.
+
+        Args:
+            quiz_id: Quiz ID
+
+        Returns:
+            False if the quiz already has a job in this process
+        """
+        job = self._jobs.get(quiz_id)
+        if job is not None and not job.done():
+            return False
+
+        task = asyncio.get_running_loop().create_task(self._run(quiz_id))
+        self._jobs[quiz_id] = task
+        task.add_done_callback(lambda _: self._jobs.pop(quiz_id, None))
+        return True
+
+    async def cancel(self, quiz_id: uuid.UUID) -> bool:
+        """Cancel the generation job of a quiz, e.g. because it was deleted.
+
+        Args:
+            quiz_id: Quiz ID
+
+        Returns:
+            False if the quiz has no running job in this process
+        """
+        job = self._jobs.get(quiz_id)
+        if job is None or job.done():
+            return False
+
+        job.cancel()
+        await asyncio.gather(job, return_exceptions=True)
+        return True
+
+    def submit_bank_fill(self, mindmap_id: uuid.UUID, user_id: Optional[uuid.UUID] = None) -> bool:
+        """Schedule filling the question bank of a mindmap.
+
+        Args:
+            mindmap_id: Mindmap ID
+            user_id: Mindmap owner, for usage accounting
+
+        Returns:
+            False if the mindmap already has a fill job in this process
+        """
+        job = self._bank_fills.get(mindmap_id)
+        if job is not None and not job.done():
+            return False
+
+        task = asyncio.get_running_loop().create_task(self._fill_bank(mindmap_id, user_id))
+        self._bank_fills[mindmap_id] = task
+        task.add_done_callback(lambda _: self._bank_fills.pop(mindmap_id, None))
+        return True
+
+    def submit_grading(self, session_id: uuid.UUID) -> bool:
+        """Schedule grading the pending answers of a quiz session.
+
+        Args:
+            session_id: Quiz session ID
+
+        Returns:
+            False if the session already has a grading job in this process
+        """
+        job = self._gradings.get(session_id)
+        if job is not None and not job.done():
+            return False
+
+        task = asyncio.get_running_loop().create_task(self._grade(session_id))
+        self._gradings[session_id] = task
+        task.add_done_callback(lambda _: self._gradings.pop(session_id, None))
+        return True
+
+    @property
+    def active_jobs(self) -> int:
+        """Number of jobs queued or running in this process."""
+        return len(self._jobs) + len(self._bank_fills) + len(self._gradings)
+
+    async def _run(self, quiz_id: uuid.UUID) -> None:
+        """Claim and generate one quiz."""
+        from app.services.quiz_generation_service import QuizGenerationService
+
+        async with self._semaphore:
+            async with self._new_session() as session:
+                service = QuizGenerationService(session)
+                try:
+                    if not await service.claim_generation(quiz_id):
+                        logger.debug(f"Quiz {quiz_id} is claimed elsewhere or not generating")
+                        return
+                    await service.run_generation(quiz_id)
+                except asyncio.CancelledError:
+                    # Left generating; the lease expires and a later sweep resumes it
+                    logger.info(f"Quiz generation job {quiz_id} cancelled")
+                    raise
+                except Exception as e:
+                    logger.error(f"Quiz generation job {quiz_id} failed: {e}")
+                    await session.rollback()
+                    await service.mark_generation_failed(quiz_id)
+
+    async def _fill_bank(self, mindmap_id: uuid.UUID, user_id: Optional[uuid.UUID]) -> None:
+        """Fill the question bank of one mindmap."""
+        from app.services.quiz_generation_service import QuizGenerationService
+
+        async with self._bank_fill_semaphore:
+            async with self._new_session() as session:
+                try:
+                    await QuizGenerationService(session).fill_question_bank(mindmap_id, user_id)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    # Quizzes still generate what the bank lacks
+                    logger.warning(f"Failed to fill question bank of mindmap {mindmap_id}: {e}")
+
+    async def _grade(self, session_id: uuid.UUID) -> None:
+        """Claim and grade one quiz session."""
+        from app.services.quiz_grading_service import QuizGradingService
+
+        async with self._grading_semaphore:
+            async with self._new_session() as session:
+                service = QuizGradingService(session)
+                try:
+                    if not await service.claim_grading(session_id):
+                        logger.debug(f"Quiz session {session_id} is claimed elsewhere or not grading")
+                        return
+                    await service.initialize()
+                    await service.run_grading(session_id)
+                except asyncio.CancelledError:
+                    # Left grading; the lease expires and a later sweep resumes it
+                    logger.info(f"Quiz grading job {session_id} cancelled")
+                    raise
+                except Exception as e:
+                    logger.error(f"Quiz grading job {session_id} failed: {e}")
+                    await session.rollback()
+                    await service.mark_grading_failed(session_id)
+
+    async def resume_pending(self) -> int:
+        """Submit generating quizzes and grading sessions that no live worker holds.
+
+        Returns:
+            Number of jobs submitted
+        """
+        from app.services.quiz_generation_service import QuizGenerationService
+        from app.services.quiz_grading_service import QuizGradingService
+
+        try:
+            async with self._new_session() as session:
+                quiz_ids = await QuizGenerationService(session).get_resumable_quiz_ids()
+                session_ids = await QuizGradingService(session).get_resumable_session_ids()
+        except Exception as e:
+            logger.warning(f"Failed to look up pending quiz jobs: {e}")
+            return 0
+
+        submitted = sum(1 for quiz_id in quiz_ids if self.submit(quiz_id))
+        submitted_gradings = sum(1 for session_id in session_ids if self.submit_grading(session_id))
+        if submitted:
+            logger.info(f"Resumed {submitted} quiz generation jobs")
+        if submitted_gradings:
+            logger.info(f"Resumed {submitted_gradings} quiz grading jobs")
+        return submitted + submitted_gradings
+
+    async def _run_periodic_sweep(self) -> None:
+        """Resume abandoned jobs now and every sweep_interval seconds."""
+        while True:
+            await self.resume_pending()
+            await asyncio.sleep(self.sweep_interval)
+
+    def start(self) -> None:
+        """Start sweeping for abandoned jobs. Should be called on application startup."""
+        if self._sweep_task is None or self._sweep_task.done():
+            self._sweep_task = asyncio.get_running_loop().create_task(
+                self._run_periodic_sweep()
+            )
+
+    async def stop(self) -> None:
+        """Stop the sweep and cancel running jobs. Should be called on shutdown."""
+        tasks = (
+            list(self._jobs.values())
+            + list(self._bank_fills.values())
+            + list(self._gradings.values())
+        )
+        if self._sweep_task is not None:
+            tasks.append(self._sweep_task)
+            self._sweep_task = None
+
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._jobs.clear()
+        self._bank_fills.clear()
+        self._gradings.clear()
+
+
+# Global job runner
+_quiz_job_runner: Optional[QuizJobRunner] = None
+
+
+def get_quiz_job_runner() -> QuizJobRunner:
+    """Get or create global quiz job runner.
+
+    Returns:
+        QuizJobRunner instance
+    """
+    global _quiz_job_runner
+    if _quiz_job_runner is None:
+        _quiz_job_runner = QuizJobRunner(
+            max_concurrent_jobs=settings.QUIZ_JOB_MAX_CONCURRENT,
+            sweep_interval=settings.QUIZ_JOB_SWEEP_INTERVAL_SECONDS,
+            max_concurrent_bank_fills=settings.QUESTION_BANK_FILL_MAX_CONCURRENT,
+            max_concurrent_gradings=settings.QUIZ_GRADING_MAX_CONCURRENT_JOBS,
+        )
+    return _quiz_job_runner
@@ -1,15 +1,17 @@
 """Quiz question quality validation service."""
 
-import json
-import re
+import asyncio
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import get_settings
 from app.services.deepseek_service import DeepSeekService
+from app.utils.json_extract import parse_json_object
+from app.utils.minhash import jaccard, shingles
+from app.utils.question_prescreen import ACCEPT, REJECT, get_prescreen_stats, prescreen_question
 
 settings = get_settings()
 
@@ -31,6 +33,7 @@ class QuizQualityValidator:
         question_data: Dict[str, Any],
         knowledge_point: str,
         expected_difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
     ) -> Dict[str, Any]:
         """Validate a single question for quality.
 
@@ -38,67 +41,176 @@ class QuizQualityValidator:
             question_data: Generated question data
             knowledge_point: Knowledge point text
             expected_difficulty: Expected difficulty level
+            user_id: Quiz owner, for usage accounting
 
         Returns:
             Validation result with is_valid, score, and feedback
         """
         try:
-            # Check required fields
-            if not self._has_required_fields(question_data):
-                return {
-                    "is_valid": False,
-                    "score": 0.0,
-                    "reason": "Missing required fields",
-                }
-
-            # Validate question text
-            if not self._validate_question_text(question_data.get("question_text", "")):
-                return {
-                    "is_valid": False,
-                    "score": 0.0,
-                    "reason": "Question text is invalid or too short",
-                }
-
-            # Validate answer
-            if not question_data.get("correct_answer"):
-                return {
-                    "is_valid": False,
-                    "score": 0.0,
-                    "reason": "Missing correct answer",
-                }
-
-            # Validate options for choice questions
-            if question_data.get("question_type") == "choice":
-                if not self._validate_choice_options(question_data.get("options", [])):
-                    return {
-                        "is_valid": False,
-                        "score": 0.0,
-                        "reason": "Invalid or insufficient options for choice question",
-                    }
+            local_result = self._check_locally(question_data, knowledge_point)
+            if local_result is not None:
+                return local_result
 
             # AI-based quality assessment
             quality_score = await self._assess_quality_with_ai(
                 question_data=question_data,
                 knowledge_point=knowledge_point,
                 expected_difficulty=expected_difficulty,
+                user_id=user_id,
+            )
+            return self._score_result(quality_score)
+
+        except Exception as e:
+            logger.error(f"Error validating question: {e}")
+            return {
+                "is_valid": False,
+                "score": 0.0,
+                "reason": f"Validation error: {str(e)}",
+            }
+
+    async def validate_questions(
+        self,
+        questions: List[Tuple[Dict[str, Any], str]],
+        expected_difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """Validate several questions, sharing AI assessment calls.
+
+        Questions not settled by the local checks are scored together, up to
+        QUIZ_QUALITY_BATCH_SIZE per LLM call.
+
+        Args:
+            questions: (question data, knowledge point text) pairs
+            expected_difficulty: Expected difficulty level
+            user_id: Quiz owner, for usage accounting
+
+        Returns:
+            Validation results, in input order
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        for question_data, knowledge_point in questions:
+            try:
+                results.append(self._check_locally(question_data, knowledge_point))
+            except Exception as e:
+                logger.error(f"Error validating question: {e}")
+                results.append({
+                    "is_valid": False,
+                    "score": 0.0,
+                    "reason": f"Validation error: {str(e)}",
+                })
+
+        borderline = [idx for idx, result in enumerate(results) if result is None]
+        if len(borderline) == 1:
+            question_data, knowledge_point = questions[borderline[0]]
+            scores = [
+                await self._assess_quality_with_ai(
+                    question_data=question_data,
+                    knowledge_point=knowledge_point,
+                    expected_difficulty=expected_difficulty,
+                    user_id=user_id,
+                )
+            ]
+        elif borderline:
+            batch_size = max(1, settings.QUIZ_QUALITY_BATCH_SIZE)
+            chunks = [
+                [questions[idx] for idx in borderline[start:start + batch_size]]
+                for start in range(0, len(borderline), batch_size)
+            ]
+            chunk_scores = await asyncio.gather(
+                *(
+                    self._assess_quality_batch_with_ai(chunk, expected_difficulty, user_id=user_id)
+                    for chunk in chunks
+                )
             )
+            scores = [score for chunk in chunk_scores for score in chunk]
+        else:
+            scores = []
+
+        for idx, score in zip(borderline, scores):
+            results[idx] = self._score_result(score)
+        return results
+
+    def _check_locally(
+        self,
+        question_data: Dict[str, Any],
+        knowledge_point: str,
+    ) -> Optional[Dict[str, Any]]:
+        """Run structural checks and the local pre-screen.
+
+        Args:
+            question_data: Generated question data
+            knowledge_point: Knowledge point text
 
-            is_valid = quality_score >= settings.QUIZ_QUALITY_THRESHOLD
+        Returns:
+            Validation result, or None if the AI assessor has to decide
+        """
+        # Check required fields
+        if not self._has_required_fields(question_data):
+            return {
+                "is_valid": False,
+                "score": 0.0,
+                "reason": "Missing required fields",
+            }
 
+        # Validate question text
+        if not self._validate_question_text(question_data.get("question_text", "")):
             return {
-                "is_valid": is_valid,
-                "score": quality_score,
-                "reason": "Quality validation passed" if is_valid else "Quality score below threshold",
+                "is_valid": False,
+                "score": 0.0,
+                "reason": "Question text is invalid or too short",
             }
 
-        except Exception as e:
-            logger.error(f"Error validating question: {e}")
+        # Validate answer
+        if not question_data.get("correct_answer"):
             return {
                 "is_valid": False,
                 "score": 0.0,
-                "reason": f"Validation error: {str(e)}",
+                "reason": "Missing correct answer",
             }
 
+        # Validate options for choice questions
+        if question_data.get("question_type") == "choice":
+            if not self._validate_choice_options(question_data.get("options", [])):
+                return {
+                    "is_valid": False,
+                    "score": 0.0,
+                    "reason": "Invalid or insufficient options for choice question",
+                }
+
+        # Local pre-screen settles clear cases without an LLM call
+        if settings.QUIZ_PRESCREEN_ENABLED:
+            prescreen = prescreen_question(
+                question_data,
+                knowledge_point,
+                reject_below=settings.QUIZ_PRESCREEN_REJECT_THRESHOLD,
+                accept_above=settings.QUIZ_PRESCREEN_ACCEPT_THRESHOLD,
+            )
+            get_prescreen_stats().record(prescreen["decision"])
+            if prescreen["decision"] in (ACCEPT, REJECT):
+                return {
+                    "is_valid": prescreen["decision"] == ACCEPT,
+                    "score": prescreen["score"],
+                    "reason": prescreen["reason"],
+                }
+
+        return None
+
+    def _score_result(self, quality_score: float) -> Dict[str, Any]:
+        """Turn an AI quality score into a validation result.
+
+        Args:
+            quality_score: Quality score from 0.0 to 1.0
+
+        Returns:
+            Validation result
+        """
+        is_valid = quality_score >= settings.QUIZ_QUALITY_THRESHOLD
+        return {
+            "is_valid": is_valid,
+            "score": quality_score,
+            "reason": "Quality validation passed" if is_valid else "Quality score below threshold",
+        }
+
     def _has_required_fields(self, question_data: Dict[str, Any]) -> bool:
         """Check if question has all required fields.
 
@@ -175,6 +287,7 @@ class QuizQualityValidator:
         question_data: Dict[str, Any],
         knowledge_point: str,
         expected_difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
     ) -> float:
         """Assess question quality using AI.
 
@@ -182,6 +295,7 @@ class QuizQualityValidator:
             question_data: Question to assess
             knowledge_point: Related knowledge point
             expected_difficulty: Expected difficulty
+            user_id: Quiz owner, for usage accounting
 
         Returns:
             Quality score from 0.0 to 1.0
@@ -193,14 +307,12 @@ class QuizQualityValidator:
                 prompt=prompt,
                 max_tokens=300,
                 temperature=0.3,
+                feature="quality",
+                user_id=user_id,
+                json_mode=True,
             )
 
-            # Parse JSON response
-            json_match = re.search(r"\{[^{}]*\}", response, re.DOTALL)
-            if json_match:
-                assessment = json.loads(json_match.group(0))
-            else:
-                assessment = json.loads(response)
+            assessment = parse_json_object(response)
 
             return assessment.get("quality_score", 0.5)
 
@@ -209,6 +321,52 @@ class QuizQualityValidator:
             # Return conservative score on error
             return 0.5
 
+    async def _assess_quality_batch_with_ai(
+        self,
+        questions: List[Tuple[Dict[str, Any], str]],
+        expected_difficulty: str,
+        user_id: Optional[uuid.UUID] = None,
+    ) -> List[float]:
+        """Assess the quality of several questions in one AI call.
+
+        Args:
+            questions: (question data, knowledge point text) pairs
+            expected_difficulty: Expected difficulty
+            user_id: Quiz owner, for usage accounting
+
+        Returns:
+            Quality scores from 0.0 to 1.0, in input order
+        """
+        # Conservative score for questions the response leaves out
+        scores = [0.5] * len(questions)
+        prompt = self._get_batch_quality_prompt(questions, expected_difficulty)
+
+        try:
+            response = await self.deepseek.generate_completion(
+                prompt=prompt,
+                max_tokens=100 + 40 * len(questions),
+                temperature=0.3,
+                feature="quality",
+                user_id=user_id,
+                json_mode=True,
+            )
+
+            assessment = parse_json_object(response)
+
+            for item in assessment.get("scores", []):
+                try:
+                    position = int(item["id"]) - 1
+                    score = float(item["quality_score"])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                if 0 <= position < len(scores):
+                    scores[position] = score
+
+        except Exception as e:
+            logger.error(f"Failed to assess quality of {len(questions)} questions with AI: {e}")
+
+        return scores
+
     def _get_quality_prompt(
         self,
         question_data: Dict[str, Any],
@@ -257,6 +415,52 @@ Output MUST be valid JSON only:
 
 Assess the question now:"""
 
+    def _get_batch_quality_prompt(
+        self,
+        questions: List[Tuple[Dict[str, Any], str]],
+        expected_difficulty: str,
+    ) -> str:
+        """Generate prompt for assessing several questions at once.
+
+        Args:
+            questions: (question data, knowledge point text) pairs
+            expected_difficulty: Expected difficulty
+
+        Returns:
+            Formatted prompt
+        """
+        entries = "\n\n".join(
+            f"""Question {position}
+Knowledge Point: {knowledge_point}
+Question Type: {question_data.get("question_type", "choice")}
+Question: {question_data.get("question_text", "")}
+Correct Answer: {question_data.get("correct_answer", "")}"""
+            for position, (question_data, knowledge_point) in enumerate(questions, start=1)
+        )
+
+        return f"""Assess the quality of these {len(questions)} quiz questions.
+
+Expected Difficulty: {expected_difficulty}
+
+{entries}
+
+Assessment Criteria:
+1. Relevance: Does the question test the knowledge point? (0-1)
+2. Clarity: Is the question clear and unambiguous? (0-1)
+3. Difficulty: Does it match the expected difficulty level? (0-1)
+4. Answer Quality: Is the answer correct and complete? (0-1)
+
+Calculate each question's overall quality score (average of criteria, 0.0 to 1.0).
+
+Output MUST be valid JSON only, with one entry per question number:
+{{
+  "scores": [
+    {{"id": 1, "quality_score": 0.85}}
+  ]
+}}
+
+Assess the questions now:"""
+
     async def detect_duplicates(
         self,
         new_question: str,
@@ -264,6 +468,9 @@ Assess the question now:"""
     ) -> List[Dict[str, Any]]:
         """Detect duplicate or similar questions.
 
+        Compares against every existing question; quiz generation keeps a
+        MinHashLSHIndex instead to check against a growing set.
+
         Args:
             new_question: New question text
             existing_questions: List of existing question texts
@@ -299,19 +506,8 @@ Assess the question now:"""
         Returns:
             Similarity score from 0.0 to 1.0
         """
-        # Simple word overlap similarity (can be enhanced with embeddings)
-        words1 = set(question1.lower().split())
-        words2 = set(question2.lower().split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
-
-        jaccard_similarity = len(intersection) / len(union) if union else 0.0
-
-        return jaccard_similarity
+        # Character n-grams also work for text without spaces, e.g. Chinese
+        return jaccard(shingles(question1), shingles(question2))
 
     async def close(self) -> None:
         """Close service connections."""
@@ -38,15 +38,19 @@ class VectorSearchService:
         # Initialize OpenAI client for embeddings
         self.openai_client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
 
-        # Collection name
+        # Collection names
         self.collection_name = "note_embeddings"
         self.collection = None
+        self.question_collection_name = "question_embeddings"
+        self.question_collection = None
 
     async def initialize(self) -> None:
-        """Initialize collection (call this on startup)."""
+        """Initialize collection (call this on startup). Repeated calls are no-ops."""
         if self.chroma_client is None:
             logger.warning("Cannot initialize ChromaDB: not available")
             return
+        if self.collection is not None:
+            return
 
         try:
             # Get or create collection
@@ -59,6 +63,22 @@ class VectorSearchService:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
 
+    def _get_question_collection(self) -> Optional[Any]:
+        """Get or create the question collection on first use.
+
+        Returns:
+            Collection, or None if ChromaDB is not available
+        """
+        if self.chroma_client is None:
+            return None
+        if self.question_collection is None:
+            self.question_collection = self.chroma_client.get_or_create_collection(
+                name=self.question_collection_name,
+                metadata={"hnsw:space": "cosine"},
+            )
+            logger.info(f"Initialized ChromaDB collection: {self.question_collection_name}")
+        return self.question_collection
+
     async def index_note(
         self,
         note_id: str,
@@ -201,6 +221,91 @@ class VectorSearchService:
         logger.info(f"Found {len(results)} relevant snippets for wrong answer")
         return results
 
+    async def index_questions(self, questions: List[Dict[str, Any]]) -> int:
+        """Index quiz questions for semantic duplicate detection.
+
+        Re-indexing a question replaces its entry.
+
+        Args:
+            questions: Dicts with id, text, user_id and quiz_id
+
+        Returns:
+            Number of questions indexed
+        """
+        collection = self._get_question_collection()
+        if collection is None or not questions:
+            return 0
+
+        embeddings = await self._generate_embeddings([question["text"] for question in questions])
+        collection.upsert(
+            ids=[str(question["id"]) for question in questions],
+            embeddings=embeddings,
+            documents=[question["text"] for question in questions],
+            metadatas=[
+                {"user_id": str(question["user_id"]), "quiz_id": str(question["quiz_id"])}
+                for question in questions
+            ],
+        )
+        logger.debug(f"Indexed {len(questions)} questions")
+        return len(questions)
+
+    async def find_similar_questions(
+        self,
+        texts: List[str],
+        user_id: str,
+        threshold: float,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Find the most similar earlier question of a user for each text.
+
+        All texts are embedded in one request and queried together.
+
+        Args:
+            texts: Question texts to check
+            user_id: Owner of the question history
+            threshold: Minimum cosine similarity of a match
+
+        Returns:
+            Best match (content, metadata, similarity) or None, per text
+        """
+        collection = self._get_question_collection()
+        if collection is None or not texts:
+            return [None] * len(texts)
+
+        embeddings = await self._generate_embeddings(texts)
+        results = collection.query(
+            query_embeddings=embeddings,
+            n_results=1,
+            where={"user_id": str(user_id)},
+        )
+
+        matches: List[Optional[Dict[str, Any]]] = []
+        for i in range(len(texts)):
+            ids = results["ids"][i] if results["ids"] else []
+            if not ids:
+                matches.append(None)
+                continue
+            similarity = 1 - results["distances"][i][0]  # Convert cosine distance to similarity
+            if similarity < threshold:
+                matches.append(None)
+                continue
+            matches.append({
+                "content": results["documents"][i][0],
+                "metadata": results["metadatas"][i][0],
+                "similarity": similarity,
+            })
+        return matches
+
+    async def delete_quiz_questions(self, quiz_id: str) -> None:
+        """Delete a quiz's questions from the question index.
+
+        Args:
+            quiz_id: Quiz ID
+        """
+        collection = self._get_question_collection()
+        if collection is None:
+            return
+        collection.delete(where={"quiz_id": str(quiz_id)})
+
     async def delete_note(self, note_id: str) -> None:
         """Delete note from index.
 
@@ -243,6 +348,26 @@ class VectorSearchService:
             logger.error(f"Failed to generate embedding: {e}")
             raise
 
+    async def _generate_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for several texts in one request.
+
+        Args:
+            texts: Input texts
+
+        Returns:
+            Embedding vectors, in input order
+        """
+        try:
+            response = await self.openai_client.embeddings.create(
+                model=settings.EMBEDDING_MODEL,
+                input=texts,
+            )
+            return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+        except Exception as e:
+            logger.error(f"Failed to generate {len(texts)} embeddings: {e}")
+            raise
+
     def _chunk_text(
         self,
         text: str,
@@ -285,3 +410,27 @@ class VectorSearchService:
     async def close(self) -> None:
         """Close service connections."""
         await self.openai_client.close()
+
+
+# Global vector search service
+_vector_search_service: Optional[VectorSearchService] = None
+
+
+def get_vector_search_service() -> VectorSearchService:
+    """Get or create global vector search service.
+
+    Returns:
+        VectorSearchService instance
+    """
+    global _vector_search_service
+    if _vector_search_service is None:
+        _vector_search_service = VectorSearchService()
+    return _vector_search_service
+
+
+async def close_vector_search_service() -> None:
+    """Close global vector search service. Should be called on application shutdown."""
+    global _vector_search_service
+    if _vector_search_service is not None:
+        await _vector_search_service.close()
+        _vector_search_service = None
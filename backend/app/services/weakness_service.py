@@ -0,0 +1,154 @@
+"""Per-user weakness estimates over the knowledge points of a mindmap."""
+
+import uuid
+from typing import Dict, Iterable, List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.mindmap import KnowledgePoint
+from app.models.mistake import Mistake
+from app.models.quiz import Quiz, QuizAnswer, QuizQuestion
+from app.services.quiz_grading_service import PENDING
+
+settings = get_settings()
+
+# Weakness of a knowledge point the user has no history on
+UNKNOWN_WEAKNESS = 0.5
+
+# Stored forms of a correct QuizAnswer.is_correct
+_CORRECT_VALUES = ("true", "True", "1")
+
+_DIFFICULTIES = ["easy", "medium", "hard"]
+
+
+class WeaknessService:
+    """Estimate how weak a user is on each knowledge point.
+
+    Weakness is the smoothed share of wrong answers on questions about the
+    point: (wrong + 1) / (answered + 2). Each unarchived mistake on such a
+    question counts as one more answer, wrong to the degree it is not yet
+    mastered. Both inputs are aggregated in the database with one grouped
+    query each, over the user's quizzes on the mindmap.
+    """
+
+    def __init__(self, db: AsyncSession) -> None:
+        """Initialize weakness service.
+
+        Args:
+            db: Database session
+        """
+        self.db = db
+
+    async def get_weakness_vector(
+        self,
+        user_id: uuid.UUID,
+        mindmap_id: uuid.UUID,
+    ) -> Dict[uuid.UUID, float]:
+        """Compute the user's weakness on the mindmap's knowledge points.
+
+        Args:
+            user_id: User ID
+            mindmap_id: Mindmap ID
+
+        Returns:
+            Weakness from 0.0 to 1.0 by knowledge point ID, for points with
+            any answer or mistake history
+        """
+        answers = await self.db.execute(
+            select(
+                QuizQuestion.knowledge_point_id,
+                func.count(QuizAnswer.id).label("answered"),
+                func.sum(case((QuizAnswer.is_correct.in_(_CORRECT_VALUES), 0), else_=1)).label("wrong"),
+            )
+            .join(QuizQuestion, QuizQuestion.id == QuizAnswer.question_id)
+            .join(Quiz, Quiz.id == QuizQuestion.quiz_id)
+            .where(
+                Quiz.user_id == user_id,
+                Quiz.mindmap_id == mindmap_id,
+                QuizQuestion.knowledge_point_id.is_not(None),
+                # Answers still being graded are not evidence yet
+                QuizAnswer.is_correct != PENDING,
+            )
+            .group_by(QuizQuestion.knowledge_point_id)
+        )
+        evidence: Dict[uuid.UUID, List[float]] = {
+            row.knowledge_point_id: [float(row.answered), float(row.wrong or 0)]
+            for row in answers.all()
+        }
+
+        mistakes = await self.db.execute(
+            select(
+                QuizQuestion.knowledge_point_id,
+                func.count(Mistake.id).label("open_mistakes"),
+                func.avg(Mistake.mastery_level).label("mastery"),
+            )
+            .join(QuizQuestion, QuizQuestion.id == Mistake.question_id)
+            .join(Quiz, Quiz.id == QuizQuestion.quiz_id)
+            .where(
+                Mistake.user_id == user_id,
+                Mistake.is_archived.is_(False),
+                Quiz.mindmap_id == mindmap_id,
+                QuizQuestion.knowledge_point_id.is_not(None),
+            )
+            .group_by(QuizQuestion.knowledge_point_id)
+        )
+        for row in mistakes.all():
+            counts = evidence.setdefault(row.knowledge_point_id, [0.0, 0.0])
+            unmastered = 1 - float(row.mastery or 0) / 100
+            counts[0] += row.open_mistakes
+            counts[1] += row.open_mistakes * unmastered
+
+        return {
+            kp_id: (wrong + 1) / (answered + 2)
+            for kp_id, (answered, wrong) in evidence.items()
+        }
+
+
+def selection_weights(
+    knowledge_points: Iterable[KnowledgePoint],
+    weakness: Dict[uuid.UUID, float],
+) -> Dict[uuid.UUID, float]:
+    """Turn weakness estimates into knowledge point sampling weights.
+
+    Args:
+        knowledge_points: Candidate knowledge points
+        weakness: Weakness by knowledge point ID
+
+    Returns:
+        Sampling weight by knowledge point ID
+    """
+    return {
+        kp.id: 1 + settings.QUIZ_ADAPTIVE_WEAKNESS_WEIGHT * weakness.get(kp.id, UNKNOWN_WEAKNESS)
+        for kp in knowledge_points
+    }
+
+
+def adapt_difficulty(
+    difficulty: str,
+    knowledge_points: Iterable[KnowledgePoint],
+    weakness: Dict[uuid.UUID, float],
+) -> str:
+    """Shift the requested difficulty by the user's weakness on the selected points.
+
+    Args:
+        difficulty: Requested difficulty
+        knowledge_points: Selected knowledge points
+        weakness: Weakness by knowledge point ID
+
+    Returns:
+        One level easier for weak areas, one level harder for strong ones,
+        otherwise the requested difficulty
+    """
+    values = [weakness.get(kp.id, UNKNOWN_WEAKNESS) for kp in knowledge_points]
+    if not values:
+        return difficulty
+
+    mean = sum(values) / len(values)
+    level = _DIFFICULTIES.index(difficulty)
+    if mean > settings.QUIZ_ADAPTIVE_EASIER_ABOVE:
+        level = max(0, level - 1)
+    elif mean < settings.QUIZ_ADAPTIVE_HARDER_BELOW:
+        level = min(len(_DIFFICULTIES) - 1, level + 1)
+    return _DIFFICULTIES[level]
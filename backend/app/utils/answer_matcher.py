@@ -0,0 +1,303 @@
+"""Fill-in-the-blank answer matching.
+
+Answers are NFKC-normalized, case-folded and split into words, numbers and
+operator symbols; other punctuation is dropped. Numbers keep their sign and
+are compared by value, so "0.50" and "1/2" are the same answer but "-5" and
+"5" are not. Common synonyms are mapped to one canonical form.
+
+An answer matches its key when the normalized forms are equal. Otherwise
+its numbers, operators and leading negation (非, 不, not, ...) must agree
+with the key's, and it then matches when it is within a few edits of the
+key (typos) or similar enough: by shared words for space-separated
+languages and by shared character bigrams for Chinese and other unsegmented
+text, where whitespace tokenization finds no words. Keys containing digits
+get neither typo nor bigram tolerance.
+
+Answer keys are compiled once per distinct correct answer and cached, so
+grading a submission only normalizes the user answers.
+"""
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import lru_cache
+from typing import Counter as CounterType, Dict, FrozenSet, List, Tuple
+
+# Minimum Dice similarity of content words (space-separated answers)
+TOKEN_MATCH_THRESHOLD = 0.5
+
+# Minimum Dice similarity of character bigrams (unsegmented answers)
+CHAR_MATCH_THRESHOLD = 0.7
+
+_STOPWORDS = frozenset({"the", "a", "an", "is", "are", "was", "were", "of", "in", "on", "at", "to"})
+
+# Equivalent answers; the first entry of each group is the canonical form
+_SYNONYM_GROUPS: Tuple[Tuple[str, ...], ...] = (
+    ("0", "zero", "零"),
+    ("1", "one", "一"),
+    ("2", "two", "二", "两"),
+    ("3", "three", "三"),
+    ("4", "four", "四"),
+    ("5", "five", "五"),
+    ("6", "six", "六"),
+    ("7", "seven", "七"),
+    ("8", "eight", "八"),
+    ("9", "nine", "九"),
+    ("10", "ten", "十"),
+    ("true", "yes", "对", "正确", "是"),
+    ("false", "no", "错", "错误", "否"),
+    ("and", "&"),
+    ("co2", "carbon dioxide", "二氧化碳"),
+    ("h2o", "water", "水"),
+    ("o2", "oxygen", "氧气"),
+    ("dna", "deoxyribonucleic acid", "脱氧核糖核酸"),
+    ("rna", "ribonucleic acid", "核糖核酸"),
+    ("atp", "adenosine triphosphate", "三磷酸腺苷"),
+    ("usa", "us", "united states", "united states of america", "美国"),
+    ("uk", "united kingdom", "britain", "英国"),
+    ("prc", "china", "中国"),
+)
+
+# Synonyms that apply to a whole answer
+_SYNONYMS: Dict[str, str] = {
+    variant: group[0] for group in _SYNONYM_GROUPS for variant in group
+}
+
+# Synonyms also replaced inside longer answers: number words and "&". Others,
+# such as "us", only replace a whole answer.
+_WORD_SYNONYMS: Dict[str, str] = {
+    variant: group[0]
+    for group in _SYNONYM_GROUPS
+    if group[0].isdigit() or group[0] == "and"
+    for variant in group
+}
+
+# Separators between alternative accepted answers in one key
+_ALTERNATIVES_PATTERN = re.compile(r"[|;；]")
+
+# Signed decimals and fractions not followed by a letter, words, operators
+_TOKEN_PATTERN = re.compile(
+    r"(?P<number>[-+]?\d+(?:\.\d+)?(?:/\d+)?)(?![^\W_])"
+    r"|(?P<word>[^\W_]+)"
+    r"|(?P<symbol>[+*/^=<>%&])"
+)
+
+# Thousands separators inside numbers
+_THOUSANDS_PATTERN = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+
+_CJK_PATTERN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af]")
+
+# Negations that turn an answer into its opposite
+_NEGATION_WORDS = frozenset({"not", "non", "no", "never", "without"})
+_NEGATION_PREFIXES = ("非", "不", "无", "未", "没")
+
+
+@dataclass(frozen=True)
+class CompiledAnswer:
+    """Normalized form of an answer with its precomputed features."""
+
+    text: str
+    compact: str
+    tokens: FrozenSet[str]
+    bigrams: CounterType[str]
+    symbols: Tuple[str, ...]
+    negated: bool
+    has_digits: bool
+    max_edits: int
+
+
+def _canonical_number(token: str) -> str:
+    """Write a number by value, so equal numbers compare equal."""
+    try:
+        value = Fraction(token)
+    except (ValueError, ZeroDivisionError):
+        return token
+    if value.denominator == 1:
+        return str(value.numerator)
+    return f"{value.numerator}/{value.denominator}"
+
+
+def _tokenize(text: str) -> List[str]:
+    """Split normalized text into words, canonical numbers and symbols."""
+    tokens = []
+    text = _THOUSANDS_PATTERN.sub("", text).replace("\u2044", "/")
+    for match in _TOKEN_PATTERN.finditer(text):
+        if match.lastgroup == "number":
+            tokens.append(_canonical_number(match.group()))
+        else:
+            token = match.group()
+            tokens.append(_WORD_SYNONYMS.get(token, token))
+    return tokens
+
+
+def normalize(text: str) -> str:
+    """Normalize an answer for comparison.
+
+    Args:
+        text: Raw answer
+
+    Returns:
+        NFKC-normalized, case-folded words, numbers and operators separated
+        by single spaces, with punctuation removed and synonyms replaced by
+        their canonical form
+    """
+    normalized = " ".join(_tokenize(unicodedata.normalize("NFKC", str(text)).casefold()))
+    return _SYNONYMS.get(normalized, normalized)
+
+
+def _is_number(token: str) -> bool:
+    """Check whether a token is a canonical number."""
+    return token.lstrip("+-").replace("/", "", 1).isdigit()
+
+
+def _allowed_edits(compact: str, has_digits: bool) -> int:
+    """Typos tolerated in an answer of this length.
+
+    Characters of unsegmented scripts carry a whole word each, so they get
+    fewer edits per character. Answers with digits get none: one changed
+    digit is a different answer.
+    """
+    if has_digits:
+        return 0
+    if _CJK_PATTERN.search(compact):
+        return len(compact) // 4
+    if len(compact) <= 4:
+        return 0
+    return 1 if len(compact) <= 8 else 2
+
+
+def _is_negated(words: List[str], compact: str) -> bool:
+    """Check whether an answer starts with a negation."""
+    if len(words) > 1 and words[0] in _NEGATION_WORDS:
+        return True
+    return compact.startswith(_NEGATION_PREFIXES)
+
+
+def _compile(text: str) -> CompiledAnswer:
+    """Compute the matching features of a normalized answer."""
+    compact = text.replace(" ", "")
+    parts = text.split()
+    words = [part for part in parts if part.isalnum() and not _is_number(part)]
+    symbols = tuple(part for part in parts if part not in words)
+    tokens = frozenset(word for word in words if word not in _STOPWORDS) or frozenset(words)
+    bigrams = Counter(compact[i:i + 2] for i in range(len(compact) - 1)) or Counter([compact])
+    has_digits = any(char.isdigit() for char in compact)
+    return CompiledAnswer(
+        text,
+        compact,
+        tokens,
+        bigrams,
+        symbols,
+        _is_negated(words, compact),
+        has_digits,
+        _allowed_edits(compact, has_digits),
+    )
+
+
+@lru_cache(maxsize=4096)
+def compile_answer_key(correct_answer: str) -> Tuple[CompiledAnswer, ...]:
+    """Compile the accepted answers of a key.
+
+    Alternatives may be separated by "|" or ";". Results are cached per
+    distinct key.
+
+    Args:
+        correct_answer: Correct answer as stored on the question
+
+    Returns:
+        Compiled accepted answers
+    """
+    alternatives = [normalize(part) for part in _ALTERNATIVES_PATTERN.split(correct_answer)]
+    return tuple(_compile(text) for text in dict.fromkeys(alternatives) if text)
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> int:
+    """Levenshtein distance that stops once it exceeds max_distance.
+
+    Args:
+        a: First string
+        b: Second string
+        max_distance: Largest distance of interest
+
+    Returns:
+        The distance, or max_distance + 1 if it is larger
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+
+    # A shared prefix and suffix add nothing to the distance
+    prefix = 0
+    while prefix < len(a) and prefix < len(b) and a[prefix] == b[prefix]:
+        prefix += 1
+    a, b = a[prefix:], b[prefix:]
+    while a and b and a[-1] == b[-1]:
+        a, b = a[:-1], b[:-1]
+
+    if len(a) > len(b):
+        a, b = b, a
+
+    previous = list(range(len(a) + 1))
+    for i, char_b in enumerate(b, 1):
+        current = [i]
+        for j, char_a in enumerate(a, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            ))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return min(previous[-1], max_distance + 1)
+
+
+def _dice(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    """Dice coefficient of two sets."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+def _bigram_dice(a: CounterType[str], b: CounterType[str]) -> float:
+    """Dice coefficient of two bigram multisets, so repeats count."""
+    total = sum(a.values()) + sum(b.values())
+    if not total:
+        return 0.0
+    return 2 * sum((a & b).values()) / total
+
+
+def _matches(answer: CompiledAnswer, key: CompiledAnswer) -> bool:
+    """Check one compiled answer against one accepted answer."""
+    if answer.compact == key.compact:
+        return True
+    # Numbers, operators and negation are never fuzzy
+    if answer.symbols != key.symbols or answer.negated != key.negated:
+        return False
+    # Set similarities are cheap; edit distance only runs when they fail
+    if len(key.tokens) > 1 or len(answer.tokens) > 1:
+        if _dice(answer.tokens, key.tokens) >= TOKEN_MATCH_THRESHOLD:
+            return True
+    if not key.has_digits and _bigram_dice(answer.bigrams, key.bigrams) >= CHAR_MATCH_THRESHOLD:
+        return True
+    return bool(key.max_edits) and (
+        bounded_edit_distance(answer.compact, key.compact, key.max_edits) <= key.max_edits
+    )
+
+
+def match_answer(user_answer: str, correct_answer: str) -> bool:
+    """Check a fill-in-the-blank answer against its key.
+
+    Args:
+        user_answer: User's answer
+        correct_answer: Correct answer, optionally with "|" or ";" separated alternatives
+
+    Returns:
+        True if the answer matches any accepted answer
+    """
+    text = normalize(user_answer)
+    if not text:
+        return False
+    answer = _compile(text)
+    return any(_matches(answer, key) for key in compile_answer_key(correct_answer))
@@ -0,0 +1,112 @@
+"""JSON extraction from LLM responses.
+
+LLM replies may wrap the JSON payload in prose or markdown code fences. The
+extractor scans the text once, tracking open braces outside of string
+literals, and records every balanced ``{...}`` candidate in that pass; the
+candidates are then parsed in order of their opening brace. Nested objects
+and braces inside strings are handled, unlike the ``\\{[^{}]*\\}`` regexes
+it replaces, and a stray brace in prose costs nothing extra.
+"""
+
+import json
+import re
+from typing import Any, Dict, List, Tuple
+
+# Characters that change the scan state; escapes are consumed in pairs
+_STRUCTURE_PATTERN = re.compile(r'\\.|[{}"]', re.DOTALL)
+
+
+def _balanced_spans(text: str) -> List[Tuple[int, int]]:
+    """Find the spans of brace-balanced objects in one pass.
+
+    Args:
+        text: Text to scan
+
+    Returns:
+        (start, end) slice bounds of each balanced candidate, in order of
+        their opening brace
+    """
+    spans: List[Tuple[int, int]] = []
+    opened: List[int] = []
+    in_string = False
+
+    for match in _STRUCTURE_PATTERN.finditer(text):
+        char = match.group()
+        if in_string:
+            if char == '"':
+                in_string = False
+        elif char == '"':
+            # Quotes in prose outside any object do not start a string
+            in_string = bool(opened)
+        elif char == "{":
+            opened.append(match.start())
+        elif char == "}" and opened:
+            spans.append((opened.pop(), match.end()))
+
+    # Inner objects close first; callers want outer candidates first
+    spans.sort()
+    return spans
+
+
+def _find_json(text: str) -> Tuple[str, Dict[str, Any]]:
+    """Find and parse the first JSON object in text.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        Tuple of (JSON string, parsed object)
+
+    Raises:
+        ValueError: If no valid JSON object is found
+    """
+    stripped = text.strip()
+    if stripped.startswith("{") and stripped.endswith("}"):
+        # JSON mode responses are a bare object
+        try:
+            return stripped, json.loads(stripped)
+        except json.JSONDecodeError:
+            pass
+
+    # Objects nested in a malformed object are fragments of it, not the payload
+    invalid_until = 0
+    for begin, end in _balanced_spans(text):
+        if begin < invalid_until:
+            continue
+        candidate = text[begin:end]
+        try:
+            return candidate, json.loads(candidate)
+        except json.JSONDecodeError:
+            invalid_until = end
+
+    raise ValueError("No valid JSON found in response")
+
+
+def extract_json(text: str) -> str:
+    """Extract the first JSON object from an LLM response.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        JSON object string
+
+    Raises:
+        ValueError: If no valid JSON object is found
+    """
+    return _find_json(text)[0]
+
+
+def parse_json_object(text: str) -> Dict[str, Any]:
+    """Parse the first JSON object from an LLM response.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        Parsed object
+
+    Raises:
+        ValueError: If no valid JSON object is found
+    """
+    return _find_json(text)[1]
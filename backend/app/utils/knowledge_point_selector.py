@@ -0,0 +1,117 @@
+"""Stratified random selection of knowledge points for quizzes.
+
+Knowledge points are grouped by mindmap level in one pass. Each level gets an
+equal share of the questions, deeper levels taking the remainder, and levels
+with too few points pass their unused share on to the deepest levels that
+still have points. Within a level, points are sampled at random, optionally
+weighted (e.g. toward points the user gets wrong), so repeated quizzes on one
+mindmap cover different points. A seed makes a selection reproducible.
+"""
+
+import heapq
+import math
+import random
+from collections import defaultdict
+from typing import Any, Dict, Hashable, List, Mapping, Optional, Sequence
+
+# Weight used for non-positive weights, so such points are picked last
+_MIN_WEIGHT = 1e-6
+
+
+def _level_quotas(level_sizes: Dict[int, int], count: int) -> Dict[int, int]:
+    """Split a question count across levels.
+
+    Args:
+        level_sizes: Number of points per level
+        count: Number of points to select, at most the total size
+
+    Returns:
+        Number of points to select per level
+    """
+    levels = sorted(level_sizes, reverse=True)
+    base, extra = divmod(count, len(levels))
+    quotas = {
+        level: min(base + (1 if position < extra else 0), level_sizes[level])
+        for position, level in enumerate(levels)
+    }
+
+    # Levels that ran short leave a gap, filled from the deepest levels
+    shortfall = count - sum(quotas.values())
+    for level in levels:
+        if shortfall <= 0:
+            break
+        take = min(shortfall, level_sizes[level] - quotas[level])
+        quotas[level] += take
+        shortfall -= take
+    return quotas
+
+
+def _weighted_sample(
+    points: List[Any],
+    k: int,
+    weights: Mapping[Hashable, float],
+    rng: random.Random,
+) -> List[Any]:
+    """Sample points without replacement with probability proportional to weight.
+
+    Uses the Efraimidis-Spirakis keys log(u) / w and keeps the k largest.
+
+    Args:
+        points: Points to sample from
+        k: Sample size
+        weights: Weight by point ID; missing points weigh 1.0
+        rng: Random generator
+
+    Returns:
+        Sampled points, highest key first
+    """
+    random_value = rng.random
+    log = math.log
+    keyed = (
+        (log(1.0 - random_value()) / max(weights.get(point.id, 1.0), _MIN_WEIGHT), position)
+        for position, point in enumerate(points)
+    )
+    return [points[position] for _, position in heapq.nlargest(k, keyed)]
+
+
+def select_knowledge_points(
+    knowledge_points: Sequence[Any],
+    count: int,
+    weights: Optional[Mapping[Hashable, float]] = None,
+    seed: Optional[int] = None,
+) -> List[Any]:
+    """Select knowledge points stratified by level.
+
+    Args:
+        knowledge_points: Points with ``id`` and ``level`` attributes
+        count: Number of points to select
+        weights: Sampling weight by point ID; uniform if omitted
+        seed: Seed for a reproducible selection
+
+    Returns:
+        Selected points, deepest level first
+    """
+    if count <= 0:
+        return []
+
+    groups: Dict[int, List[Any]] = defaultdict(list)
+    for point in knowledge_points:
+        groups[point.level].append(point)
+
+    levels = sorted(groups, reverse=True)
+    if len(knowledge_points) <= count:
+        return [point for level in levels for point in groups[level]]
+
+    rng = random.Random(seed)
+    quotas = _level_quotas({level: len(groups[level]) for level in levels}, count)
+
+    selected: List[Any] = []
+    for level in levels:
+        quota = quotas[level]
+        if not quota:
+            continue
+        if weights:
+            selected.extend(_weighted_sample(groups[level], quota, weights, rng))
+        else:
+            selected.extend(rng.sample(groups[level], quota))
+    return selected
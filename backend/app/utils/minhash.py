@@ -0,0 +1,178 @@
+"""Character n-gram MinHash/LSH index for near-duplicate question detection.
+
+Texts are compared by the Jaccard similarity of their character n-grams
+(shingles), which works for Chinese and other unsegmented text where
+whitespace tokenization finds no words. Each text is hashed once into a
+MinHash signature; locality-sensitive hashing over bands of the signature
+finds candidate duplicates with dictionary lookups, and only those
+candidates are verified with an exact shingle Jaccard. Checking a question
+against an index of any size therefore costs about the same.
+"""
+
+import hashlib
+import random
+import re
+from collections import defaultdict
+from typing import Dict, FrozenSet, Hashable, List, Set, Tuple
+
+# Mersenne prime modulus for the permutation hashes
+_PRIME = (1 << 61) - 1
+
+_NON_WORD_PATTERN = re.compile(r"[\W_]+")
+
+
+def shingles(text: str, n: int = 3) -> FrozenSet[str]:
+    """Get the character n-grams of a text.
+
+    Case, punctuation and runs of whitespace are normalized away first.
+
+    Args:
+        text: Text to shingle
+        n: Characters per shingle
+
+    Returns:
+        Set of shingles; texts shorter than n yield themselves
+    """
+    normalized = _NON_WORD_PATTERN.sub(" ", str(text or "").lower()).strip()
+    if len(normalized) <= n:
+        return frozenset([normalized]) if normalized else frozenset()
+    return frozenset(normalized[i:i + n] for i in range(len(normalized) - n + 1))
+
+
+def jaccard(shingles1: FrozenSet[str], shingles2: FrozenSet[str]) -> float:
+    """Jaccard similarity of two shingle sets.
+
+    Args:
+        shingles1: First shingle set
+        shingles2: Second shingle set
+
+    Returns:
+        Similarity from 0.0 to 1.0
+    """
+    if not shingles1 or not shingles2:
+        return 0.0
+    return len(shingles1 & shingles2) / len(shingles1 | shingles2)
+
+
+class MinHasher:
+    """Compute MinHash signatures with a fixed family of permutations."""
+
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        """Initialize hasher.
+
+        Args:
+            num_perm: Signature length
+            seed: Seed for the permutation parameters
+        """
+        self.num_perm = num_perm
+        rng = random.Random(seed)
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, shingle_set: FrozenSet[str]) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a shingle set.
+
+        Args:
+            shingle_set: Shingles of a text
+
+        Returns:
+            Signature of num_perm values
+        """
+        if not shingle_set:
+            return (_PRIME,) * self.num_perm
+
+        hashes = [
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+            for shingle in shingle_set
+        ]
+        return tuple(
+            min((a * value + b) % _PRIME for value in hashes)
+            for a, b in self._params
+        )
+
+
+class MinHashLSHIndex:
+    """Incremental near-duplicate index over texts.
+
+    With the default 16 bands of 4 rows, pairs at the default 0.85 shingle
+    Jaccard become candidates with probability above 0.9999.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 3,
+        seed: int = 1,
+    ) -> None:
+        """Initialize index.
+
+        Args:
+            threshold: Shingle Jaccard at or above which texts are duplicates
+            num_perm: MinHash signature length
+            bands: LSH bands; num_perm must be divisible by it
+            ngram: Characters per shingle
+            seed: Seed for the MinHash permutations
+
+        Raises:
+            ValueError: If num_perm is not divisible by bands
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self._hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self._buckets: List[Dict[Tuple[int, ...], Set[Hashable]]] = [
+            defaultdict(set) for _ in range(bands)
+        ]
+        self._shingles: Dict[Hashable, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        """Number of indexed texts."""
+        return len(self._shingles)
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, ...]]:
+        """Split a signature into band keys."""
+        return [
+            signature[band * self.rows:(band + 1) * self.rows]
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: Hashable, text: str) -> None:
+        """Index a text.
+
+        Args:
+            key: Identifier returned by queries
+            text: Text to index
+        """
+        shingle_set = shingles(text, self.ngram)
+        self._shingles[key] = shingle_set
+        for buckets, band_key in zip(self._buckets, self._band_keys(self._hasher.signature(shingle_set))):
+            buckets[band_key].add(key)
+
+    def query(self, text: str) -> List[Tuple[Hashable, float]]:
+        """Find indexed near-duplicates of a text.
+
+        Args:
+            text: Text to check
+
+        Returns:
+            (key, similarity) of duplicates, most similar first
+        """
+        shingle_set = shingles(text, self.ngram)
+        candidates: Set[Hashable] = set()
+        for buckets, band_key in zip(self._buckets, self._band_keys(self._hasher.signature(shingle_set))):
+            candidates |= buckets.get(band_key, set())
+
+        matches = []
+        for key in candidates:
+            similarity = jaccard(shingle_set, self._shingles[key])
+            if similarity >= self.threshold:
+                matches.append((key, similarity))
+        matches.sort(key=lambda match: match[1], reverse=True)
+        return matches
@@ -0,0 +1,62 @@
+"""Prompt injection sanitization for user-supplied text.
+
+All injection patterns are folded into one precompiled alternation so that
+a text is scanned in a single pass, instead of once per pattern. Most notes
+contain none of the trigger words, so a substring prefilter skips the regex
+entirely for them.
+"""
+
+import re
+
+REDACTED = "[REDACTED]"
+
+# Limit length to prevent DoS
+MAX_PROMPT_INPUT_LENGTH = 10000
+
+# The lookahead on the possible first characters lets the scanner skip
+# positions cheaply instead of trying every branch at every character.
+_INJECTION_PATTERN = re.compile(
+    r"(?=[idfosa\[<#])(?:"
+    r"(?:ignore|disregard|forget|override)\s+(?:all\s+)?(?:previous|above|the)\s+instructions"
+    r"|(?:system|assistant)\s*:"
+    r"|\[/?INST\]"
+    r"|<<.*?>>"
+    r"|###\s*(?:Instruction|Response|System|Assistant)"
+    r")",
+    re.IGNORECASE,
+)
+
+# Every match contains one of these once lowercased
+_TRIGGERS = ("instructions", "system", "assistant", "inst]", "<<", "###")
+
+# Non-ASCII characters that IGNORECASE matches against ASCII letters but
+# str.lower() does not map to them; their presence disables the prefilter
+_CASE_FOLD_CONFUSABLES = ("İ", "ı", "ſ")
+
+
+def _may_contain_injection(text: str) -> bool:
+    """Cheap check whether the injection pattern can match at all."""
+    if any(char in text for char in _CASE_FOLD_CONFUSABLES):
+        return True
+    lowered = text.lower()
+    return any(trigger in lowered for trigger in _TRIGGERS)
+
+
+def sanitize_for_prompt(text: str, max_length: int = MAX_PROMPT_INPUT_LENGTH) -> str:
+    """Sanitize user input to prevent prompt injection.
+
+    Args:
+        text: User input text
+        max_length: Maximum length of the returned text, excluding the ellipsis
+
+    Returns:
+        Sanitized text
+    """
+    sanitized = text
+    if _may_contain_injection(text):
+        sanitized = _INJECTION_PATTERN.sub(REDACTED, text)
+
+    if len(sanitized) > max_length:
+        sanitized = sanitized[:max_length] + "..."
+
+    return sanitized
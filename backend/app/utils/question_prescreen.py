@@ -0,0 +1,243 @@
+"""Local quality pre-screen for generated quiz questions.
+
+Scores a question from lexical features before the AI quality assessment:
+length, answer leakage into the question, distinctness of choice options and
+overlap with the knowledge point's terms. The features are combined by a
+small logistic model with hand-set weights. Clear failures are rejected and
+clearly good choice questions accepted locally, so only borderline questions
+cost an LLM call. Questions without options always reach the AI assessor
+unless rejected, since only it can judge a free-text answer.
+"""
+
+import math
+import re
+import threading
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Set
+
+ACCEPT = "accept"
+REJECT = "reject"
+BORDERLINE = "borderline"
+
+_WORD_PATTERN = re.compile(r"\w+")
+_CJK_PATTERN = re.compile(r"[぀-ヿ㐀-䶿一-鿿가-힯]")
+_OPTION_LABEL_PATTERN = re.compile(r"^\s*\(?[A-Za-z][\.\):、]\s*")
+_ANSWER_LETTER_PATTERN = re.compile(r"^\(?([A-Za-z])[\.\)]?$")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how in is it its of on or "
+    "that the their this to was were what when where which who why will with".split()
+)
+
+# Logistic model weights over features in [0, 1]
+_BIAS = -4.0
+_WEIGHTS = {
+    "length": 1.5,
+    "no_leakage": 2.0,
+    "option_distinctness": 2.0,
+    "term_overlap": 2.5,
+}
+
+# Option distinctness of questions without options. Neutral, so a non-choice
+# question cannot score high enough to skip the AI check of its answer.
+_NEUTRAL_DISTINCTNESS = 0.5
+
+# Question length in tokens that scores full marks
+_MIN_TOKENS = 6
+_MAX_TOKENS = 80
+
+
+def _tokens(text: str) -> List[str]:
+    """Split text into lowercase content tokens.
+
+    Latin words are lightly stemmed; CJK runs, which have no spaces, become
+    character bigrams.
+    """
+    tokens = []
+    for word in _WORD_PATTERN.findall(str(text or "").lower()):
+        if _CJK_PATTERN.search(word):
+            tokens.extend(word[i:i + 2] for i in range(max(1, len(word) - 1)))
+        elif word not in _STOPWORDS:
+            tokens.append(word[:-1] if len(word) > 3 and word.endswith("s") else word)
+    return tokens
+
+
+def _strip_label(option: str) -> str:
+    """Remove an "A." style label from an option."""
+    return _OPTION_LABEL_PATTERN.sub("", str(option), count=1)
+
+
+def _resolve_answer(question_data: Dict[str, Any]) -> Optional[str]:
+    """Get the answer text, resolving choice letters to their option.
+
+    Returns:
+        Answer text, or None if a choice answer matches no option
+    """
+    answer = str(question_data.get("correct_answer", "")).strip()
+    options = question_data.get("options") or []
+    if not options:
+        return answer
+
+    letter = _ANSWER_LETTER_PATTERN.match(answer)
+    if letter:
+        index = ord(letter.group(1).upper()) - ord("A")
+        return _strip_label(options[index]) if 0 <= index < len(options) else None
+
+    normalized = _strip_label(answer).strip().lower()
+    for option in options:
+        if _strip_label(option).strip().lower() == normalized:
+            return _strip_label(option)
+    return None
+
+
+def _jaccard(tokens1: Set[str], tokens2: Set[str]) -> float:
+    """Jaccard similarity of two token sets."""
+    union = tokens1 | tokens2
+    return len(tokens1 & tokens2) / len(union) if union else 1.0
+
+
+def extract_features(question_data: Dict[str, Any], knowledge_point: str) -> Dict[str, Any]:
+    """Compute pre-screen features of a question.
+
+    Args:
+        question_data: Generated question data
+        knowledge_point: Knowledge point text
+
+    Returns:
+        Features in [0, 1] plus the hard failure reason, if any
+    """
+    question_text = str(question_data.get("question_text", ""))
+    question_tokens = _tokens(question_text)
+    question_set = set(question_tokens)
+    options = [_strip_label(option) for option in question_data.get("options") or []]
+
+    failure = None
+    answer = _resolve_answer(question_data)
+    if answer is None:
+        failure = "Correct answer does not match any option"
+        answer = ""
+
+    # Length
+    count = len(question_tokens)
+    if count < _MIN_TOKENS:
+        length = count / _MIN_TOKENS
+    elif count > _MAX_TOKENS:
+        length = max(0.0, 1 - (count - _MAX_TOKENS) / _MAX_TOKENS)
+    else:
+        length = 1.0
+
+    # Answer leakage: share of answer terms already stated in the question
+    answer_set = set(_tokens(answer))
+    leakage = len(answer_set & question_set) / len(answer_set) if answer_set else 0.0
+    normalized_answer = answer.strip().lower()
+    if (
+        failure is None
+        and answer_set
+        and len(normalized_answer) >= 3
+        and re.search(rf"(?<!\w){re.escape(normalized_answer)}(?!\w)", question_text.lower())
+    ):
+        failure = "Answer is given away in the question"
+
+    # Option distinctness: distance of the most similar pair
+    distinctness = 1.0 if options else _NEUTRAL_DISTINCTNESS
+    option_sets = [set(_tokens(option)) for option in options]
+    for tokens1, tokens2 in combinations(option_sets, 2):
+        distinctness = min(distinctness, 1 - _jaccard(tokens1, tokens2))
+    if failure is None and options and distinctness == 0.0:
+        failure = "Choice options are not distinct"
+
+    # Knowledge point term overlap
+    point_set = set(_tokens(knowledge_point))
+    covered = question_set | answer_set | set().union(*option_sets)
+    overlap = len(point_set & covered) / len(point_set) if point_set else 0.5
+
+    return {
+        "length": length,
+        "no_leakage": 1 - leakage,
+        "option_distinctness": distinctness,
+        "term_overlap": overlap,
+        "failure": failure,
+    }
+
+
+def prescreen_question(
+    question_data: Dict[str, Any],
+    knowledge_point: str,
+    reject_below: float = 0.3,
+    accept_above: float = 0.96,
+) -> Dict[str, Any]:
+    """Score a question locally and decide whether AI assessment is needed.
+
+    Args:
+        question_data: Generated question data
+        knowledge_point: Knowledge point text
+        reject_below: Scores below this are rejected
+        accept_above: Scores at or above this are accepted
+
+    Returns:
+        Result with decision (accept, reject or borderline), score and reason
+    """
+    features = extract_features(question_data, knowledge_point)
+    if features["failure"]:
+        return {"decision": REJECT, "score": 0.0, "reason": features["failure"]}
+
+    z = _BIAS + sum(weight * features[name] for name, weight in _WEIGHTS.items())
+    score = 1 / (1 + math.exp(-z))
+
+    if score >= accept_above:
+        return {"decision": ACCEPT, "score": score, "reason": "Pre-screen passed"}
+    if score < reject_below:
+        return {"decision": REJECT, "score": score, "reason": "Pre-screen score below threshold"}
+    return {"decision": BORDERLINE, "score": score, "reason": "Borderline pre-screen score"}
+
+
+class PrescreenStats:
+    """Process-wide counts of pre-screen decisions."""
+
+    def __init__(self) -> None:
+        """Initialize counters."""
+        self._lock = threading.Lock()
+        self._counts = {ACCEPT: 0, REJECT: 0, BORDERLINE: 0}
+
+    def record(self, decision: str) -> None:
+        """Count one pre-screen decision.
+
+        Args:
+            decision: accept, reject or borderline
+        """
+        with self._lock:
+            self._counts[decision] += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get decision counts and the share of AI assessments avoided.
+
+        Returns:
+            Counts plus ai_calls_avoided_ratio
+        """
+        with self._lock:
+            counts = dict(self._counts)
+        screened = sum(counts.values())
+        avoided = counts[ACCEPT] + counts[REJECT]
+        return {
+            "screened": screened,
+            "accepted": counts[ACCEPT],
+            "rejected": counts[REJECT],
+            "sent_to_ai": counts[BORDERLINE],
+            "ai_calls_avoided_ratio": avoided / screened if screened else 0.0,
+        }
+
+
+# Global pre-screen statistics
+_prescreen_stats: Optional[PrescreenStats] = None
+
+
+def get_prescreen_stats() -> PrescreenStats:
+    """Get or create global pre-screen statistics.
+
+    Returns:
+        PrescreenStats instance
+    """
+    global _prescreen_stats
+    if _prescreen_stats is None:
+        _prescreen_stats = PrescreenStats()
+    return _prescreen_stats
@@ -0,0 +1,120 @@
+"""Token counting for prompt budgeting.
+
+The tiktoken encoder is loaded once per process and shared. When it cannot
+be loaded, e.g. the BPE file is not cached and there is no network, counts
+fall back to a characters-per-token estimate.
+"""
+
+import threading
+from typing import Any, Optional, Tuple
+
+from loguru import logger
+
+# Model whose encoding (cl100k_base) approximates DeepSeek tokenization for budgeting
+DEFAULT_ENCODING_MODEL = "gpt-3.5-turbo"
+
+# Rough average for mixed English/CJK text when no encoder is available
+CHARS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """Count and truncate text by tokens with a shared encoder."""
+
+    def __init__(self, encoding_model: str = DEFAULT_ENCODING_MODEL) -> None:
+        """Initialize token counter.
+
+        Args:
+            encoding_model: Model name whose tiktoken encoding is used
+        """
+        self.encoding_model = encoding_model
+        self._encoder: Optional[Any] = None
+        self._encoder_loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def encoder(self) -> Optional[Any]:
+        """Get the encoder, loading it on first use. None means char fallback."""
+        if not self._encoder_loaded:
+            with self._load_lock:
+                if not self._encoder_loaded:
+                    try:
+                        import tiktoken
+
+                        self._encoder = tiktoken.encoding_for_model(self.encoding_model)
+                    except Exception as e:
+                        logger.warning(
+                            f"Failed to load tiktoken encoding for {self.encoding_model}, "
+                            f"estimating {CHARS_PER_TOKEN} chars per token: {e}"
+                        )
+                        self._encoder = None
+                    self._encoder_loaded = True
+        return self._encoder
+
+    def count(self, text: str) -> int:
+        """Count tokens in text.
+
+        Args:
+            text: Text to count
+
+        Returns:
+            Number of tokens
+        """
+        if not text:
+            return 0
+
+        encoder = self.encoder
+        if encoder is None:
+            return -(-len(text) // CHARS_PER_TOKEN)
+        return len(encoder.encode(text, disallowed_special=()))
+
+    def truncate(
+        self,
+        text: str,
+        max_tokens: int,
+        keep: str = "head",
+    ) -> Tuple[str, int]:
+        """Truncate text to a token budget, encoding it only once.
+
+        Args:
+            text: Text to truncate
+            max_tokens: Token budget
+            keep: "head" keeps the beginning, "tail" keeps the end
+
+        Returns:
+            Tuple of (text within budget, token count of the original text)
+        """
+        if not text:
+            return text, 0
+
+        encoder = self.encoder
+        if encoder is None:
+            count = self.count(text)
+            if count <= max_tokens:
+                return text, count
+            max_chars = max_tokens * CHARS_PER_TOKEN
+            truncated = text[:max_chars] if keep == "head" else text[-max_chars:]
+            return truncated, count
+
+        tokens = encoder.encode(text, disallowed_special=())
+        count = len(tokens)
+        if count <= max_tokens:
+            return text, count
+
+        kept = tokens[:max_tokens] if keep == "head" else tokens[-max_tokens:]
+        return encoder.decode(kept), count
+
+
+# Global token counter
+_token_counter: Optional[TokenCounter] = None
+
+
+def get_token_counter() -> TokenCounter:
+    """Get or create the global token counter.
+
+    Returns:
+        TokenCounter instance
+    """
+    global _token_counter
+    if _token_counter is None:
+        _token_counter = TokenCounter()
+    return _token_counter
@@ -0,0 +1,79 @@
+"""Backfill the semantic question index from stored quiz questions.
+
+Indexes existing QuizQuestion rows so semantic duplicate detection also
+covers quizzes generated before it was enabled. Rows are read in primary key
+order in batches and each batch is embedded in one request; re-running the
+script replaces existing entries.
+
+Usage:
+    python scripts/backfill_question_embeddings.py --batch-size 200
+"""
+import argparse
+import asyncio
+import sys
+import uuid
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import select
+
+from app.core.database import AsyncSessionLocal
+from app.models.quiz import Quiz, QuizQuestion
+from app.services.vector_search_service import get_vector_search_service
+
+
+async def main(batch_size: int, user_id: Optional[uuid.UUID]) -> None:
+    """Index all stored quiz questions.
+
+    Args:
+        batch_size: Questions embedded per request
+        user_id: Only index this user's questions
+    """
+    service = get_vector_search_service()
+    if service.chroma_client is None:
+        print("❌ ChromaDB is not available")
+        return
+
+    indexed = 0
+    last_id: Optional[uuid.UUID] = None
+    try:
+        while True:
+            query = (
+                select(QuizQuestion.id, QuizQuestion.question_text, QuizQuestion.quiz_id, Quiz.user_id)
+                .join(Quiz, Quiz.id == QuizQuestion.quiz_id)
+                .order_by(QuizQuestion.id)
+                .limit(batch_size)
+            )
+            if user_id is not None:
+                query = query.where(Quiz.user_id == user_id)
+            if last_id is not None:
+                query = query.where(QuizQuestion.id > last_id)
+
+            async with AsyncSessionLocal() as session:
+                rows = (await session.execute(query)).all()
+            if not rows:
+                break
+
+            indexed += await service.index_questions(
+                [
+                    {"id": row.id, "text": row.question_text, "user_id": row.user_id, "quiz_id": row.quiz_id}
+                    for row in rows
+                ]
+            )
+            last_id = rows[-1].id
+            print(f"Indexed {indexed} questions")
+    finally:
+        await service.close()
+
+    print(f"✅ Backfill complete: {indexed} questions indexed")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the semantic question index")
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--user-id", type=uuid.UUID, default=None, help="Only index this user's questions")
+    args = parser.parse_args()
+    asyncio.run(main(args.batch_size, args.user_id))
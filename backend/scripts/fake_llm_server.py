@@ -0,0 +1,89 @@
+"""Local fake LLM server for load testing.
+
+Serves an OpenAI-compatible ``/chat/completions`` endpoint with configurable
+latency, error rate and canned JSON responses. Point the backend at it with
+``DEEPSEEK_BASE_URL=http://localhost:8100`` to exercise the real HTTP path,
+or use ``LLM_PROVIDER=fake`` to skip the network entirely.
+
+Usage:
+    python scripts/fake_llm_server.py --port 8100 --latency-ms 300 --error-rate 0.05
+"""
+import argparse
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from app.services.llm_provider import build_fake_completion, load_fake_responses
+
+
+def create_app(
+    latency_ms: float,
+    latency_jitter_ms: float,
+    error_rate: float,
+    seed: int,
+    responses_path: str = "",
+) -> FastAPI:
+    """Create the fake LLM application.
+
+    Args:
+        latency_ms: Mean response latency in milliseconds
+        latency_jitter_ms: Uniform jitter added to the latency
+        error_rate: Fraction of requests answered with HTTP 503
+        seed: Seed for latency and error sampling
+        responses_path: Optional JSON file with canned responses
+
+    Returns:
+        FastAPI application
+    """
+    app = FastAPI(title="Fake LLM")
+    rng = random.Random(seed)
+    responses = load_fake_responses(responses_path)
+
+    @app.post("/chat/completions")
+    async def chat_completions(request: Request):
+        latency = max(0.0, latency_ms + rng.uniform(-latency_jitter_ms, latency_jitter_ms))
+        failed = rng.random() < error_rate
+        await asyncio.sleep(latency / 1000)
+
+        if failed:
+            return JSONResponse(
+                status_code=503,
+                content={"error": {"message": "fake upstream error"}},
+            )
+        return build_fake_completion(await request.json(), responses)
+
+    return app
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Fake OpenAI-compatible LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=50.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--responses", default="", help="JSON file of canned responses")
+    args = parser.parse_args()
+
+    app = create_app(
+        latency_ms=args.latency_ms,
+        latency_jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        responses_path=args.responses,
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
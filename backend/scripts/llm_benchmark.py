@@ -0,0 +1,120 @@
+"""End-to-end throughput benchmark for quiz generation and grading LLM calls.
+
+Runs question generation and short-answer grading through DeepSeekService
+against the configured provider and reports throughput and latency
+percentiles. Use with ``LLM_PROVIDER=fake`` (or the fake server) to benchmark
+on a laptop without API spend.
+
+Usage:
+    LLM_PROVIDER=fake python scripts/llm_benchmark.py --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, List
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services import llm_usage_service
+from app.services.deepseek_service import close_shared_client
+from app.services.quiz_generation_service import QuizGenerationService
+from app.services.quiz_grading_service import QuizGradingService
+from app.utils import rate_limiter
+
+
+async def run_phase(
+    name: str,
+    call: Callable[[int], Awaitable[object]],
+    requests: int,
+    concurrency: int,
+) -> None:
+    """Run one benchmark phase and print its statistics.
+
+    Args:
+        name: Phase name
+        call: Coroutine factory taking the request index
+        requests: Number of requests
+        concurrency: Maximum concurrent requests
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def timed(index: int) -> None:
+        nonlocal failures
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await call(index)
+            except Exception:
+                failures += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(requests)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0
+    print(
+        f"{name:<10} {requests / elapsed:8.1f} req/s  "
+        f"p50 {statistics.median(latencies):7.1f} ms  p95 {p95:7.1f} ms  "
+        f"failures {failures}"
+    )
+
+
+async def main(requests: int, concurrency: int, rate: int) -> None:
+    """Benchmark generation and grading calls.
+
+    Args:
+        requests: Requests per phase
+        concurrency: Maximum concurrent requests
+        rate: DeepSeek rate limit in requests per minute
+    """
+    rate_limiter._deepseek_rate_limiter = rate_limiter.RateLimiter(rate=rate, per=60.0)
+    # Aggregate usage in memory only; the benchmark does not need a database
+    tracker = llm_usage_service.LLMUsageTracker(batch_size=sys.maxsize)
+    llm_usage_service._usage_tracker = tracker
+
+    generation = QuizGenerationService(db=None)
+    grading = QuizGradingService.__new__(QuizGradingService)
+    grading.deepseek = generation.deepseek
+
+    async def generate(index: int):
+        return await generation._generate_single_question(
+            f"Knowledge point {index}", "choice", "medium"
+        )
+
+    async def grade(index: int):
+        prompt = grading._get_grading_prompt(
+            f"Explain concept {index}", "An answer", "The reference answer"
+        )
+        return await grading.deepseek.generate_completion(prompt, feature="grading")
+
+    try:
+        await run_phase("generation", generate, requests, concurrency)
+        await run_phase("grading", grade, requests, concurrency)
+    finally:
+        await close_shared_client()
+
+    for feature, totals in tracker.get_feature_totals().items():
+        print(
+            f"{feature:<10} {int(totals['calls'])} calls  "
+            f"{int(totals['prompt_tokens'] + totals['completion_tokens'])} tokens  "
+            f"{int(totals['retries'])} retries"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM pipeline throughput benchmark")
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument(
+        "--rate", type=int, default=150, help="Rate limit in requests per minute"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.rate))
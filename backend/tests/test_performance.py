@@ -22,4 +22,211 @@ class TestPerformance:
             assert duration < 0.1, f"Password hashing too slow: {duration}s"
         except Exception:
             # Skip test in CI environment due to bcrypt backend issues
-            pytest.skip("Password hashing test skipped due to bcrypt backend issues")
\ No newline at end of file
+            pytest.skip("Password hashing test skipped due to bcrypt backend issues")
+
+    def test_prompt_sanitizer_single_pass_faster(self):
+        """单次预编译扫描应快于逐条re.sub（大段OCR文本）"""
+        import re
+
+        from app.utils.prompt_sanitizer import sanitize_for_prompt
+
+        legacy_patterns = [
+            r"(?i)ignore\s+(all\s+)?(previous|above|the)\s+instructions",
+            r"(?i)disregard\s+(all\s+)?(previous|above|the)\s+instructions",
+            r"(?i)forget\s+(all\s+)?(previous|above|the)\s+instructions",
+            r"(?i)override\s+(all\s+)?(previous|above|the)\s+instructions",
+            r"(?i)system\s*:",
+            r"(?i)assistant\s*:",
+            r"(?i)\[INST\]",
+            r"(?i)\[/INST\]",
+            r"(?i)<<(.*?>>)",
+            r"(?i)###\s*(Instruction|Response|System|Assistant)",
+        ]
+
+        def legacy_sanitize(text):
+            for pattern in legacy_patterns:
+                text = re.sub(pattern, "[REDACTED]", text)
+            return text[:10000] + "..." if len(text) > 10000 else text
+
+        ocr_text = ("第一章 光合作用 Photosynthesis converts light energy into chemical energy. " * 200)[:10000]
+
+        def best_of(func, rounds=5, iterations=50):
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    func(ocr_text)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        legacy = best_of(legacy_sanitize)
+        single_pass = best_of(sanitize_for_prompt)
+
+        assert sanitize_for_prompt(ocr_text) == legacy_sanitize(ocr_text)
+        assert single_pass < legacy, f"single pass {single_pass:.4f}s vs legacy {legacy:.4f}s"
+
+    def test_json_extraction_truncated_output_is_linear(self):
+        """截断或含大量未闭合括号的输出应单次扫描完成"""
+        from app.utils.json_extract import parse_json_object
+
+        def elapsed(size):
+            text = '{"items": [' + '{"a": "x", ' * size
+            start = time.perf_counter()
+            with pytest.raises(ValueError):
+                parse_json_object(text)
+            return time.perf_counter() - start
+
+        small, large = elapsed(2000), elapsed(20000)
+
+        # 单次扫描：10倍输入约10倍耗时；逐括号重扫为100倍
+        assert large < small * 30, f"{small:.4f}s for 2000 braces vs {large:.4f}s for 20000"
+        assert large < 0.5, f"{large:.4f}s"
+
+    def test_minhash_duplicate_lookup_faster_than_pairwise(self):
+        """LSH索引查重应快于逐条两两比较（大规模题目历史）"""
+        from app.utils.minhash import MinHashLSHIndex, jaccard, shingles
+
+        history = [
+            f"第{i}题：{topic}在第{i % 37}种情形下的主要作用是什么？Explain case {i * 7919 % 10007}."
+            for i, topic in enumerate(["光合作用", "细胞呼吸", "熵增原理", "供需关系"] * 500)
+        ]
+        index = MinHashLSHIndex()
+        for position, text in enumerate(history):
+            index.add(position, text)
+
+        queries = [f"Which enzyme limits reaction {i}?" for i in range(50)] + history[:50]
+
+        start = time.perf_counter()
+        lsh_found = [bool(index.query(text)) for text in queries]
+        lsh = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pairwise_found = [
+            any(jaccard(shingles(text), shingles(other)) >= 0.85 for other in history)
+            for text in queries
+        ]
+        pairwise = time.perf_counter() - start
+
+        assert lsh_found == pairwise_found
+        assert lsh < pairwise, f"lsh {lsh:.4f}s vs pairwise {pairwise:.4f}s"
+
+    def test_knowledge_point_selection_large_mindmap(self):
+        """万级节点思维导图的知识点选择应快于按层级反复扫描"""
+        from types import SimpleNamespace
+
+        from app.utils.knowledge_point_selector import select_knowledge_points
+
+        points = [
+            SimpleNamespace(id=i, level=i % 7, text=f"知识点 {i * 7919 % 10007}")
+            for i in range(10000)
+        ]
+        weights = {point.id: 1.0 + point.id % 5 for point in points}
+
+        def legacy_select(knowledge_points, count):
+            sorted_points = sorted(knowledge_points, key=lambda kp: (kp.level, kp.text), reverse=True)
+            selected = []
+            levels = set(kp.level for kp in sorted_points)
+            base_count, remainder = divmod(count, len(levels))
+            for idx, level in enumerate(sorted(levels, reverse=True)):
+                level_points = [kp for kp in sorted_points if kp.level == level]
+                selected.extend(level_points[:min(base_count + (1 if idx < remainder else 0), len(level_points))])
+            return selected[:count]
+
+        def best_of(func, rounds=5, iterations=20):
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for seed in range(iterations):
+                    func(seed)
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        legacy = best_of(lambda seed: legacy_select(points, 50))
+        uniform = best_of(lambda seed: select_knowledge_points(points, 50, seed=seed))
+        weighted = best_of(lambda seed: select_knowledge_points(points, 50, weights=weights, seed=seed))
+
+        assert len(select_knowledge_points(points, 50, weights=weights, seed=1)) == 50
+        assert uniform < legacy, f"uniform {uniform:.4f}s vs legacy {legacy:.4f}s"
+        assert weighted < legacy * 2, f"weighted {weighted:.4f}s vs legacy {legacy:.4f}s"
+
+    def test_fill_blank_matching_large_submission(self):
+        """填空题批量判分每题应为微秒级（答案键预编译并缓存）"""
+        from app.utils.answer_matcher import compile_answer_key, match_answer
+
+        # 含数字的答案键不容错，中文键用天干地支区分
+        stems, branches = "甲乙丙丁戊己庚辛壬癸", "子丑寅卯辰巳午未申酉"
+        keys = [
+            f"光合作用{stems[i % 10]}{branches[i // 10]}阶段" if i % 2 else f"mitochondrial stage {i}"
+            for i in range(100)
+        ]
+        submissions = [
+            (
+                f"光和作用{stems[i % 10]}{branches[i % 100 // 10]}阶段" if i % 2
+                else f"Mitochondria stage {i % 100}",
+                keys[i % 100],
+            )
+            for i in range(10000)
+        ]
+        compile_answer_key.cache_clear()
+
+        start = time.perf_counter()
+        results = [match_answer(answer, key) for answer, key in submissions]
+        elapsed = time.perf_counter() - start
+
+        assert all(results)
+        assert compile_answer_key.cache_info().misses == len(keys)
+        assert elapsed / len(submissions) < 50e-6, f"{elapsed / len(submissions) * 1e6:.1f}us per answer"
+
+    def test_session_lookup_without_ai_clients(self):
+        """会话结果查询应一次查询完成且不构建AI客户端，延迟低于旧路径"""
+        import asyncio
+        import uuid
+        from unittest.mock import AsyncMock, MagicMock
+
+        from app.services.deepseek_service import DeepSeekService
+        from app.services.quiz_grading_service import load_session_results
+        from app.services.vector_search_service import VectorSearchService
+
+        session = MagicMock(answers=[])
+        result = MagicMock()
+        result.scalar_one_or_none.return_value = session
+
+        async def round_trip(*args, **kwargs):
+            # Simulated database round trip
+            await asyncio.sleep(0.002)
+            return result
+
+        db = MagicMock()
+        db.execute = AsyncMock(side_effect=round_trip)
+        db.refresh = AsyncMock(side_effect=round_trip)
+
+        async def legacy_lookup(session_id, user_id):
+            # Per-request services, then a select and a refresh of the answers
+            DeepSeekService()
+            vector_search = VectorSearchService()
+            await vector_search.initialize()
+            await db.execute(None)
+            await db.refresh(session, attribute_names=["answers"])
+            await vector_search.close()
+
+        async def best_of(lookup, rounds=3, iterations=20):
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    await lookup(uuid.uuid4(), uuid.uuid4())
+                timings.append(time.perf_counter() - start)
+            return min(timings)
+
+        async def measure():
+            legacy = await best_of(legacy_lookup)
+            db.execute.reset_mock()
+            db.refresh.reset_mock()
+            lightweight = await best_of(lambda s, u: load_session_results(db, s, u))
+            return legacy, lightweight
+
+        legacy, lightweight = asyncio.run(measure())
+
+        assert db.execute.await_count == 3 * 20
+        db.refresh.assert_not_awaited()
+        assert lightweight < legacy, f"lightweight {lightweight:.4f}s vs legacy {legacy:.4f}s"
@@ -0,0 +1,97 @@
+"""
+Unit tests for fill-in-the-blank answer matching.
+"""
+import pytest
+
+from app.utils.answer_matcher import (
+    bounded_edit_distance,
+    compile_answer_key,
+    match_answer,
+    normalize,
+)
+
+
+@pytest.mark.unit
+class TestAnswerMatcher:
+    """Test normalization, typo tolerance, similarity and synonyms."""
+
+    def test_normalize(self):
+        """Width, case, punctuation and synonyms are normalized away."""
+        assert normalize("  ＤＮＡ！ ") == "dna"
+        assert normalize("Carbon   Dioxide.") == "co2"
+        assert normalize("two apples") == "2 apples"
+        assert normalize("R&D") == "r and d"
+        # Short synonyms replace whole answers only
+        assert normalize("US") == "usa"
+        assert normalize("us army") == "us army"
+
+    def test_normalize_keeps_numbers_and_operators(self):
+        """Signs, decimals and operators survive; numbers are written by value."""
+        assert normalize(" -5. ") == "-5"
+        assert normalize("3.140") == normalize("3.14")
+        assert normalize("0.5") == normalize("1/2") == "1/2"
+        assert normalize("1,000") == "1000"
+        assert normalize("x^2") == "x ^ 2"
+
+    @pytest.mark.parametrize("user_answer, correct_answer, expected", [
+        ("Paris", "paris", True),
+        ("mitochondrion", "mitochondria", True),
+        ("car", "cat", False),
+        ("光和作用", "光合作用", True),
+        ("光合", "光合作用", False),
+        ("细胞质", "细胞核", False),
+        ("CO₂", "二氧化碳", True),
+        ("牛顿", "Newton | 牛顿", True),
+        ("！！", "x", False),
+    ])
+    def test_match_answer(self, user_answer, correct_answer, expected):
+        """Answers match on equality, small typos or synonyms only."""
+        assert match_answer(user_answer, correct_answer) is expected
+
+    @pytest.mark.parametrize("user_answer, correct_answer", [
+        ("12345", "12346"),
+        ("3.14159", "3.14158"),
+        ("1/2", "12"),
+        ("x^2", "x2"),
+        ("-5", "5"),
+        ("100", "1000"),
+        ("co3", "co2"),
+        ("speed is 1000 m/s", "speed is 100 m/s"),
+        ("非氧化还原反应", "氧化还原反应"),
+        ("不饱和脂肪酸", "饱和脂肪酸"),
+        ("not soluble", "soluble"),
+    ])
+    def test_numbers_symbols_and_negation_are_exact(self, user_answer, correct_answer):
+        """Numeric, symbolic and negated answers get no typo or similarity tolerance."""
+        assert match_answer(user_answer, correct_answer) is False
+
+    @pytest.mark.parametrize("user_answer, correct_answer", [
+        ("0.5", "1/2"),
+        ("1,000", "1000"),
+        ("five", "5"),
+        ("x^2", "X^2"),
+        ("R&D", "r and d"),
+        ("speed is 100 m/s", "the speed is 100 m/s"),
+    ])
+    def test_equivalent_numbers_and_symbols_match(self, user_answer, correct_answer):
+        """Equal values and spelled-out forms still match."""
+        assert match_answer(user_answer, correct_answer) is True
+
+    def test_repeated_bigrams_count(self):
+        """Bigram similarity counts repeats, so a longer answer is less similar."""
+        assert match_answer("哈哈哈哈哈哈", "哈哈") is False
+
+    def test_bounded_edit_distance_exits_early(self):
+        """Distances above the bound are reported as bound + 1."""
+        assert bounded_edit_distance("kitten", "sitting", 3) == 3
+        assert bounded_edit_distance("kitten", "sitting", 1) == 2
+        assert bounded_edit_distance("a", "abcdef", 2) == 3
+
+    def test_answer_keys_are_compiled_once(self):
+        """Grading many answers against one key compiles it once."""
+        compile_answer_key.cache_clear()
+
+        for _ in range(100):
+            match_answer("Photosynthesis", "photosynthesis")
+
+        assert compile_answer_key.cache_info().misses == 1
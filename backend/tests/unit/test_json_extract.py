@@ -0,0 +1,75 @@
+"""
+Unit tests for JSON extraction from LLM responses.
+"""
+import json
+
+import pytest
+
+from app.utils.json_extract import extract_json, parse_json_object
+
+
+@pytest.mark.unit
+class TestExtractJson:
+    """Test brace-balanced JSON extraction."""
+
+    def test_bare_object(self):
+        """JSON mode output is returned as is."""
+        assert parse_json_object(' {"score": 0.8} ') == {"score": 0.8}
+
+    def test_nested_object_in_prose(self):
+        """Nested objects are extracted whole, not cut at the first closing brace."""
+        response = 'Sure! Here it is: {"a": {"b": [1, {"c": 2}]}, "d": 3} Hope that helps.'
+
+        assert parse_json_object(response) == {"a": {"b": [1, {"c": 2}]}, "d": 3}
+
+    def test_code_fence(self):
+        """Objects inside markdown code fences are found."""
+        response = 'Result:\n```json\n{"id": "root", "children": [{"id": "n1"}]}\n```'
+
+        assert json.loads(extract_json(response))["children"] == [{"id": "n1"}]
+
+    def test_braces_inside_strings(self):
+        """Braces and escaped quotes inside strings do not affect balancing."""
+        response = 'x {"text": "use {braces} and \\"quotes\\" }", "ok": true} y'
+
+        assert parse_json_object(response) == {"text": 'use {braces} and "quotes" }', "ok": True}
+
+    def test_skips_invalid_candidates(self):
+        """Stray braces in prose are skipped."""
+        response = 'The set {a, b} and an open { brace, then {"score": 1.0}'
+
+        assert parse_json_object(response) == {"score": 1.0}
+
+    def test_malformed_object_does_not_yield_nested_child(self):
+        """A nested object is not returned in place of its malformed parent."""
+        response = (
+            '{"id": "root", "text": "Main", '
+            '"children": [{"id": "n1", "text": "Child", "children": []},]}'
+        )
+
+        with pytest.raises(ValueError, match="No valid JSON"):
+            parse_json_object(response)
+        with pytest.raises(ValueError, match="No valid JSON"):
+            parse_json_object(f"Here it is: {response} done")
+
+    def test_many_unclosed_braces(self):
+        """Stray and truncated braces before the payload are skipped."""
+        response = "{ " * 500 + 'Result: {"data": {"score": 0.5}} and {"other": 1}' + " {" * 500
+
+        assert parse_json_object(response) == {"data": {"score": 0.5}}
+
+    def test_escaped_quotes_in_strings(self):
+        """Escaped quotes and braces inside strings do not end the object."""
+        response = 'Reply: {"text": "a \\"quoted\\" {brace}", "n": 2}'
+
+        assert parse_json_object(response) == {"text": 'a "quoted" {brace}', "n": 2}
+
+    def test_no_json(self):
+        """Responses without an object raise ValueError."""
+        with pytest.raises(ValueError, match="No valid JSON"):
+            extract_json("no json here")
+
+    def test_truncated_json(self):
+        """Truncated objects raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_json_object('{"question_text": "What is')
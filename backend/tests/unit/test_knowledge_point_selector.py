@@ -0,0 +1,73 @@
+"""
+Unit tests for stratified knowledge point selection.
+"""
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+
+from app.utils.knowledge_point_selector import select_knowledge_points
+
+
+def _points(levels):
+    """Build points with the given levels and IDs equal to their position."""
+    return [SimpleNamespace(id=i, level=level) for i, level in enumerate(levels)]
+
+
+@pytest.mark.unit
+class TestSelectKnowledgePoints:
+    """Test level quotas, seeding and weighting."""
+
+    def test_equal_share_per_level_deepest_first(self):
+        """Every level gets its share, deeper levels take the remainder."""
+        points = _points([0] * 10 + [1] * 10 + [2] * 10)
+
+        selected = select_knowledge_points(points, 8, seed=1)
+
+        assert Counter(p.level for p in selected) == {2: 3, 1: 3, 0: 2}
+        assert [p.level for p in selected] == sorted((p.level for p in selected), reverse=True)
+
+    def test_short_levels_pass_on_their_share(self):
+        """A level with too few points leaves its share to the deepest levels."""
+        points = _points([0] * 1 + [1] * 10 + [2] * 10)
+
+        selected = select_knowledge_points(points, 9, seed=1)
+
+        assert Counter(p.level for p in selected) == {2: 5, 1: 3, 0: 1}
+        assert len({p.id for p in selected}) == 9
+
+    def test_returns_everything_when_count_exceeds_points(self):
+        """With fewer points than requested, all are returned."""
+        points = _points([0, 1, 2])
+
+        assert [p.level for p in select_knowledge_points(points, 5)] == [2, 1, 0]
+        assert select_knowledge_points(points, 0) == []
+
+    def test_seed_is_reproducible(self):
+        """The same seed selects the same points; selections vary across seeds."""
+        points = _points([i % 4 for i in range(200)])
+
+        first = select_knowledge_points(points, 20, seed=7)
+        assert select_knowledge_points(points, 20, seed=7) == first
+        assert any(select_knowledge_points(points, 20, seed=seed) != first for seed in range(8, 12))
+
+    def test_weights_bias_selection(self):
+        """Heavily weighted points are picked far more often."""
+        points = _points([0] * 20)
+        weights = {0: 200.0, 1: 200.0}
+
+        picks = Counter()
+        for seed in range(200):
+            picks.update(p.id for p in select_knowledge_points(points, 2, weights=weights, seed=seed))
+
+        assert picks[0] > 170 and picks[1] > 170
+        assert sum(count for point_id, count in picks.items() if point_id > 1) < 60
+
+    def test_zero_weight_points_still_fill_quota(self):
+        """Points with no weight are used when nothing else is left."""
+        points = _points([0] * 3)
+
+        selected = select_knowledge_points(points, 2, weights={0: 0.0, 1: 0.0}, seed=3)
+
+        assert len(selected) == 2
+        assert 2 in {p.id for p in selected}
@@ -0,0 +1,136 @@
+"""
+Unit tests for LLM provider backends.
+"""
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+from app.services.llm_provider import (
+    DeepSeekProvider,
+    FakeLLMProvider,
+    build_fake_completion,
+    create_llm_provider,
+)
+
+
+def _payload(prompt: str) -> dict:
+    """Build a chat completion request payload."""
+    return {"model": "deepseek-chat", "messages": [{"role": "user", "content": prompt}]}
+
+
+@pytest.mark.unit
+class TestFakeCompletion:
+    """Test canned completion selection."""
+
+    def test_selects_response_by_marker(self):
+        """Grading prompts get the canned grading response."""
+        body = build_fake_completion(_payload("Grade the following short answer: ..."))
+
+        content = json.loads(body["choices"][0]["message"]["content"])
+        assert content["score"] == 0.8
+        assert body["usage"]["total_tokens"] > 0
+
+    def test_batch_grading_prompt(self):
+        """Batch grading prompts get one grade per answer ID."""
+        body = build_fake_completion(_payload(
+            "Grade each of these 2 short answers.\n\nAnswer ID: q1\nQuestion: ...\n\nAnswer ID: q2\nQuestion: ..."
+        ))
+
+        content = json.loads(body["choices"][0]["message"]["content"])
+        assert [grade["question_id"] for grade in content["grades"]] == ["q1", "q2"]
+
+    def test_deterministic_per_prompt(self):
+        """Same prompt gives same answer, different prompts differ."""
+        first = build_fake_completion(_payload("Generate a medium choice question for: A"))
+        again = build_fake_completion(_payload("Generate a medium choice question for: A"))
+        other = build_fake_completion(_payload("Generate a medium choice question for: B"))
+
+        assert first["choices"] == again["choices"]
+        assert first["choices"] != other["choices"]
+
+    def test_custom_responses(self):
+        """Custom canned responses override the defaults."""
+        body = build_fake_completion(_payload("hello there"), {"hello": "plain text"})
+
+        assert body["choices"][0]["message"]["content"] == "plain text"
+
+
+@pytest.mark.unit
+class TestFakeLLMProvider:
+    """Test the local fake provider."""
+
+    @pytest.mark.asyncio
+    async def test_returns_completion(self):
+        """Fake provider answers with an OpenAI-compatible response."""
+        provider = FakeLLMProvider(latency_ms=0, latency_jitter_ms=0)
+
+        response = await provider.post("/chat/completions", json=_payload("Assess the quality"))
+        await provider.aclose()
+
+        assert response.status_code == 200
+        content = json.loads(response.json()["choices"][0]["message"]["content"])
+        assert content["quality_score"] == 0.85
+
+    @pytest.mark.asyncio
+    async def test_error_rate(self):
+        """Error rate of one fails every request with 503."""
+        provider = FakeLLMProvider(latency_ms=0, latency_jitter_ms=0, error_rate=1.0)
+
+        response = await provider.post("/chat/completions", json=_payload("x"))
+        await provider.aclose()
+
+        assert response.status_code == 503
+        with pytest.raises(httpx.HTTPStatusError):
+            response.raise_for_status()
+
+    @pytest.mark.asyncio
+    async def test_seeded_errors_reproducible(self):
+        """Same seed produces the same error sequence."""
+        async def statuses(seed: int) -> list:
+            provider = FakeLLMProvider(latency_ms=0, latency_jitter_ms=0, error_rate=0.5, seed=seed)
+            codes = [
+                (await provider.post("/chat/completions", json=_payload("x"))).status_code
+                for _ in range(20)
+            ]
+            await provider.aclose()
+            return codes
+
+        assert await statuses(7) == await statuses(7)
+
+    @pytest.mark.asyncio
+    async def test_deepseek_service_uses_fake_provider(self):
+        """DeepSeekService runs end to end on the fake provider."""
+        from app.services.deepseek_service import DeepSeekService
+
+        service = DeepSeekService()
+        service.client = FakeLLMProvider(latency_ms=0, latency_jitter_ms=0)
+
+        with patch("app.services.deepseek_service.get_usage_tracker", return_value=MagicMock()):
+            content = await service.generate_completion("Grade the following answer")
+        await service.client.aclose()
+
+        assert json.loads(content)["feedback"]
+
+
+@pytest.mark.unit
+class TestCreateProvider:
+    """Test provider selection."""
+
+    @pytest.mark.asyncio
+    async def test_create_by_name(self):
+        """Known provider names create the matching backend."""
+        deepseek = create_llm_provider("deepseek")
+        fake = create_llm_provider("fake")
+
+        assert isinstance(deepseek, DeepSeekProvider)
+        assert isinstance(fake, FakeLLMProvider)
+
+        await deepseek.aclose()
+        await fake.aclose()
+
+    def test_unknown_provider(self):
+        """Unknown provider names are rejected."""
+        with pytest.raises(ValueError, match="Unknown LLM provider"):
+            create_llm_provider("nope")
@@ -0,0 +1,175 @@
+"""
+Unit tests for LLM usage telemetry.
+"""
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.llm_usage_service import LLMUsageService, LLMUsageTracker
+
+
+@pytest.mark.unit
+class TestLLMUsageTracker:
+    """Test in-process aggregation and batched flushing."""
+
+    def test_record_aggregates_per_feature(self):
+        """Records are buffered and summed per feature."""
+        tracker = LLMUsageTracker(batch_size=100)
+
+        tracker.record("question", "deepseek-chat", 100, 50, latency_ms=200, retries=1)
+        tracker.record("question", "deepseek-chat", 120, 30, latency_ms=400)
+        tracker.record("grading", "deepseek-chat", 80, 20, latency_ms=100, success=False)
+
+        totals = tracker.get_feature_totals()
+
+        assert tracker.pending == 3
+        assert totals["question"]["calls"] == 2
+        assert totals["question"]["prompt_tokens"] == 220
+        assert totals["question"]["completion_tokens"] == 80
+        assert totals["question"]["retries"] == 1
+        assert totals["question"]["avg_latency_ms"] == 300
+        assert totals["grading"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_writes_batch(self):
+        """Flush inserts all buffered records in one batch."""
+        tracker = LLMUsageTracker(batch_size=100)
+        user_id = uuid.uuid4()
+        for _ in range(3):
+            tracker.record("mindmap", "deepseek-chat", 10, 5, latency_ms=50, user_id=user_id)
+
+        session = MagicMock()
+        session.execute = AsyncMock()
+        session.commit = AsyncMock()
+        session_factory = MagicMock()
+        session_factory.return_value.__aenter__ = AsyncMock(return_value=session)
+        session_factory.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("app.core.database.AsyncSessionLocal", session_factory):
+            written = await tracker.flush()
+
+        assert written == 3
+        assert tracker.pending == 0
+        session.execute.assert_called_once()
+        rows = session.execute.call_args.args[1]
+        assert len(rows) == 3
+        assert all(row["user_id"] == user_id for row in rows)
+        assert rows[0]["total_tokens"] == 15
+        session.commit.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_flush_failure_keeps_records(self):
+        """Records survive a failed flush for the next attempt."""
+        tracker = LLMUsageTracker(batch_size=100)
+        tracker.record("quality", "deepseek-chat", 10, 5, latency_ms=50)
+
+        failing_factory = MagicMock(side_effect=RuntimeError("db down"))
+        with patch("app.core.database.AsyncSessionLocal", failing_factory):
+            written = await tracker.flush()
+
+        assert written == 0
+        assert tracker.pending == 1
+
+
+@pytest.mark.unit
+class TestLLMUsageService:
+    """Test persisted usage rollups."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create mock database session."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+        return db
+
+    def _row(self, **values):
+        """Build an aggregate result row."""
+        row = MagicMock()
+        defaults = {
+            "calls": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "total_tokens": 0,
+            "avg_latency_ms": 0,
+            "max_latency_ms": 0,
+            "retries": 0,
+            "failures": 0,
+        }
+        for key, value in {**defaults, **values}.items():
+            setattr(row, key, value)
+        return row
+
+    @pytest.mark.asyncio
+    async def test_feature_rollup(self, mock_db):
+        """Feature rollup formats aggregate rows per feature."""
+        result = MagicMock()
+        result.all.return_value = [
+            self._row(feature="question", calls=2, prompt_tokens=200, completion_tokens=100,
+                      total_tokens=300, avg_latency_ms=400.04, max_latency_ms=500),
+            self._row(feature="grading", calls=1, total_tokens=50, failures=1),
+        ]
+        mock_db.execute.return_value = result
+
+        service = LLMUsageService(mock_db)
+        by_feature = await service.get_feature_rollup(days=1, user_id=uuid.uuid4())
+
+        assert [item["feature"] for item in by_feature] == ["question", "grading"]
+        assert by_feature[0]["total_tokens"] == 300
+        assert by_feature[0]["avg_latency_ms"] == 400.0
+        assert by_feature[1]["failures"] == 1
+        mock_db.execute.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_user_rollup(self, mock_db):
+        """User rollup reports usage keyed by user id."""
+        user_id = uuid.uuid4()
+        result = MagicMock()
+        result.all.return_value = [
+            self._row(user_id=user_id, calls=4, total_tokens=1400),
+            self._row(user_id=None, calls=1, total_tokens=10),
+        ]
+        mock_db.execute.return_value = result
+
+        service = LLMUsageService(mock_db)
+        by_user = await service.get_user_rollup(days=1)
+
+        assert by_user[0]["user_id"] == str(user_id)
+        assert by_user[0]["total_tokens"] == 1400
+        assert by_user[1]["user_id"] is None
+
+
+@pytest.mark.unit
+class TestDeepSeekUsageRecording:
+    """Test that DeepSeek calls report usage to the tracker."""
+
+    @pytest.mark.asyncio
+    async def test_generate_completion_records_usage(self):
+        """Provider usage, feature and user are recorded per call."""
+        from app.services.deepseek_service import DeepSeekService
+
+        mock_response = MagicMock()
+        mock_response.raise_for_status = MagicMock()
+        mock_response.json.return_value = {
+            "choices": [{"message": {"content": "ok"}}],
+            "usage": {"prompt_tokens": 12, "completion_tokens": 7},
+        }
+        client = MagicMock()
+        client.post = AsyncMock(return_value=mock_response)
+
+        tracker = MagicMock()
+        user_id = uuid.uuid4()
+
+        service = DeepSeekService()
+        service.client = client
+
+        with patch("app.services.deepseek_service.get_usage_tracker", return_value=tracker):
+            await service.generate_completion("prompt", feature="question", user_id=user_id)
+
+        kwargs = tracker.record.call_args.kwargs
+        assert kwargs["feature"] == "question"
+        assert kwargs["user_id"] == user_id
+        assert kwargs["prompt_tokens"] == 12
+        assert kwargs["completion_tokens"] == 7
+        assert kwargs["retries"] == 0
+        assert kwargs["success"] is True
@@ -97,7 +97,8 @@ class TestMindmapService:
             mock_deepseek_service.generate_mindmap.assert_called_once_with(
                 note_content="Test content",
                 note_title="Test",
-                max_levels=5
+                max_levels=5,
+                user_id=user_id,
             )
 
     @pytest.mark.asyncio
@@ -0,0 +1,75 @@
+"""
+Unit tests for the MinHash/LSH near-duplicate index.
+"""
+import pytest
+
+from app.utils.minhash import MinHasher, MinHashLSHIndex, jaccard, shingles
+
+
+@pytest.mark.unit
+class TestShingles:
+    """Test character shingling."""
+
+    def test_normalizes_case_and_punctuation(self):
+        """Case, punctuation and spacing do not change shingles."""
+        assert shingles("What is  the capital?") == shingles("what is the capital")
+
+    def test_cjk_text(self):
+        """Unsegmented Chinese text yields character n-grams."""
+        assert shingles("光合作用", n=2) == {"光合", "合作", "作用"}
+
+    def test_short_text(self):
+        """Texts shorter than n are a single shingle."""
+        assert shingles("Hi", n=3) == {"hi"}
+        assert shingles("  ", n=3) == frozenset()
+
+    def test_jaccard(self):
+        """Similarity of identical and disjoint texts."""
+        assert jaccard(shingles("abcdef"), shingles("abcdef")) == 1.0
+        assert jaccard(shingles("abcdef"), shingles("uvwxyz")) == 0.0
+        assert jaccard(frozenset(), shingles("abc")) == 0.0
+
+
+@pytest.mark.unit
+class TestMinHashLSHIndex:
+    """Test duplicate lookups."""
+
+    def test_signature_is_deterministic(self):
+        """The same seed gives the same signature across hashers."""
+        shingle_set = shingles("What is photosynthesis?")
+        assert MinHasher(seed=3).signature(shingle_set) == MinHasher(seed=3).signature(shingle_set)
+
+    def test_finds_near_duplicate(self):
+        """A lightly edited question matches; an unrelated one does not."""
+        index = MinHashLSHIndex(threshold=0.8)
+        index.add("q1", "Which organelle is responsible for photosynthesis in plant cells?")
+        index.add("q2", "What is the boiling point of water at sea level?")
+
+        matches = index.query("Which organelle is responsible for photosynthesis in plant cells")
+
+        assert [key for key, _ in matches] == ["q1"]
+        assert matches[0][1] >= 0.8
+        assert index.query("Who wrote the play Hamlet?") == []
+
+    def test_finds_cjk_duplicate(self):
+        """Chinese questions without spaces are compared by characters."""
+        index = MinHashLSHIndex()
+        index.add(0, "光合作用的主要产物是什么？")
+
+        assert index.query("光合作用的主要产物是什么?") == [(0, 1.0)]
+        assert index.query("细胞呼吸发生在哪个细胞器中？") == []
+
+    def test_incremental_growth(self):
+        """Texts added later are found by later queries."""
+        index = MinHashLSHIndex()
+        assert index.query("What is entropy?") == []
+
+        index.add(1, "What is entropy?")
+
+        assert len(index) == 1
+        assert index.query("what is entropy") == [(1, 1.0)]
+
+    def test_rejects_uneven_bands(self):
+        """The signature must split evenly into bands."""
+        with pytest.raises(ValueError):
+            MinHashLSHIndex(num_perm=64, bands=10)
@@ -153,6 +153,46 @@ class TestMistakeService:
         db.delete = AsyncMock()  # Service awaits this
         return db
 
+    @pytest.mark.asyncio
+    async def test_capture_quiz_mistakes_upserts_in_one_statement(self, mock_db):
+        """Wrong quiz answers become mistakes with one upsert that counts repeats."""
+        from sqlalchemy.dialects import postgresql
+
+        point_id = uuid.uuid4()
+        questions = [
+            MagicMock(id=uuid.uuid4(), knowledge_point_id=point_id, question_text=f"Q{i}?",
+                      question_type="choice", options=["A. x", "B. y"], correct_answer="A",
+                      explanation=None, difficulty="hard")
+            for i in range(3)
+        ]
+        context = MagicMock()
+        context.all.return_value = [("Biology notes", point_id, "Photosynthesis")]
+        mock_db.execute.side_effect = [context, MagicMock()]
+
+        captured = await MistakeService(mock_db).capture_quiz_mistakes(
+            uuid.uuid4(), uuid.uuid4(), [(q, "B") for q in questions]
+        )
+
+        assert captured == 3
+        assert mock_db.execute.await_count == 2
+        upsert = mock_db.execute.await_args_list[1].args[0]
+        sql = str(upsert.compile(dialect=postgresql.dialect()))
+        assert "ON CONFLICT (user_id, question_id) WHERE source = " in sql
+        assert "incorrect_count = (mistakes.incorrect_count + " in sql
+        row = upsert.compile(dialect=postgresql.dialect()).params
+        assert row["subject_m0"] == "Biology notes"
+        assert row["knowledge_points_m0"] == ["Photosynthesis"]
+        assert row["difficulty_m0"] == 5
+        review_in = (row["next_review_at_m0"] - datetime.utcnow()).total_seconds()
+        assert 18 * 60 <= review_in <= 22 * 60
+        mock_db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_capture_quiz_mistakes_nothing_wrong(self, mock_db):
+        """Without wrong answers nothing is queried."""
+        assert await MistakeService(mock_db).capture_quiz_mistakes(uuid.uuid4(), uuid.uuid4(), []) == 0
+        mock_db.execute.assert_not_awaited()
+
     @pytest.mark.asyncio
     async def test_create_mistake_success(self, mock_db):
         """Test successful mistake creation."""
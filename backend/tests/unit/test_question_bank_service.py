@@ -0,0 +1,93 @@
+"""
+Unit tests for the question bank.
+"""
+import uuid
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.models.question_bank import QuestionBankItem
+from app.services.question_bank_service import QuestionBankService
+
+
+def _item(kp_id, question_type, text):
+    """Build a banked question."""
+    return QuestionBankItem(
+        id=uuid.uuid4(),
+        knowledge_point_id=kp_id,
+        question_text=text,
+        question_type=question_type,
+        options=None,
+        correct_answer="A",
+        explanation=None,
+        difficulty="medium",
+        times_used=0,
+    )
+
+
+@pytest.mark.unit
+class TestQuestionBankService:
+    """Test serving and storing banked questions."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create mock database session."""
+        db = MagicMock()
+        db.add = MagicMock()
+        db.execute = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_take_questions_serves_matching_slots(self, mock_db):
+        """Each slot gets the first unused question of its point and type."""
+        kp_a, kp_b = uuid.uuid4(), uuid.uuid4()
+        items = [
+            _item(kp_a, "choice", "Already in quiz"),
+            _item(kp_a, "choice", "A choice"),
+            _item(kp_a, "fill_blank", "A blank"),
+            _item(kp_b, "fill_blank", "B blank"),
+        ]
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = items
+        mock_db.execute.return_value = result
+
+        served = await QuestionBankService(mock_db).take_questions(
+            [(0, kp_a, "choice"), (1, kp_a, "fill_blank"), (2, kp_b, "choice")],
+            "medium",
+            exclude_texts=["Already in quiz"],
+        )
+
+        assert {idx: q["question_text"] for idx, q in served.items()} == {0: "A choice", 1: "A blank"}
+        # One select plus one use-count update
+        assert mock_db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_take_questions_empty_bank(self, mock_db):
+        """An empty bank serves nothing and updates nothing."""
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = []
+        mock_db.execute.return_value = result
+
+        served = await QuestionBankService(mock_db).take_questions(
+            [(0, uuid.uuid4(), "choice")],
+            "medium",
+        )
+
+        assert served == {}
+        assert mock_db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_add_questions(self, mock_db):
+        """Added questions keep their point, type and difficulty."""
+        kp_id = uuid.uuid4()
+
+        count = await QuestionBankService(mock_db).add_questions(
+            [(kp_id, "choice", "hard", {"question_text": "Q?", "correct_answer": "B", "options": ["A", "B"]})],
+            times_used=1,
+        )
+
+        assert count == 1
+        item = mock_db.add.call_args.args[0]
+        assert item.knowledge_point_id == kp_id
+        assert item.difficulty == "hard"
+        assert item.times_used == 1
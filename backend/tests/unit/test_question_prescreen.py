@@ -0,0 +1,121 @@
+"""
+Unit tests for the local question quality pre-screen.
+"""
+import pytest
+
+from app.utils.question_prescreen import (
+    ACCEPT,
+    BORDERLINE,
+    REJECT,
+    PrescreenStats,
+    extract_features,
+    prescreen_question,
+)
+
+OPTIONS = ["A. London", "B. Paris", "C. Berlin", "D. Madrid"]
+
+
+@pytest.mark.unit
+class TestPrescreenQuestion:
+    """Test pre-screen decisions."""
+
+    def test_accepts_clear_question(self):
+        """A well-formed question on the knowledge point is accepted locally."""
+        result = prescreen_question(
+            {
+                "question_text": "Which city is the capital of France, a country in Western Europe?",
+                "correct_answer": "B",
+                "options": OPTIONS,
+            },
+            "Capital of France",
+        )
+
+        assert result["decision"] == ACCEPT
+        assert result["score"] >= 0.96
+
+    def test_rejects_answer_leakage(self):
+        """An answer stated in the question is rejected."""
+        result = prescreen_question(
+            {"question_text": "Is Paris the capital of France?", "correct_answer": "Paris"},
+            "Capital of France",
+        )
+
+        assert result["decision"] == REJECT
+        assert "given away" in result["reason"]
+
+    def test_rejects_indistinct_options(self):
+        """Options that differ only by their label are rejected."""
+        result = prescreen_question(
+            {
+                "question_text": "Which option describes the capital of France?",
+                "correct_answer": "A",
+                "options": ["A. Paris", "B. paris", "C. Berlin"],
+            },
+            "Capital of France",
+        )
+
+        assert result["decision"] == REJECT
+
+    def test_rejects_answer_outside_options(self):
+        """A choice answer must name one of the options."""
+        result = prescreen_question(
+            {"question_text": "Which city is the capital of France?", "correct_answer": "E", "options": OPTIONS},
+            "Capital of France",
+        )
+
+        assert result["decision"] == REJECT
+
+    def test_off_topic_question_is_borderline(self):
+        """Without knowledge point terms the AI assessor decides."""
+        result = prescreen_question(
+            {
+                "question_text": "Which statement about the listed items is correct?",
+                "correct_answer": "A",
+                "options": ["A. Option 1", "B. Option 2", "C. Option 3"],
+            },
+            "Photosynthesis",
+        )
+
+        assert result["decision"] == BORDERLINE
+
+    def test_cjk_terms_overlap(self):
+        """CJK text is matched by character bigrams."""
+        features = extract_features(
+            {"question_text": "光合作用的主要产物是什么？", "correct_answer": "葡萄糖和氧气"},
+            "光合作用",
+        )
+
+        assert features["term_overlap"] == 1.0
+
+    def test_non_choice_question_is_never_accepted_locally(self):
+        """A free-text question with a poor answer is left to the AI assessor."""
+        result = prescreen_question(
+            {
+                "question_text": "What is the main product of photosynthesis in green plants?",
+                "correct_answer": "Something about the sun",
+            },
+            "Photosynthesis in green plants",
+        )
+
+        assert result["decision"] == BORDERLINE
+
+
+@pytest.mark.unit
+class TestPrescreenStats:
+    """Test pre-screen statistics."""
+
+    def test_ai_calls_avoided_ratio(self):
+        """Accepted and rejected questions count as avoided AI calls."""
+        stats = PrescreenStats()
+        for decision in (ACCEPT, ACCEPT, REJECT, BORDERLINE):
+            stats.record(decision)
+
+        snapshot = stats.snapshot()
+
+        assert snapshot["screened"] == 4
+        assert snapshot["sent_to_ai"] == 1
+        assert snapshot["ai_calls_avoided_ratio"] == 0.75
+
+    def test_empty_stats(self):
+        """No screening means nothing avoided."""
+        assert PrescreenStats().snapshot()["ai_calls_avoided_ratio"] == 0.0
@@ -0,0 +1,219 @@
+"""
+Unit tests for background quiz generation and grading jobs.
+"""
+import asyncio
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.quiz_job_runner import QuizJobRunner
+
+
+def _session_factory():
+    """Build a session factory returning one mock session."""
+    session = MagicMock()
+    session.rollback = AsyncMock()
+    context = MagicMock()
+    context.__aenter__ = AsyncMock(return_value=session)
+    context.__aexit__ = AsyncMock(return_value=False)
+    return MagicMock(return_value=context)
+
+
+def _mock_service(claimed=True):
+    """Build a generation service mock."""
+    service = MagicMock()
+    service.claim_generation = AsyncMock(return_value=claimed)
+    service.run_generation = AsyncMock()
+    service.mark_generation_failed = AsyncMock()
+    service.get_resumable_quiz_ids = AsyncMock(return_value=[])
+    return service
+
+
+def _mock_grading_service(claimed=True):
+    """Build a grading service mock."""
+    service = MagicMock()
+    service.claim_grading = AsyncMock(return_value=claimed)
+    service.initialize = AsyncMock()
+    service.run_grading = AsyncMock()
+    service.mark_grading_failed = AsyncMock()
+    service.get_resumable_session_ids = AsyncMock(return_value=[])
+    return service
+
+
+@pytest.mark.unit
+class TestQuizJobRunner:
+    """Test job submission, claiming and recovery."""
+
+    @pytest.mark.asyncio
+    async def test_runs_claimed_job(self):
+        """A claimed quiz is generated."""
+        service = _mock_service()
+        runner = QuizJobRunner(session_factory=_session_factory())
+        quiz_id = uuid.uuid4()
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            assert runner.submit(quiz_id) is True
+            await asyncio.gather(*runner._jobs.values())
+
+        service.run_generation.assert_awaited_once_with(quiz_id)
+        assert runner.active_jobs == 0
+
+    @pytest.mark.asyncio
+    async def test_skips_job_claimed_elsewhere(self):
+        """A quiz held by another worker is not generated twice."""
+        service = _mock_service(claimed=False)
+        runner = QuizJobRunner(session_factory=_session_factory())
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            runner.submit(uuid.uuid4())
+            await asyncio.gather(*runner._jobs.values())
+
+        service.run_generation.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_submit_deduplicates(self):
+        """Submitting a quiz that already has a job is a no-op."""
+        service = _mock_service()
+        started = asyncio.Event()
+
+        async def slow_run(quiz_id):
+            started.set()
+            await asyncio.sleep(0.05)
+
+        service.run_generation = AsyncMock(side_effect=slow_run)
+        runner = QuizJobRunner(session_factory=_session_factory())
+        quiz_id = uuid.uuid4()
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            assert runner.submit(quiz_id) is True
+            assert runner.submit(quiz_id) is False
+            await asyncio.gather(*runner._jobs.values())
+
+        service.run_generation.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_failed_job_marks_quiz_failed(self):
+        """An error during generation marks the quiz failed."""
+        service = _mock_service()
+        service.run_generation = AsyncMock(side_effect=RuntimeError("boom"))
+        runner = QuizJobRunner(session_factory=_session_factory())
+        quiz_id = uuid.uuid4()
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            runner.submit(quiz_id)
+            await asyncio.gather(*runner._jobs.values())
+
+        service.mark_generation_failed.assert_awaited_once_with(quiz_id)
+
+    @pytest.mark.asyncio
+    async def test_cancel_stops_job(self):
+        """Cancelling a quiz's job stops it without marking the quiz failed."""
+        async def hang(quiz_id):
+            await asyncio.sleep(10)
+
+        service = _mock_service()
+        service.run_generation = AsyncMock(side_effect=hang)
+        runner = QuizJobRunner(session_factory=_session_factory())
+        quiz_id = uuid.uuid4()
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            runner.submit(quiz_id)
+            await asyncio.sleep(0.01)
+            assert await runner.cancel(quiz_id) is True
+            assert await runner.cancel(quiz_id) is False
+
+        service.mark_generation_failed.assert_not_awaited()
+        assert runner.active_jobs == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_leaves_quiz_resumable(self):
+        """Cancelled jobs are not marked failed so a later sweep resumes them."""
+        async def hang(quiz_id):
+            await asyncio.sleep(10)
+
+        service = _mock_service()
+        service.run_generation = AsyncMock(side_effect=hang)
+        runner = QuizJobRunner(session_factory=_session_factory())
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            runner.submit(uuid.uuid4())
+            await asyncio.sleep(0.01)
+            await runner.stop()
+
+        service.mark_generation_failed.assert_not_awaited()
+        assert runner.active_jobs == 0
+
+    @pytest.mark.asyncio
+    async def test_resume_pending_submits_abandoned_quizzes(self):
+        """Quizzes and sessions with an expired lease are resubmitted."""
+        quiz_ids = [uuid.uuid4(), uuid.uuid4()]
+        session_id = uuid.uuid4()
+        service = _mock_service()
+        service.get_resumable_quiz_ids = AsyncMock(return_value=quiz_ids)
+        grading_service = _mock_grading_service()
+        grading_service.get_resumable_session_ids = AsyncMock(return_value=[session_id])
+        runner = QuizJobRunner(session_factory=_session_factory())
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service), \
+                patch('app.services.quiz_grading_service.QuizGradingService', return_value=grading_service):
+            assert await runner.resume_pending() == 3
+            await asyncio.gather(*runner._jobs.values(), *runner._gradings.values())
+
+        assert service.run_generation.await_count == 2
+        grading_service.run_grading.assert_awaited_once_with(session_id)
+
+    @pytest.mark.asyncio
+    async def test_grading_job_grades_claimed_session(self):
+        """A claimed session is graded once; a failure completes it with pending answers wrong."""
+        service = _mock_grading_service()
+        runner = QuizJobRunner(session_factory=_session_factory())
+        session_id = uuid.uuid4()
+
+        with patch('app.services.quiz_grading_service.QuizGradingService', return_value=service):
+            assert runner.submit_grading(session_id) is True
+            assert runner.submit_grading(session_id) is False
+            await asyncio.gather(*runner._gradings.values())
+
+            service.run_grading = AsyncMock(side_effect=RuntimeError("boom"))
+            runner.submit_grading(session_id)
+            await asyncio.gather(*runner._gradings.values())
+
+        service.claim_grading.assert_awaited_with(session_id)
+        service.mark_grading_failed.assert_awaited_once_with(session_id)
+        assert runner.active_jobs == 0
+
+    @pytest.mark.asyncio
+    async def test_bank_fills_do_not_take_quiz_job_slots(self):
+        """Bank fills have their own limit; quiz jobs run while fills are busy."""
+        release = asyncio.Event()
+        fills_running = 0
+        peak_fills = 0
+
+        async def slow_fill(mindmap_id, user_id):
+            nonlocal fills_running, peak_fills
+            fills_running += 1
+            peak_fills = max(peak_fills, fills_running)
+            await release.wait()
+            fills_running -= 1
+
+        service = _mock_service()
+        service.fill_question_bank = AsyncMock(side_effect=slow_fill)
+        runner = QuizJobRunner(
+            max_concurrent_jobs=1,
+            max_concurrent_bank_fills=1,
+            session_factory=_session_factory(),
+        )
+        quiz_id = uuid.uuid4()
+
+        with patch('app.services.quiz_generation_service.QuizGenerationService', return_value=service):
+            runner.submit_bank_fill(uuid.uuid4())
+            runner.submit_bank_fill(uuid.uuid4())
+            runner.submit(quiz_id)
+            await asyncio.wait_for(asyncio.gather(*runner._jobs.values()), timeout=1)
+
+            release.set()
+            await asyncio.gather(*runner._bank_fills.values())
+
+        service.run_generation.assert_awaited_once_with(quiz_id)
+        assert peak_fills == 1
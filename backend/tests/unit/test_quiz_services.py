@@ -2,6 +2,7 @@
 Unit tests for quiz generation and grading services.
 """
 import uuid
+from datetime import datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 
@@ -199,11 +200,480 @@ class TestQuizGenerationService:
             levels = set(kp.level for kp in selected)
             assert len(levels) > 1
 
+    @pytest.mark.asyncio
+    async def test_create_adaptive_quiz_targets_weak_points(self, mock_db):
+        """Adaptive quizzes weight selection and difficulty by the weakness vector."""
+        kps = []
+        for i in range(4):
+            kp = MagicMock()
+            kp.id = uuid.uuid4()
+            kp.level = 1
+            kps.append(kp)
+        weakness = {kps[0].id: 0.95, kps[1].id: 0.9, kps[2].id: 0.7, kps[3].id: 0.7}
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.WeaknessService') as weakness_service:
+            weakness_service.return_value.get_weakness_vector = AsyncMock(return_value=weakness)
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service.db.add = MagicMock()
+            service.db.flush = AsyncMock()
+            service._get_knowledge_points = AsyncMock(return_value=kps)
+
+            with patch.object(
+                service, '_select_knowledge_points', wraps=service._select_knowledge_points
+            ) as select_points:
+                quiz, _ = await service._create_quiz(
+                    uuid.uuid4(), uuid.uuid4(), 2, ["choice"], "medium", adaptive=True
+                )
+
+        weights = select_points.call_args.kwargs["weights"]
+        assert weights[kps[0].id] > weights[kps[2].id]
+        assert quiz.adaptive is True
+        # Every selection of these weak points averages above the easier threshold
+        assert quiz.difficulty == "easy"
+
+    TOPICS = [
+        "photosynthesis", "mitochondria", "entropy", "gravity", "osmosis", "inflation",
+        "democracy", "calculus", "grammar", "volcanoes", "magnetism", "enzymes",
+    ]
+
+    def _knowledge_points(self, count):
+        """Build mock knowledge points with distinct topics, ending in their index."""
+        kps = []
+        for i in range(count):
+            kp = MagicMock()
+            kp.id = uuid.uuid4()
+            kp.text = f"{self.TOPICS[i]} {i}"
+            kps.append(kp)
+        return kps
+
+    def _mock_validator(self):
+        """Build a validator that accepts everything."""
+        validator = MagicMock()
+        validator.validate_question = AsyncMock(return_value={"is_valid": True, "reason": "ok"})
+        validator.validate_questions = AsyncMock(
+            side_effect=lambda questions, difficulty, user_id=None: [
+                {"is_valid": True, "reason": "ok"} for _ in questions
+            ]
+        )
+        validator.close = AsyncMock()
+        return validator
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_concurrent_preserves_order(self, mock_db):
+        """Questions finishing out of order are still returned in knowledge point order."""
+        import asyncio
+
+        kps = self._knowledge_points(5)
+
+        async def fake_generate(knowledge_point, question_type, difficulty, user_id=None):
+            index = int(knowledge_point.rsplit(" ", 1)[1])
+            # Later knowledge points finish first
+            await asyncio.sleep((5 - index) * 0.01)
+            return {"question_text": f"What is {knowledge_point}?", "correct_answer": "A"}
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_BATCH_SIZE', 1):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_single_question = fake_generate
+
+            questions = await service._generate_questions(uuid.uuid4(), kps, ["choice"], "medium")
+
+        assert [q.order for q in questions] == [1, 2, 3, 4, 5]
+        assert [q.knowledge_point_id for q in questions] == [kp.id for kp in kps]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_dedup_is_deterministic(self, mock_db):
+        """Within a round, the earlier knowledge point keeps a duplicate question."""
+        import asyncio
+
+        kps = self._knowledge_points(3)
+        calls = {}
+
+        async def fake_generate(knowledge_point, question_type, difficulty, user_id=None):
+            index = int(knowledge_point.rsplit(" ", 1)[1])
+            calls[index] = calls.get(index, 0) + 1
+            await asyncio.sleep((3 - index) * 0.01)
+            if index in (0, 2) and calls[index] == 1:
+                return {"question_text": "What is shared?", "correct_answer": "A"}
+            return {"question_text": f"What is {knowledge_point}?", "correct_answer": "A"}
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_BATCH_SIZE', 1):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_single_question = fake_generate
+
+            questions = await service._generate_questions(uuid.uuid4(), kps, ["choice"], "medium")
+
+        texts = [q.question_text for q in questions]
+        assert texts == ["What is shared?", "What is mitochondria 1?", "What is entropy 2?"]
+        assert calls == {0: 1, 1: 1, 2: 2}
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_bounded_concurrency(self, mock_db):
+        """No more than QUIZ_GENERATION_CONCURRENCY generations run at once."""
+        import asyncio
+
+        kps = self._knowledge_points(10)
+        running = 0
+        peak = 0
+
+        async def fake_generate(knowledge_point, question_type, difficulty, user_id=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return {"question_text": f"What is {knowledge_point}?", "correct_answer": "A"}
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_CONCURRENCY', 3), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_BATCH_SIZE', 1):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_single_question = fake_generate
+
+            questions = await service._generate_questions(uuid.uuid4(), kps, ["choice"], "medium")
+
+        assert len(questions) == 10
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_validates_round_in_one_call(self, mock_db):
+        """All candidates of a round are validated with a single call."""
+        kps = self._knowledge_points(12)
+
+        async def fake_batch(items, difficulty, user_id=None):
+            return {
+                idx: {"question_text": f"What is {text}?", "correct_answer": "A"}
+                for idx, text, _ in items
+            }
+
+        validator = self._mock_validator()
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=validator):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_question_batch = fake_batch
+
+            questions = await service._generate_questions(uuid.uuid4(), kps, ["choice"], "medium")
+
+        assert len(questions) == 12
+        validator.validate_questions.assert_awaited_once()
+        assert len(validator.validate_questions.await_args.args[0]) == 12
+        validator.validate_question.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_closes_validator_on_error(self, mock_db):
+        """The validator's client is closed even when a round fails."""
+        async def fake_batch(items, difficulty, user_id=None):
+            return {idx: {"question_text": f"What is {text}?", "correct_answer": "A"} for idx, text, _ in items}
+
+        validator = self._mock_validator()
+        validator.validate_questions = AsyncMock(side_effect=RuntimeError("validator down"))
+        validator.close = AsyncMock()
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=validator):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_question_batch = fake_batch
+
+            with pytest.raises(RuntimeError):
+                await service._generate_questions(uuid.uuid4(), self._knowledge_points(2), ["choice"], "medium")
+
+        validator.close.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_generate_question_batch_keeps_well_formed_items(self, mock_db):
+        """Batch responses are mapped back by id; malformed items are dropped."""
+        import json
+
+        response = json.dumps({
+            "questions": [
+                {"id": 2, "question_text": "What is B?", "correct_answer": "b"},
+                {"id": 1, "question_text": "What is A?", "correct_answer": "A"},
+                {"id": 3, "question_text": "What is C?"},
+                {"id": 9, "question_text": "Out of range?", "correct_answer": "x"},
+            ]
+        })
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None):
+            service = QuizGenerationService(mock_db)
+            service.deepseek = MagicMock()
+            service.deepseek.generate_completion = AsyncMock(return_value=response)
+
+            generated = await service._generate_question_batch(
+                [(10, "A", "fill_blank"), (11, "B", "fill_blank"), (12, "C", "fill_blank")],
+                "medium",
+            )
+
+        assert generated == {
+            10: {"id": 1, "question_text": "What is A?", "correct_answer": "A"},
+            11: {"id": 2, "question_text": "What is B?", "correct_answer": "b"},
+        }
+        kwargs = service.deepseek.generate_completion.call_args.kwargs
+        assert kwargs["json_mode"] is True
+        assert "1. [fill_blank] A" in kwargs["prompt"]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_rerequests_only_failed_items(self, mock_db):
+        """One batch call covers the quiz; only the failed item is requested again."""
+        kps = self._knowledge_points(4)
+        batch_calls = []
+
+        async def fake_batch(items, difficulty, user_id=None):
+            batch_calls.append([idx for idx, _, _ in items])
+            return {
+                idx: {"question_text": f"What is {text}?", "correct_answer": "A"}
+                for idx, text, _ in items
+                if not (idx == 2 and len(batch_calls) == 1)
+            }
+
+        async def fake_single(knowledge_point, question_type, difficulty, user_id=None):
+            batch_calls.append([knowledge_point])
+            return {"question_text": f"What is {knowledge_point}?", "correct_answer": "A"}
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_BATCH_SIZE', 5):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_question_batch = fake_batch
+            service._generate_single_question = fake_single
+
+            questions = await service._generate_questions(uuid.uuid4(), kps, ["choice"], "medium")
+
+        assert batch_calls == [[0, 1, 2, 3], ["entropy 2"]]
+        assert [q.order for q in questions] == [1, 2, 3, 4]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_resume_skips_completed(self, mock_db):
+        """A resumed job only generates missing points and reports each round."""
+        kps = self._knowledge_points(3)
+        requested = []
+        rounds = []
+
+        async def fake_batch(items, difficulty, user_id=None):
+            requested.extend(idx for idx, _, _ in items)
+            # The first point repeats the question stored before the restart
+            return {
+                idx: {"question_text": f"What is {'mitochondria 1' if idx == 0 else text}?", "correct_answer": "A"}
+                for idx, text, _ in items
+            }
+
+        async def fake_single(knowledge_point, question_type, difficulty, user_id=None):
+            requested.append(knowledge_point)
+            return {"question_text": f"Explain {knowledge_point}?", "correct_answer": "A"}
+
+        async def on_round(new_questions):
+            rounds.append([q.order for q in new_questions])
+
+        validator = self._mock_validator()
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=validator):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_question_batch = fake_batch
+            service._generate_single_question = fake_single
+
+            questions = await service._generate_questions(
+                uuid.uuid4(),
+                kps,
+                ["choice"],
+                "medium",
+                completed_indices={1},
+                existing_questions=["What is mitochondria 1?"],
+                on_round=on_round,
+            )
+
+        # Questions stored before the restart take part in dedup
+        assert requested == [0, 2, "photosynthesis 0"]
+        assert [q.question_text for q in questions] == ["Explain photosynthesis 0?", "What is entropy 2?"]
+        assert rounds == [[3], [1]]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_serves_bank_first(self, mock_db):
+        """Banked questions fill their slots; only gaps reach the LLM and are banked."""
+        kps = self._knowledge_points(3)
+
+        question_bank = MagicMock()
+        question_bank.take_questions = AsyncMock(return_value={
+            0: {"question_text": "Banked 0?", "correct_answer": "B"},
+            2: {"question_text": "Banked 2?", "correct_answer": "C"},
+        })
+        question_bank.add_questions = AsyncMock()
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_single_question = AsyncMock(
+                return_value={"question_text": "What is mitochondria 1?", "correct_answer": "A"}
+            )
+
+            questions = await service._generate_questions(
+                uuid.uuid4(), kps, ["choice"], "medium", question_bank=question_bank
+            )
+
+        assert [q.question_text for q in questions] == ["Banked 0?", "What is mitochondria 1?", "Banked 2?"]
+        service._generate_single_question.assert_awaited_once()
+        banked = question_bank.add_questions.await_args.args[0]
+        assert [(kp_id, text["question_text"]) for kp_id, _, _, text in banked] == [
+            (kps[1].id, "What is mitochondria 1?")
+        ]
+
+    @pytest.mark.asyncio
+    async def test_generate_questions_drops_semantic_duplicates(self, mock_db):
+        """Questions rephrasing the user's earlier quizzes are regenerated."""
+        kps = self._knowledge_points(2)
+        calls = {}
+
+        async def fake_generate(knowledge_point, question_type, difficulty, user_id=None):
+            index = int(knowledge_point.rsplit(" ", 1)[1])
+            calls[index] = calls.get(index, 0) + 1
+            return {"question_text": f"Attempt {calls[index]} on {knowledge_point}?", "correct_answer": "A"}
+
+        async def fake_find(texts, user_id, threshold):
+            return [{"similarity": 0.95} if text == "Attempt 1 on photosynthesis 0?" else None for text in texts]
+
+        vector_search = MagicMock()
+        vector_search.find_similar_questions = AsyncMock(side_effect=fake_find)
+        user_id = uuid.uuid4()
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.QuizQualityValidator',
+                      return_value=self._mock_validator()), \
+                patch('app.services.quiz_generation_service.get_vector_search_service',
+                      return_value=vector_search), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_GENERATION_BATCH_SIZE', 1), \
+                patch('app.services.quiz_generation_service.settings.QUIZ_SEMANTIC_DEDUP_ENABLED', True):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._generate_single_question = fake_generate
+
+            questions = await service._generate_questions(
+                uuid.uuid4(), kps, ["choice"], "medium", user_id=user_id
+            )
+
+        assert [q.question_text for q in questions] == [
+            "Attempt 2 on photosynthesis 0?", "Attempt 1 on mitochondria 1?"
+        ]
+        assert vector_search.find_similar_questions.await_args.args[1] == str(user_id)
+
+    @pytest.mark.asyncio
+    async def test_semantic_duplicate_check_failure_is_not_fatal(self, mock_db):
+        """An unavailable embedding service keeps every candidate."""
+        vector_search = MagicMock()
+        vector_search.find_similar_questions = AsyncMock(side_effect=RuntimeError("down"))
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.get_vector_search_service',
+                      return_value=vector_search):
+            service = QuizGenerationService(mock_db)
+            duplicates = await service._find_semantic_duplicates(
+                {0: {"question_text": "What is entropy?"}}, uuid.uuid4()
+            )
+
+        assert duplicates == set()
+
+    @pytest.mark.asyncio
+    async def test_run_generation_reuses_stored_selection(self, mock_db):
+        """A resumed adaptive job fills the slots chosen at creation, whatever the weights now."""
+        kps = self._knowledge_points(4)
+        quiz = MagicMock()
+        quiz.id = uuid.uuid4()
+        quiz.status = "generating"
+        quiz.adaptive = True
+        quiz.knowledge_point_ids = [str(kps[2].id), str(kps[0].id)]
+
+        quiz_result = MagicMock()
+        quiz_result.scalar_one_or_none.return_value = quiz
+        existing_result = MagicMock()
+        existing_result.all.return_value = [
+            MagicMock(knowledge_point_id=kps[2].id, question_text="What is entropy 2?")
+        ]
+        mock_db.execute = AsyncMock(side_effect=[quiz_result, existing_result])
+        mock_db.commit = AsyncMock()
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_generation_service.WeaknessService') as weakness_service:
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._get_knowledge_points = AsyncMock(return_value=kps)
+            service._get_recent_user_questions = AsyncMock(return_value=[])
+            service._generate_questions = AsyncMock(return_value=[MagicMock()])
+
+            await service.run_generation(quiz.id)
+
+        args = service._generate_questions.await_args
+        assert args.args[1] == [kps[2], kps[0]]
+        assert args.kwargs["completed_indices"] == {0}
+        weakness_service.assert_not_called()
+        assert quiz.status == "ready"
+
+    @pytest.mark.asyncio
+    async def test_claim_generation(self, mock_db):
+        """Only the caller whose update hits the row owns the job."""
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+
+            mock_db.execute.return_value = MagicMock(rowcount=1)
+            assert await service.claim_generation(uuid.uuid4()) is True
+
+            mock_db.execute.return_value = MagicMock(rowcount=0)
+            assert await service.claim_generation(uuid.uuid4()) is False
+
+        assert mock_db.commit.await_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("question_count, expected_status", [(3, "ready"), (0, "failed")])
+    async def test_crashed_generation_keeps_committed_questions(
+        self, mock_db, question_count, expected_status
+    ):
+        """A crash after some rounds committed questions leaves the quiz ready."""
+        user_id = uuid.uuid4()
+        mock_db.scalar = AsyncMock(return_value=question_count)
+        mock_db.execute.return_value = MagicMock()
+        mock_db.execute.return_value.scalar_one_or_none.return_value = user_id
+
+        with patch.object(QuizGenerationService, '__init__', lambda self, db: None):
+            service = QuizGenerationService(mock_db)
+            service.db = mock_db
+            service._index_quiz_questions = AsyncMock()
+
+            await service.mark_generation_failed(uuid.uuid4())
+
+        update_stmt = mock_db.execute.await_args.args[0]
+        assert update_stmt.compile().params["status"] == expected_status
+        mock_db.commit.assert_awaited_once()
+        assert service._index_quiz_questions.await_count == (1 if question_count else 0)
+
 
 @pytest.mark.unit
 class TestQuizGradingService:
     """Test QuizGradingService methods."""
 
+    @pytest.fixture(autouse=True)
+    def no_grading_cache(self):
+        """Keep the grading cache out of tests that do not exercise it."""
+        with patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_CACHE_ENABLED', False):
+            yield
+
     @pytest.fixture
     def mock_db(self):
         """Create mock database session."""
@@ -216,6 +686,39 @@ class TestQuizGradingService:
         db.execute = AsyncMock()
         return db
 
+    @pytest.mark.asyncio
+    async def test_services_share_process_clients(self, mock_db):
+        """Grading services reuse one set of AI clients, initialized once."""
+        vector_search = MagicMock()
+        vector_search.initialize = AsyncMock()
+        deepseek = MagicMock()
+
+        with patch('app.services.quiz_grading_service.get_vector_search_service', return_value=vector_search), \
+                patch('app.services.quiz_grading_service.get_deepseek_service', return_value=deepseek):
+            first, second = QuizGradingService(mock_db), QuizGradingService(mock_db)
+            await first.close()
+
+        assert first.vector_search is second.vector_search is vector_search
+        assert first.deepseek is second.deepseek is deepseek
+        vector_search.close.assert_not_called()
+
+    def test_vector_search_initialize_is_idempotent(self):
+        """Initializing the shared vector search again does not touch ChromaDB."""
+        import asyncio
+
+        from app.services.vector_search_service import VectorSearchService
+
+        with patch.object(VectorSearchService, '__init__', lambda self: None):
+            service = VectorSearchService()
+        service.chroma_client = MagicMock()
+        service.collection = None
+        service.collection_name = "note_embeddings"
+
+        asyncio.run(service.initialize())
+        asyncio.run(service.initialize())
+
+        service.chroma_client.get_or_create_collection.assert_called_once()
+
     @pytest.mark.asyncio
     async def test_submit_answers_success(self, mock_db):
         """Test submitting quiz answers for grading."""
@@ -227,6 +730,7 @@ class TestQuizGradingService:
         # Mock quiz
         mock_quiz = MagicMock(spec=Quiz)
         mock_quiz.id = quiz_id
+        mock_quiz.status = "ready"
 
         # Mock questions
         mock_question = MagicMock(spec=QuizQuestion)
@@ -278,6 +782,454 @@ class TestQuizGradingService:
             assert result is not None
             assert result.status == "completed"
 
+    @pytest.mark.asyncio
+    async def test_submit_answers_defers_short_answers(self, mock_db):
+        """Objective answers are graded at once; short answers are left pending."""
+        from app.models.quiz import QuizQuestion
+
+        choice = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="choice")
+        short = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="short_answer")
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._get_quiz = AsyncMock(return_value=MagicMock(status="ready"))
+            service._get_quiz_questions = AsyncMock(return_value=[choice, short])
+            service._grade_answer = AsyncMock(return_value={"is_correct": True})
+
+            session = await service.submit_answers(uuid.uuid4(), uuid.uuid4(), [
+                {"question_id": str(choice.id), "user_answer": "A"},
+                {"question_id": str(short.id), "user_answer": "Because"},
+            ])
+
+        service._grade_answer.assert_awaited_once()
+        assert [a.is_correct for a in session.answers] == ["true", "pending"]
+        # All answers in one INSERT, nothing read back
+        mock_db.execute.assert_awaited_once()
+        assert len(mock_db.execute.await_args.args[0].compile().params) >= 2 * 8
+        mock_db.refresh.assert_not_awaited()
+        assert session.status == "grading"
+        assert session.correct_count == 1
+        assert session.score == 0.5
+        assert session.completed_at is None
+
+    @pytest.mark.asyncio
+    async def test_submit_answers_streaming_yields_in_completion_order(self, mock_db):
+        """Each answer is yielded when graded, then the completed session."""
+        import asyncio
+
+        from app.models.quiz import QuizQuestion
+
+        short = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="short_answer")
+        choice = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="choice")
+
+        async def grade(question, user_answer, quiz_id, user_id=None):
+            if question is short:
+                await asyncio.sleep(0.05)
+                return {"is_correct": False, "ai_score": 0.3, "feedback": "Too vague"}
+            return {"is_correct": True}
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._get_quiz = AsyncMock(return_value=MagicMock(status="ready"))
+            service._get_quiz_questions = AsyncMock(return_value=[short, choice])
+            service._grade_answer = AsyncMock(side_effect=grade)
+            service._capture_mistakes = AsyncMock()
+
+            events = [
+                event async for event in service.submit_answers_streaming(uuid.uuid4(), uuid.uuid4(), [
+                    {"question_id": str(short.id), "user_answer": "Because"},
+                    {"question_id": str(choice.id), "user_answer": "A"},
+                ])
+            ]
+
+        assert [kind for kind, _ in events] == ["answer", "answer", "session"]
+        assert [answer.question_id for _, answer in events[:2]] == [choice.id, short.id]
+        assert events[1][1].ai_feedback == "Too vague"
+        session = events[2][1]
+        assert session.status == "completed"
+        assert [a.is_correct for a in session.answers] == ["false", "true"]
+        assert session.score == pytest.approx(0.65)
+        mock_db.execute.assert_awaited_once()
+        mock_db.commit.assert_awaited_once()
+        service._capture_mistakes.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_submit_answers_streaming_cancels_when_closed(self, mock_db):
+        """Closing the stream early cancels grading and stores nothing."""
+        import asyncio
+
+        from app.models.quiz import QuizQuestion
+
+        fast = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="choice")
+        slow = MagicMock(spec=QuizQuestion, id=uuid.uuid4(), question_type="short_answer")
+        cancelled = asyncio.Event()
+
+        async def grade(question, user_answer, quiz_id, user_id=None):
+            if question is slow:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    cancelled.set()
+                    raise
+            return {"is_correct": True}
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._get_quiz = AsyncMock(return_value=MagicMock(status="ready"))
+            service._get_quiz_questions = AsyncMock(return_value=[fast, slow])
+            service._grade_answer = AsyncMock(side_effect=grade)
+
+            stream = service.submit_answers_streaming(uuid.uuid4(), uuid.uuid4(), [
+                {"question_id": str(fast.id), "user_answer": "A"},
+                {"question_id": str(slow.id), "user_answer": "Because"},
+            ])
+            kind, answer = await stream.__anext__()
+            await stream.aclose()
+            await asyncio.wait_for(cancelled.wait(), 1)
+
+        assert (kind, answer.question_id) == ("answer", fast.id)
+        mock_db.execute.assert_not_awaited()
+        mock_db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_run_grading_finalizes_session(self, mock_db):
+        """Pending answers are graded and the score covers all answers."""
+        from app.models.quiz import QuizAnswer, QuizSession
+
+        session = QuizSession(id=uuid.uuid4(), quiz_id=uuid.uuid4(), user_id=uuid.uuid4(),
+                              status="grading", total_questions=2, correct_count=1, score=0.5)
+        graded = QuizAnswer(user_answer="A", is_correct="true")
+        pending = QuizAnswer(user_answer="Because", is_correct="pending")
+        question = self._short_answer()
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._grading_lease = datetime.utcnow()
+            service._get_session_answers = AsyncMock(
+                return_value=(session, [(graded, MagicMock()), (pending, question)])
+            )
+            service._grade_answers = AsyncMock(
+                return_value=[{"is_correct": False, "ai_score": 0.4, "feedback": "Partly"}]
+            )
+            mock_db.execute.return_value = MagicMock(rowcount=1)
+
+            with patch('app.services.quiz_grading_service.MistakeService') as mistake_service:
+                mistake_service.return_value.capture_quiz_mistakes = AsyncMock(return_value=1)
+                await service.run_grading(session.id)
+
+        assert service._grade_answers.await_args.args[0] == [(question, "Because")]
+        assert pending.is_correct == "false"
+        assert pending.ai_feedback == "Partly"
+        assert session.status == "completed"
+        assert session.score == pytest.approx(0.7)
+        assert session.completed_at is not None
+        mock_db.commit.assert_awaited_once()
+        # The wrong short answer goes to the mistake book in the same transaction
+        mistake_service.return_value.capture_quiz_mistakes.assert_awaited_once_with(
+            session.user_id, session.quiz_id, [(question, "Because")]
+        )
+
+    @pytest.mark.asyncio
+    async def test_run_grading_drops_results_after_losing_lease(self, mock_db):
+        """A session re-claimed by another worker is not finalized twice."""
+        from app.models.quiz import QuizAnswer, QuizSession
+
+        session = QuizSession(id=uuid.uuid4(), quiz_id=uuid.uuid4(), user_id=uuid.uuid4(),
+                              status="grading", total_questions=1, correct_count=0, score=0.0)
+        pending = QuizAnswer(user_answer="Because", is_correct="pending")
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._grading_lease = datetime.utcnow()
+            service._get_session_answers = AsyncMock(return_value=(session, [(pending, self._short_answer())]))
+            service._grade_answers = AsyncMock(return_value=[{"is_correct": False, "ai_score": 0.1}])
+            service._capture_mistakes = AsyncMock()
+            mock_db.execute.return_value = MagicMock(rowcount=0)
+
+            assert await service.run_grading(session.id) is None
+
+        mock_db.rollback.assert_awaited_once()
+        mock_db.commit.assert_not_awaited()
+        service._capture_mistakes.assert_not_awaited()
+        assert session.status == "grading"
+
+    @pytest.mark.asyncio
+    async def test_run_grading_renews_lease_after_each_batch(self, mock_db):
+        """Every grading batch extends the lease the service holds."""
+        from app.models.quiz import QuizAnswer, QuizSession
+
+        session = QuizSession(id=uuid.uuid4(), quiz_id=uuid.uuid4(), user_id=uuid.uuid4(),
+                              status="grading", total_questions=3, correct_count=0, score=0.0)
+        rows = [(QuizAnswer(user_answer=str(i), is_correct="pending"), self._short_answer()) for i in range(3)]
+        claimed_at = datetime.utcnow() - timedelta(minutes=10)
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_BATCH_SIZE', 1):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._grading_lease = claimed_at
+            service._get_session_answers = AsyncMock(return_value=(session, rows))
+            service._get_cached_grades = AsyncMock(return_value=[None] * 3)
+            service._cache_grades = AsyncMock()
+            service._grade_answer = AsyncMock(return_value={"is_correct": True, "ai_score": 0.9})
+            service._capture_mistakes = AsyncMock()
+            mock_db.execute.return_value = MagicMock(rowcount=1)
+
+            await service.run_grading(session.id)
+
+        # Three renewals, then the conditional release
+        assert mock_db.execute.await_count == 4
+        assert mock_db.commit.await_count == 4
+        assert session.status == "completed"
+
+    @pytest.mark.asyncio
+    async def test_mark_grading_failed_requires_lease(self, mock_db):
+        """A worker that lost the lease leaves the session to its new owner."""
+        from app.models.quiz import QuizAnswer, QuizSession
+
+        session = QuizSession(id=uuid.uuid4(), quiz_id=uuid.uuid4(), user_id=uuid.uuid4(),
+                              status="grading", total_questions=1, correct_count=0, score=0.0)
+        pending = QuizAnswer(user_answer="Because", is_correct="pending")
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._grading_lease = datetime.utcnow()
+            service._get_session_answers = AsyncMock(return_value=(session, [(pending, self._short_answer())]))
+            mock_db.execute.return_value = MagicMock(rowcount=0)
+
+            await service.mark_grading_failed(session.id)
+
+        assert pending.is_correct == "pending"
+        mock_db.commit.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_failed_grading_is_not_a_mistake(self, mock_db):
+        """Answers failed by a grading outage stay out of the mistake book."""
+        from app.models.quiz import QuizAnswer, QuizSession
+
+        session = QuizSession(id=uuid.uuid4(), quiz_id=uuid.uuid4(), user_id=uuid.uuid4(),
+                              status="grading", total_questions=2, correct_count=0, score=0.0)
+        choice = MagicMock(question_type="choice")
+        wrong_choice = QuizAnswer(user_answer="B", is_correct="false")
+        pending = QuizAnswer(user_answer="Because", is_correct="pending")
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._grading_lease = datetime.utcnow()
+            service._get_session_answers = AsyncMock(
+                return_value=(session, [(wrong_choice, choice), (pending, self._short_answer())])
+            )
+            mock_db.execute.return_value = MagicMock(rowcount=1)
+
+            with patch('app.services.quiz_grading_service.MistakeService') as mistake_service:
+                mistake_service.return_value.capture_quiz_mistakes = AsyncMock(return_value=1)
+                await service.mark_grading_failed(session.id)
+
+        assert pending.is_correct == "false"
+        assert pending.ai_feedback == "Grading failed"
+        assert session.status == "completed"
+        mistake_service.return_value.capture_quiz_mistakes.assert_awaited_once_with(
+            session.user_id, session.quiz_id, [(choice, "B")]
+        )
+
+    @pytest.mark.asyncio
+    async def test_grade_answers_bounded_concurrency_keeps_order(self, mock_db):
+        """Short answers grade concurrently up to the limit; results keep submission order."""
+        import asyncio
+
+        running = 0
+        peak = 0
+
+        async def fake_grade(question, user_answer, quiz_id, user_id=None):
+            nonlocal running, peak
+            if question.question_type == "short_answer":
+                running += 1
+                peak = max(peak, running)
+                # Earlier answers finish last
+                await asyncio.sleep(0.05 - int(user_answer) * 0.005)
+                running -= 1
+            return {"is_correct": False, "answer": user_answer}
+
+        submitted = []
+        for i in range(8):
+            question = MagicMock()
+            question.question_type = "choice" if i % 4 == 0 else "short_answer"
+            submitted.append((question, str(i)))
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_CONCURRENCY', 2), \
+                patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_BATCH_SIZE', 1):
+            service = QuizGradingService(mock_db)
+            service._grade_answer = fake_grade
+
+            results = await service._grade_answers(submitted, uuid.uuid4())
+
+        assert [r["answer"] for r in results] == [str(i) for i in range(8)]
+        assert peak == 2
+
+    def _short_answer(self, correct_answer="Plants convert light into chemical energy"):
+        """Build a short answer question."""
+        question = MagicMock()
+        question.id = uuid.uuid4()
+        question.question_type = "short_answer"
+        question.question_text = "Explain photosynthesis."
+        question.correct_answer = correct_answer
+        return question
+
+    @pytest.mark.asyncio
+    async def test_short_answers_graded_in_one_call(self, mock_db):
+        """All short answers share one grading call keyed by question ID."""
+        import json
+
+        questions = [self._short_answer() for _ in range(3)]
+        response = json.dumps({"grades": [
+            {"question_id": str(questions[2].id), "score": 0.9, "feedback": "Good"},
+            {"question_id": str(questions[0].id), "score": 0.7, "feedback": "Fine"},
+            {"question_id": str(questions[1].id), "score": 0.8, "feedback": "Ok"},
+        ]})
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.deepseek = MagicMock()
+            service.deepseek.generate_completion = AsyncMock(return_value=response)
+            service.vector_search = MagicMock()
+
+            results = await service._grade_answers(
+                [(question, "An answer") for question in questions], uuid.uuid4()
+            )
+
+        assert [r["ai_score"] for r in results] == [0.7, 0.8, 0.9]
+        assert all(r["is_correct"] for r in results)
+        service.deepseek.generate_completion.assert_awaited_once()
+        prompt = service.deepseek.generate_completion.await_args.kwargs["prompt"]
+        assert all(f"Answer ID: {question.id}" in prompt for question in questions)
+
+    @pytest.mark.asyncio
+    async def test_batch_grading_falls_back_for_malformed_entries(self, mock_db):
+        """Only missing or malformed grades are graded again one at a time."""
+        import json
+
+        questions = [self._short_answer() for _ in range(3)]
+        response = json.dumps({"grades": [
+            {"question_id": str(questions[0].id), "score": 0.9, "feedback": "Good"},
+            {"question_id": str(questions[1].id), "score": "high"},
+        ]})
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.deepseek = MagicMock()
+            service.deepseek.generate_completion = AsyncMock(return_value=response)
+            service.vector_search = MagicMock()
+            service._grade_answer = AsyncMock(return_value={"is_correct": True, "ai_score": 0.6})
+
+            results = await service._grade_short_answers_batch(
+                [(question, "An answer") for question in questions], uuid.uuid4()
+            )
+
+        assert results[0]["ai_score"] == 0.9
+        assert service._grade_answer.await_count == 2
+        retried = [call.args[0] for call in service._grade_answer.await_args_list]
+        assert retried == [questions[1], questions[2]]
+
+    @pytest.mark.asyncio
+    async def test_cached_grades_skip_llm(self, mock_db):
+        """Answers graded before are not sent to the LLM; new grades are cached."""
+        import json
+
+        cached, fresh = self._short_answer(), self._short_answer()
+        cache = MagicMock()
+        cache.grading_cache_key = MagicMock(side_effect=lambda *parts: ":".join(map(str, parts)))
+        cache.get_cached_grades = AsyncMock(return_value=[{"score": 0.9, "feedback": "Good"}, None])
+        cache.cache_grades = AsyncMock()
+        mock_db.execute.return_value = MagicMock()
+        mock_db.execute.return_value.scalars.return_value.all.return_value = []
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_CACHE_ENABLED', True), \
+                patch('app.services.quiz_grading_service.cache_service', cache):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service.deepseek = MagicMock()
+            service.deepseek.generate_completion = AsyncMock(
+                return_value=json.dumps({"score": 0.7, "feedback": "Fine"})
+            )
+            service.vector_search = MagicMock()
+
+            results = await service._grade_answers(
+                [(cached, "An answer"), (fresh, "Another answer")], uuid.uuid4()
+            )
+
+        assert [r["ai_score"] for r in results] == [0.9, 0.7]
+        assert results[0]["feedback"] == "Good"
+        service.deepseek.generate_completion.assert_awaited_once()
+        stored = cache.cache_grades.await_args_list[-1].args[0]
+        assert [key.split(":")[0] for key in stored] == [str(fresh.id)]
+        # Lookup of the Redis miss, then the upsert of the new grade
+        assert mock_db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_cached_grades_fall_back_to_database(self, mock_db):
+        """Stored grades fill Redis misses unless the answer key changed."""
+        from app.services.quiz_grading_service import _grade_hashes
+
+        kept, changed = self._short_answer(), self._short_answer()
+        kept_hashes = _grade_hashes(kept, " An  ANSWER")
+        changed_hashes = _grade_hashes(changed, "an answer")
+        rows = [
+            MagicMock(question_id=kept.id, answer_key_hash=kept_hashes[0],
+                      answer_hash=kept_hashes[1], score=0.8, feedback="Stored"),
+            MagicMock(question_id=changed.id, answer_key_hash="old key",
+                      answer_hash=changed_hashes[1], score=0.2, feedback="Stale"),
+        ]
+        mock_db.execute.return_value = MagicMock()
+        mock_db.execute.return_value.scalars.return_value.all.return_value = rows
+        cache = MagicMock()
+        cache.get_cached_grades = AsyncMock(return_value=[None, None])
+        cache.cache_grades = AsyncMock()
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None), \
+                patch('app.services.quiz_grading_service.settings.QUIZ_GRADING_CACHE_ENABLED', True), \
+                patch('app.services.quiz_grading_service.cache_service', cache):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+
+            grades = await service._get_cached_grades([(kept, "an answer"), (changed, "an answer")])
+
+        assert grades == [(0.8, "Stored"), None]
+        refilled = cache.cache_grades.await_args.args[0]
+        assert list(refilled.values()) == [{"score": 0.8, "feedback": "Stored"}]
+
+    def test_grading_prompt_includes_correct_answer(self, mock_db):
+        """The single-answer prompt shows the reference answer, not the question twice."""
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            prompt = service._get_grading_prompt("What is 2+2?", "five", "four")
+
+        assert "Correct Answer: four" in prompt
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("quiz_status", ["generating", "failed"])
+    async def test_submit_answers_quiz_not_ready(self, mock_db, quiz_status):
+        """Quizzes without a final question set cannot be answered."""
+        from app.services.quiz_grading_service import QuizNotReadyError
+
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+            service.db = mock_db
+            service._get_quiz = AsyncMock(return_value=MagicMock(status=quiz_status))
+
+            with pytest.raises(QuizNotReadyError):
+                await service.submit_answers(uuid.uuid4(), uuid.uuid4(), [])
+
+        mock_db.add.assert_not_called()
+
     @pytest.mark.asyncio
     async def test_submit_answers_quiz_not_found(self, mock_db):
         """Test submitting answers for non-existent quiz."""
@@ -361,6 +1313,18 @@ class TestQuizGradingService:
             # Should have high keyword overlap
             assert result["is_correct"] is True
 
+    @pytest.mark.asyncio
+    async def test_grade_fill_blank_chinese_typo(self, mock_db):
+        """Chinese answers tolerate a typo but not a different term."""
+        with patch.object(QuizGradingService, '__init__', lambda self, db: None):
+            service = QuizGradingService(mock_db)
+
+            typo = await service._grade_fill_blank_answer("光和作用", "光合作用")
+            different = await service._grade_fill_blank_answer("细胞质", "细胞核")
+
+        assert typo["is_correct"] is True
+        assert different["is_correct"] is False
+
     @pytest.mark.asyncio
     async def test_get_session_results(self, mock_db):
         """Test getting quiz session results."""
@@ -393,6 +1357,9 @@ class TestQuizGradingService:
 
             assert result is not None
             assert result.id == session_id
+            # Answers are eager-loaded by the same query
+            mock_db.execute.assert_awaited_once()
+            mock_db.refresh.assert_not_awaited()
 
     @pytest.mark.asyncio
     async def test_get_session_results_not_found(self, mock_db):
@@ -450,6 +1417,57 @@ class TestQuizQualityValidator:
             assert result["is_valid"] is True
             assert result["score"] >= 0.7
 
+    @pytest.mark.asyncio
+    async def test_validate_question_prescreen_skips_ai(self, mock_db):
+        """Clear cases are settled by the local pre-screen without the AI assessor."""
+        leaked = {
+            "question_text": "Is Paris the capital city of France?",
+            "correct_answer": "Paris",
+        }
+
+        with patch.object(QuizQualityValidator, '__init__', lambda self, db: None):
+            validator = QuizQualityValidator(mock_db)
+            validator.db = mock_db
+            validator._assess_quality_with_ai = AsyncMock(return_value=0.9)
+
+            result = await validator.validate_question(
+                question_data=leaked,
+                knowledge_point="Capital of France",
+                expected_difficulty="easy"
+            )
+
+            assert result["is_valid"] is False
+            validator._assess_quality_with_ai.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_validate_questions_batches_borderline(self, mock_db):
+        """Borderline questions share one AI call; clear cases are settled locally."""
+        import json
+
+        borderline = {
+            "question_text": "Which statement about the listed items is correct?",
+            "correct_answer": "A",
+            "options": ["A. Option 1", "B. Option 2", "C. Option 3"],
+        }
+        leaked = {"question_text": "Is Paris the capital city of France?", "correct_answer": "Paris"}
+        response = json.dumps({"scores": [{"id": 2, "quality_score": 0.4}, {"id": 1, "quality_score": 0.9}]})
+
+        with patch.object(QuizQualityValidator, '__init__', lambda self, db: None):
+            validator = QuizQualityValidator(mock_db)
+            validator.deepseek = MagicMock()
+            validator.deepseek.generate_completion = AsyncMock(return_value=response)
+
+            results = await validator.validate_questions(
+                [(borderline, "Photosynthesis"), (leaked, "Capital of France"), (borderline, "Photosynthesis")],
+                "medium",
+            )
+
+        assert [result["is_valid"] for result in results] == [True, False, False]
+        assert [result["score"] for result in results[::2]] == [0.9, 0.4]
+        validator.deepseek.generate_completion.assert_awaited_once()
+        prompt = validator.deepseek.generate_completion.call_args.kwargs["prompt"]
+        assert "Question 2\n" in prompt and "Question 3\n" not in prompt
+
     @pytest.mark.asyncio
     async def test_validate_question_missing_fields(self, mock_db):
         """Test validating question with missing fields."""
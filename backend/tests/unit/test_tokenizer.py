@@ -0,0 +1,81 @@
+"""
+Unit tests for the shared token counter.
+"""
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from app.utils.tokenizer import CHARS_PER_TOKEN, TokenCounter
+
+
+class WordEncoder:
+    """Deterministic stand-in encoder: one token per whitespace-separated word."""
+
+    def __init__(self):
+        self.encode_calls = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encode_calls += 1
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+def _counter_with(encoder) -> TokenCounter:
+    """Build a counter with a preloaded encoder."""
+    counter = TokenCounter()
+    counter._encoder = encoder
+    counter._encoder_loaded = True
+    return counter
+
+
+@pytest.mark.unit
+class TestTokenCounter:
+    """Test counting and truncation."""
+
+    def test_count(self):
+        """Counts are the encoded length."""
+        counter = _counter_with(WordEncoder())
+
+        assert counter.count("one two three") == 3
+        assert counter.count("") == 0
+
+    def test_truncate_encodes_once(self):
+        """Truncation counts and cuts with a single encode and reports the original count."""
+        encoder = WordEncoder()
+        counter = _counter_with(encoder)
+
+        text, count = counter.truncate("a b c d e", max_tokens=2, keep="tail")
+
+        assert text == "d e"
+        assert count == 5
+        assert encoder.encode_calls == 1
+
+    def test_truncate_within_budget(self):
+        """Text within budget is returned unchanged."""
+        counter = _counter_with(WordEncoder())
+
+        assert counter.truncate("a b", max_tokens=5) == ("a b", 2)
+
+    def test_encoder_loaded_once(self):
+        """The encoder is loaded on first use and reused."""
+        fake_tiktoken = MagicMock()
+        fake_tiktoken.encoding_for_model.return_value = WordEncoder()
+        counter = TokenCounter()
+
+        with patch.dict("sys.modules", {"tiktoken": fake_tiktoken}):
+            counter.count("one")
+            counter.count("two words")
+
+        fake_tiktoken.encoding_for_model.assert_called_once_with("gpt-3.5-turbo")
+
+    def test_char_fallback(self):
+        """Without an encoder, tokens are estimated from characters."""
+        counter = _counter_with(None)
+        text = "x" * (CHARS_PER_TOKEN * 10)
+
+        assert counter.count(text) == 10
+        truncated, count = counter.truncate(text, max_tokens=4, keep="head")
+        assert count == 10
+        assert len(truncated) == 4 * CHARS_PER_TOKEN
@@ -0,0 +1,74 @@
+"""Unit tests for the question index of the vector search service."""
+
+import uuid
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.vector_search_service import VectorSearchService
+
+
+@pytest.fixture
+def service():
+    """Vector search service with a mocked question collection."""
+    with patch.object(VectorSearchService, '__init__', lambda self: None):
+        service = VectorSearchService()
+    service.chroma_client = MagicMock()
+    service.question_collection = MagicMock()
+    service._generate_embeddings = AsyncMock(
+        side_effect=lambda texts: [[float(i)] for i in range(len(texts))]
+    )
+    return service
+
+
+@pytest.mark.unit
+class TestQuestionIndex:
+    """Tests for semantic question indexing and lookup."""
+
+    @pytest.mark.asyncio
+    async def test_index_questions_embeds_in_one_request(self, service):
+        """All questions are embedded together and upserted with their owner."""
+        user_id, quiz_id = uuid.uuid4(), uuid.uuid4()
+        questions = [
+            {"id": uuid.uuid4(), "text": f"Question {i}?", "user_id": user_id, "quiz_id": quiz_id}
+            for i in range(3)
+        ]
+
+        assert await service.index_questions(questions) == 3
+
+        service._generate_embeddings.assert_awaited_once_with(["Question 0?", "Question 1?", "Question 2?"])
+        upsert = service.question_collection.upsert.call_args.kwargs
+        assert upsert["ids"] == [str(q["id"]) for q in questions]
+        assert upsert["metadatas"][0] == {"user_id": str(user_id), "quiz_id": str(quiz_id)}
+
+    @pytest.mark.asyncio
+    async def test_find_similar_questions_applies_threshold(self, service):
+        """Only matches at or above the threshold are returned, scoped to the user."""
+        service.question_collection.query.return_value = {
+            "ids": [["q1"], ["q2"], []],
+            "distances": [[0.05], [0.3], []],
+            "documents": [["What is entropy?"], ["What is gravity?"], []],
+            "metadatas": [[{"quiz_id": "a"}], [{"quiz_id": "b"}], []],
+        }
+
+        matches = await service.find_similar_questions(
+            ["Define entropy?", "Explain osmosis?", "What is calculus?"], "user-1", 0.9
+        )
+
+        assert matches[0]["content"] == "What is entropy?"
+        assert matches[0]["similarity"] == pytest.approx(0.95)
+        assert matches[1] is None
+        assert matches[2] is None
+        query = service.question_collection.query.call_args.kwargs
+        assert query["where"] == {"user_id": "user-1"}
+        assert query["n_results"] == 1
+
+    @pytest.mark.asyncio
+    async def test_question_index_disabled_without_chromadb(self, service):
+        """Without ChromaDB nothing is indexed and nothing matches."""
+        service.chroma_client = None
+        service.question_collection = None
+
+        assert await service.index_questions([{"id": 1, "text": "Q?", "user_id": 1, "quiz_id": 1}]) == 0
+        assert await service.find_similar_questions(["Q?"], "user-1", 0.9) == [None]
+        service._generate_embeddings.assert_not_awaited()
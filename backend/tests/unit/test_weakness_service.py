@@ -0,0 +1,75 @@
+"""
+Unit tests for per-user weakness estimates.
+"""
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.weakness_service import (
+    UNKNOWN_WEAKNESS,
+    WeaknessService,
+    adapt_difficulty,
+    selection_weights,
+)
+
+
+def _result(rows):
+    """Build a query result returning rows."""
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+@pytest.mark.unit
+class TestWeaknessService:
+    """Test weakness estimation and its use in adaptive quizzes."""
+
+    @pytest.fixture
+    def mock_db(self):
+        """Create mock database session."""
+        db = MagicMock()
+        db.execute = AsyncMock()
+        return db
+
+    @pytest.mark.asyncio
+    async def test_weakness_vector_combines_answers_and_mistakes(self, mock_db):
+        """Wrong answers and unmastered mistakes raise weakness."""
+        strong, weak, mistaken = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+        mock_db.execute.side_effect = [
+            _result([
+                SimpleNamespace(knowledge_point_id=strong, answered=8, wrong=0),
+                SimpleNamespace(knowledge_point_id=weak, answered=8, wrong=6),
+            ]),
+            _result([
+                SimpleNamespace(knowledge_point_id=weak, open_mistakes=2, mastery=50),
+                SimpleNamespace(knowledge_point_id=mistaken, open_mistakes=2, mastery=0),
+            ]),
+        ]
+
+        vector = await WeaknessService(mock_db).get_weakness_vector(uuid.uuid4(), uuid.uuid4())
+
+        assert vector[strong] == pytest.approx(1 / 10)
+        assert vector[weak] == pytest.approx((6 + 1 + 1) / (8 + 2 + 2))
+        assert vector[mistaken] == pytest.approx(3 / 4)
+        # One grouped query per source
+        assert mock_db.execute.await_count == 2
+
+    def test_selection_weights_default_unknown_points(self):
+        """Points without history get the neutral weakness."""
+        known, unknown = SimpleNamespace(id=1), SimpleNamespace(id=2)
+
+        with patch('app.services.weakness_service.settings.QUIZ_ADAPTIVE_WEAKNESS_WEIGHT', 4.0):
+            weights = selection_weights([known, unknown], {1: 1.0})
+
+        assert weights == {1: 5.0, 2: 1 + 4.0 * UNKNOWN_WEAKNESS}
+
+    def test_adapt_difficulty(self):
+        """Weak selections get easier, strong ones harder, within bounds."""
+        points = [SimpleNamespace(id=1), SimpleNamespace(id=2)]
+
+        assert adapt_difficulty("medium", points, {1: 0.9, 2: 0.8}) == "easy"
+        assert adapt_difficulty("easy", points, {1: 0.9, 2: 0.8}) == "easy"
+        assert adapt_difficulty("medium", points, {1: 0.1, 2: 0.1}) == "hard"
+        assert adapt_difficulty("medium", points, {}) == "medium"